@@ -0,0 +1,108 @@
+# benchmarks/conftest.py
+"""
+Configuración común de los benchmarks (pytest-benchmark).
+
+- SDL usa los drivers "dummy" de video y audio: se puede correr sin pantalla
+  ni tarjeta de sonido (servidores, CI).
+- Los resultados guardados van a benchmarks/.resultados (no a ./.benchmarks),
+  así la línea base es la misma se corra pytest desde donde se corra.
+- Con --benchmark-compare y sin --benchmark-compare-fail, una regresión de más
+  del UMBRAL_REGRESION hace fallar la corrida. Se compara el mínimo de cada
+  benchmark: es el que menos cambia por la carga de la máquina.
+- CACHE_DIR, REPLAYS_DIR y ASSETS_BUNDLE apuntan a una carpeta temporal: los
+  benchmarks no escriben en el repositorio (caché PCM, replays) ni dependen de
+  un assets.bundle generado a mano.
+
+Tableros de prueba: TABLEROS nombra los tres niveles de llenado que se usan
+en los benchmarks de las reglas (vacío, medio lleno y casi en el tope).
+"""
+import os
+import random
+import sys
+from pathlib import Path
+
+CARPETA = Path(__file__).resolve().parent
+RESULTADOS = CARPETA / ".resultados"
+UMBRAL_REGRESION = "min:20%"
+
+# el paquete game no se instala: se importa desde la raíz del repositorio
+sys.path.insert(0, str(CARPETA.parent))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pytest
+
+from game.board import Board
+from game.settings import GameSettings
+
+COLUMNAS = 11
+FILAS = 20
+
+# nombre -> filas ocupadas desde el fondo
+TABLEROS = {
+    "vacio": 0,
+    "medio": FILAS // 2,
+    "casi_tope": FILAS - 3,
+}
+
+
+# --------------------
+# Línea base
+# --------------------
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # tiene que correr antes de que pytest-benchmark cree su sesión
+    if not config.pluginmanager.hasplugin("benchmark"):
+        return
+    from pytest_benchmark.utils import parse_compare_fail
+
+    if config.getoption("benchmark_storage") == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{RESULTADOS}"
+    if config.getoption("benchmark_compare") and not config.getoption("benchmark_compare_fail"):
+        config.option.benchmark_compare_fail = [parse_compare_fail(UMBRAL_REGRESION)]
+
+
+# --------------------
+# Rutas
+# --------------------
+@pytest.fixture(scope="session", autouse=True)
+def rutas_temporales(tmp_path_factory):
+    """Antes de crear los gestores compartidos (get_sound_manager, main.inicializar)."""
+    base = tmp_path_factory.mktemp("juego")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(GameSettings, "CACHE_DIR", base / "cache")
+        mp.setattr(GameSettings, "REPLAYS_DIR", base / "replays")
+        mp.setattr(GameSettings, "ASSETS_BUNDLE", base / "assets.bundle")
+        yield base
+
+
+# --------------------
+# Tableros
+# --------------------
+def crear_tablero(ocupadas, completas=0, seed=0):
+    """
+    Tablero con `ocupadas` filas de abajo rellenas al azar (siempre con al
+    menos un hueco, para que no se borren) y las `completas` de más abajo llenas.
+    """
+    rng = random.Random(seed)
+    tablero = Board(COLUMNAS, FILAS)
+    for i in range(ocupadas):
+        y = FILAS - 1 - i
+        if i < completas:
+            fila = tablero.lleno
+        else:
+            fila = tablero.lleno
+            for _ in range(rng.randint(1, 3)):
+                fila &= ~(1 << rng.randrange(COLUMNAS))
+        tablero.bits[y] = fila
+        for x in range(COLUMNAS):
+            if fila >> x & 1:
+                tablero.colores[y][x] = rng.randint(1, 7)
+    tablero.recalcular()
+    return tablero
+
+
+@pytest.fixture(params=list(TABLEROS))
+def tablero(request):
+    """Cada uno de los tableros de TABLEROS (el benchmark se repite por nivel)."""
+    return crear_tablero(TABLEROS[request.param])
@@ -0,0 +1,204 @@
+# benchmarks/test_correccion.py
+"""
+Comprobaciones de resultados de lo que miden los benchmarks: que las
+optimizaciones no cambien lo que calculan. No necesitan pytest-benchmark
+(corren con pytest solo).
+
+- Métricas incrementales del Board contra recalcular() y ai.rasgos.
+- GameState.step: movimientos básicos y partidas repetibles con la misma semilla.
+- Replay: la cabecera conserva los ticks por segundo (y lee la versión 1) y
+  Reproductor.seek hacia atrás da el mismo estado que avanzar desde el inicio.
+- VecTetris: el borrado de líneas y el puntaje tras fijar una pieza.
+"""
+import random
+
+import pytest
+
+from game.ai import rasgos
+from game.engine import (
+    GameState, ACCIONES, NADA, IZQUIERDA, DERECHA, GRAVEDAD, borrar_lineas,
+)
+from game.replay import (
+    Grabadora, Replay, Reproductor, TICKS_V1, _CABECERA, _CABECERA_V1,
+)
+
+from conftest import COLUMNAS, FILAS, crear_tablero
+
+
+def metricas(tablero):
+    return (
+        tablero.conteo, tablero.alturas, tablero.bloques_columna, tablero.bloques,
+        tablero.suma_alturas, tablero.altura_maxima, tablero.huecos,
+    )
+
+
+def comprobar_metricas(tablero):
+    recalculado = tablero.copia()
+    recalculado.recalcular()
+    assert metricas(tablero) == metricas(recalculado)
+    suma_alturas, huecos, _ = rasgos(tablero.bits, tablero.columnas, tablero.filas)
+    assert (tablero.suma_alturas, tablero.huecos) == (suma_alturas, huecos)
+
+
+def jugar(seed, pasos):
+    """Partida con acciones al azar (y gravedad cada 4 pasos); devuelve (juego, acciones)."""
+    rng = random.Random(seed)
+    juego = GameState(seed=seed)
+    acciones = []
+    for i in range(pasos):
+        accion = GRAVEDAD if i % 4 == 3 else rng.choice(ACCIONES)
+        acciones.append(accion)
+        juego.step(accion)
+        if juego.game_over:
+            break
+    return juego, acciones
+
+
+# --------------------
+# Board
+# --------------------
+@pytest.mark.parametrize("seed", range(5))
+def test_metricas_tras_fijar(seed):
+    rng = random.Random(seed)
+    juego = GameState(seed=seed)
+    fijadas = 0
+    while not juego.game_over and juego.pasos < 4000:
+        paso = juego.step(GRAVEDAD if rng.random() < 0.4 else rng.choice(ACCIONES))
+        if paso.fijada:
+            fijadas += 1
+            comprobar_metricas(juego.tablero)
+    assert fijadas > 10
+
+
+@pytest.mark.parametrize("completas", [1, 2, 4])
+def test_borrar_lineas(completas):
+    tablero = crear_tablero(8, completas=completas, seed=completas)
+    resto = [fila for fila in tablero.bits if fila != tablero.lleno]
+
+    assert borrar_lineas(tablero) == completas
+    assert tablero.bits == [0] * completas + resto
+    comprobar_metricas(tablero)
+
+
+# --------------------
+# GameState
+# --------------------
+def test_step_movimientos():
+    juego = GameState(seed=3)
+    x = juego.pieza["x"]
+
+    assert juego.step(IZQUIERDA).movido
+    assert juego.pieza["x"] == x - 1
+    assert juego.step(DERECHA).movido
+    assert juego.pieza["x"] == x
+    # hasta la pared: el último paso no mueve
+    pasos = [juego.step(IZQUIERDA) for _ in range(COLUMNAS)]
+    assert not pasos[-1].movido
+    assert not juego.step(NADA).movido
+
+    # la gravedad baja la pieza hasta que choca y entonces la fija
+    caidas = 0
+    while not (paso := juego.step(GRAVEDAD)).fijada:
+        assert paso.movido
+        caidas += 1
+    assert 0 < caidas < FILAS
+    assert juego.piezas == 1
+    assert juego.tablero.bloques == 4
+    assert juego.pasos == 3 + COLUMNAS + caidas + 1
+
+
+def test_step_misma_semilla():
+    juego, acciones = jugar(11, 3000)
+    otro = GameState(seed=11)
+    for accion in acciones:
+        otro.step(accion)
+    assert otro.tablero.bits == juego.tablero.bits
+    assert otro.tablero.colores == juego.tablero.colores
+    assert (otro.puntaje, otro.lineas, otro.piezas, otro.game_over) == (
+        juego.puntaje, juego.lineas, juego.piezas, juego.game_over
+    )
+
+
+def test_game_over_no_cambia_el_estado():
+    juego = GameState(seed=2)
+    while not juego.game_over:
+        juego.step(GRAVEDAD)
+    bits = list(juego.tablero.bits)
+    paso = juego.step(IZQUIERDA)
+    assert paso.game_over and not paso.movido
+    assert juego.tablero.bits == bits
+
+
+# --------------------
+# Replay
+# --------------------
+def estado(juego):
+    return (
+        juego.tablero.bits, dict(juego.pieza), juego.puntaje, juego.lineas,
+        juego.piezas, juego.game_over,
+    )
+
+
+def test_replay_cabecera():
+    replay = Replay(9, eventos=[(0, GRAVEDAD), (130, IZQUIERDA), (70000, NADA)], tick_hz=120)
+    leido = Replay.from_bytes(replay.to_bytes())
+    assert (leido.seed, leido.tick_hz, leido.eventos) == (9, 120, replay.eventos)
+
+    # versión 1: sin ticks por segundo en la cabecera
+    eventos = replay.to_bytes()[_CABECERA.size:]
+    leido = Replay.from_bytes(_CABECERA_V1.pack(b"TTRP", 1, 9, 11, 20, 1) + eventos)
+    assert leido.tick_hz == TICKS_V1
+    assert leido.eventos == replay.eventos
+
+
+def test_replay_seek():
+    rng = random.Random(5)
+    juego = GameState(seed=5)
+    grabadora = Grabadora(juego)
+    for frame in range(0, 3000, 2):
+        accion = GRAVEDAD if frame % 8 == 6 else rng.choice(ACCIONES)
+        grabadora.registrar(frame, accion)
+        juego.step(accion)
+        if juego.game_over:
+            break
+
+    reproductor = Reproductor(grabadora.replay, intervalo=100)
+    assert estado(reproductor.ejecutar()) == estado(juego)
+
+    for frame in (1234, 99, 100, 0, 2001):
+        reproductor.seek(frame)
+        desde_cero = Reproductor(grabadora.replay)
+        desde_cero.avanzar_hasta(frame)
+        assert estado(reproductor.juego) == estado(desde_cero.juego)
+
+
+# --------------------
+# VecTetris
+# --------------------
+def test_vec_tetris_borra_lineas():
+    np = pytest.importorskip("numpy")
+    from game.vec_env import VecTetris
+
+    env = VecTetris(3, COLUMNAS, FILAS, seed=0)
+    # tableros 0 y 1: fila de abajo completa y encima una a medias (no la puede
+    # completar una pieza); el 2 queda vacío
+    env.tableros[:2, -1, :] = 1
+    env.tableros[:2, -2, ::2] = 1
+    media = env.tableros[0, -2].copy()
+
+    lineas = np.zeros(3, dtype=np.int64)
+    while (env.piezas == 0).any():
+        acciones = np.where(env.piezas == 0, GRAVEDAD, NADA)
+        _, borradas, _ = env.step(acciones)
+        lineas += borradas
+
+    assert lineas.tolist() == [1, 1, 0]
+    assert env.puntaje.tolist() == [100, 100, 0]
+    assert not env.terminado.any()
+    for i in range(2):
+        tablero = env.tableros[i] != 0
+        assert not tablero.all(axis=1).any()
+        # la fila a medias bajó una posición (la pieza pudo caer en sus huecos)
+        assert (tablero[-1] >= (media != 0)).all()
+        assert tablero.sum() == (media != 0).sum() + 4
+    assert (env.tableros[2] != 0).sum() == 4
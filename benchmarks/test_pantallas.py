@@ -0,0 +1,71 @@
+# benchmarks/test_pantallas.py
+"""
+Un frame dibujado de cada pantalla (draw + display.update/flip) con el
+driver de video "dummy". Cada ronda marca la pantalla como sucia, como tras
+volver a ella desde otra.
+"""
+import time
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from game import main, menu, tetris
+from game.replay import Replay
+from game.screens import SceneManager
+
+
+@pytest.fixture(scope="module")
+def pantalla():
+    surface = main.inicializar()
+    # que la precarga en segundo plano no compita con las mediciones
+    while main.asset_loader.ocupado:
+        time.sleep(0.01)
+    return surface
+
+
+PANTALLAS = {
+    "menu_principal": main.MainMenuScreen,
+    "instrucciones": main.InstructionsScreen,
+    "creditos": main.CreditsScreen,
+    "partida": tetris.GameScene,
+    "easter_egg": tetris.EasterEggScene,
+    "replay": lambda: tetris.ReplayScene(Replay(seed=1)),
+    "game_over": menu.GameOverScene,
+}
+
+
+@pytest.fixture(params=list(PANTALLAS))
+def manager(request, pantalla):
+    manager = SceneManager(pantalla)
+    manager.push(PANTALLAS[request.param]())
+    yield manager
+    manager.quit()
+
+
+def test_frame(benchmark, manager):
+    scene = manager.top
+
+    def frame():
+        scene.invalidate()
+        manager.dibujar()
+
+    benchmark(frame)
+
+
+def test_frame_partida_en_curso(benchmark, pantalla):
+    # solo cambia la pieza que cae: el renderer redibuja los rectángulos sucios
+    manager = SceneManager(pantalla)
+    scene = tetris.GameScene()
+    manager.push(scene)
+
+    def frame():
+        if scene.juego.game_over:
+            scene.juego.reset(seed=1)
+        scene.aplicar(tetris.GRAVEDAD if scene.frame % 2 else tetris.DERECHA)
+        scene.frame += 1
+        scene.dirty = True
+        manager.dibujar()
+
+    benchmark(frame)
+    manager.quit()
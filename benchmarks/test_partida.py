@@ -0,0 +1,44 @@
+# benchmarks/test_partida.py
+"""
+Partidas completas sin pantalla (GameState.step), con semilla fija: pasos por
+segundo con una política aleatoria y partidas cortas jugadas por el bot.
+"""
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from game.ai import Bot, PoliticaBot
+from game.engine import GameState, ACCIONES, GRAVEDAD
+
+PASOS = 5000
+PIEZAS_BOT = 30
+
+
+def test_pasos_aleatorios(benchmark):
+    def jugar():
+        rng = random.Random(1)
+        juego = GameState(seed=1)
+        for i in range(PASOS):
+            juego.step(rng.choice(ACCIONES))
+            if i % 4 == 3:
+                juego.step(GRAVEDAD)
+            if juego.game_over:
+                juego.reset(seed=i)
+        return juego
+
+    benchmark(jugar)
+
+
+def test_partida_bot(benchmark):
+    def jugar():
+        # bot nuevo en cada ronda: sin cachés calientes de la ronda anterior
+        politica = PoliticaBot(Bot())
+        juego = GameState(seed=7)
+        while not juego.game_over and juego.piezas < PIEZAS_BOT:
+            juego.step(politica(juego))
+        return juego
+
+    juego = benchmark.pedantic(jugar, rounds=5, warmup_rounds=1)
+    assert juego.piezas == PIEZAS_BOT
@@ -0,0 +1,45 @@
+# benchmarks/test_recursos.py
+"""
+Carga de recursos con SoundManager e ImageManager, sin AssetLoader (la carga
+es síncrona y se mide entera) y sin bundle: se leen los archivos sueltos de
+assets/. Los efectos se miden decodificando cada vez y desde la caché de PCM.
+"""
+import pygame
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from game.images import ImageManager
+from game.pcm_cache import PCMCache
+from game.sounds import SoundManager
+from game.settings import GameSettings
+
+
+@pytest.fixture(scope="module")
+def pygame_iniciado():
+    SoundManager.configure_mixer()
+    pygame.init()
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pytest.skip("Audio no disponible")
+    # convert()/convert_alpha() necesitan una ventana
+    pygame.display.set_mode((GameSettings.WIDTH, GameSettings.HEIGHT))
+
+
+def test_sonidos_decodificados(benchmark, pygame_iniciado):
+    manager = benchmark(SoundManager, preload=True)
+    assert manager.sounds["move"] is not None
+
+
+def test_sonidos_cache_pcm(benchmark, pygame_iniciado, tmp_path):
+    cache = PCMCache(tmp_path)
+    SoundManager(preload=True, pcm_cache=cache)    # llena la caché
+
+    manager = benchmark(SoundManager, preload=True, pcm_cache=cache)
+    assert manager.sounds["move"] is not None
+    assert cache.aciertos > 0
+
+
+def test_imagenes(benchmark, pygame_iniciado):
+    benchmark(ImageManager, preload=True)
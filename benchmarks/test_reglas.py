@@ -0,0 +1,98 @@
+# benchmarks/test_reglas.py
+"""
+Reglas del juego (game.engine) sobre tableros vacío, medio lleno y casi en
+el tope: colision, unir_pieza, borrar_lineas y rotar_pieza, y la lectura de
+las métricas del tablero (alturas, huecos, fila más alta).
+
+Cada benchmark recorre todas las piezas y rotaciones en cada columna, apoyadas
+sobre el tablero, para que el tiempo no dependa de un caso particular.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from game.engine import colision, unir_pieza, borrar_lineas, rotar_pieza
+from game.pieces import PIEZAS, ROTACIONES, NUM_ROTACIONES
+
+from conftest import TABLEROS, crear_tablero
+
+COPIAS = 100
+
+
+def piezas_apoyadas(tablero):
+    """Una pieza por tipo, rotación y columna, en la fila donde se apoyaría al caer."""
+    piezas = []
+    for tipo in range(len(PIEZAS)):
+        for rot in range(NUM_ROTACIONES):
+            for x in range(tablero.columnas - ROTACIONES[tipo][rot].ancho + 1):
+                pieza = {"tipo": tipo, "rot": rot, "color": tipo + 1, "x": x, "y": 0}
+                if colision(tablero, pieza):
+                    continue
+                while not colision(tablero, pieza):
+                    pieza["y"] += 1
+                pieza["y"] -= 1
+                piezas.append(pieza)
+    return piezas
+
+
+def test_colision(benchmark, tablero):
+    piezas = piezas_apoyadas(tablero)
+    # apoyada no choca; una fila más abajo sí
+    abajo = [dict(p, y=p["y"] + 1) for p in piezas]
+
+    def comprobar():
+        for pieza in piezas:
+            colision(tablero, pieza)
+        for pieza in abajo:
+            colision(tablero, pieza)
+
+    benchmark(comprobar)
+
+
+def test_unir_pieza(benchmark, tablero):
+    piezas = piezas_apoyadas(tablero)
+
+    def preparar():
+        return (tablero.copia(),), {}
+
+    def unir(copia):
+        for pieza in piezas:
+            unir_pieza(copia, pieza)
+
+    benchmark.pedantic(unir, setup=preparar, rounds=500, warmup_rounds=10)
+
+
+@pytest.mark.parametrize("completas", [0, 1, 4])
+@pytest.mark.parametrize("nivel", list(TABLEROS))
+def test_borrar_lineas(benchmark, nivel, completas):
+    # una llamada tarda menos de lo que mide bien el reloj: se borran COPIAS tableros por ronda
+    original = crear_tablero(max(TABLEROS[nivel], completas), completas=completas)
+
+    def preparar():
+        return ([original.copia() for _ in range(COPIAS)],), {}
+
+    def borrar(copias):
+        return [borrar_lineas(copia) for copia in copias]
+
+    resultado = benchmark.pedantic(borrar, setup=preparar, rounds=200, warmup_rounds=10)
+    assert resultado == [completas] * COPIAS
+
+
+def test_rotar_pieza(benchmark, tablero):
+    # como GameState.step(ROTAR): rotar y deshacer si la nueva rotación choca
+    piezas = piezas_apoyadas(tablero)
+
+    def rotar():
+        for pieza in piezas:
+            rotar_pieza(pieza)
+            if colision(tablero, pieza):
+                rotar_pieza(pieza, -1)
+
+    benchmark(rotar)
+
+
+def test_metricas(benchmark, tablero):
+    def leer():
+        return tablero.suma_alturas, tablero.huecos, tablero.fila_mas_alta, tablero.conteo[-1]
+
+    benchmark(leer)
@@ -0,0 +1,262 @@
+# game/ai.py
+"""
+Jugador automático: búsqueda de colocaciones con evaluación heurística.
+
+Para la pieza actual se generan todas las colocaciones finales alcanzables
+(cada rotación, cada desplazamiento horizontal y caída hasta chocar) trabajando
+directamente sobre las máscaras de bits del tablero. Cada colocación se puntúa
+con una combinación lineal de rasgos (huecos, altura total, irregularidad y
+líneas borradas) y se hace una búsqueda en haz sobre las piezas siguientes.
+
+La generación de movimientos y la evaluación se guardan en cachés LRU con
+clave en el tablero (tupla de filas), así que tableros repetidos dentro del
+haz o entre turnos no se recalculan. Las cachés tienen pocos miles de
+entradas: el bot de simulate.py y el autojugador viven toda la partida (y
+entre partidas) y no deben crecer sin límite.
+
+No usa pygame: sirve tanto para el modo autojugador de run_game como para
+simulate.py (política "bot").
+"""
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+
+from game.pieces import ROTACIONES, NUM_ROTACIONES
+from game.engine import IZQUIERDA, DERECHA, ROTAR, GRAVEDAD
+
+
+class Pesos(NamedTuple):
+    altura: float = -0.510066         # suma de alturas de columnas
+    lineas: float = 0.760666          # líneas borradas
+    huecos: float = -0.35663          # celdas vacías bajo algún bloque
+    irregularidad: float = -0.184483  # suma de diferencias entre columnas vecinas
+
+
+class Colocacion(NamedTuple):
+    rot: int                  # rotación final (índice en ROTACIONES[tipo])
+    giros: int                # pulsaciones de ROTAR desde la rotación inicial
+    x: int
+    y: int
+    bits: Tuple[int, ...]     # tablero resultante, ya sin las líneas borradas
+    lineas: int
+
+
+class _CacheLRU:
+    """Diccionario con tamaño máximo que descarta lo usado hace más tiempo."""
+
+    def __init__(self, maximo):
+        self.maximo = maximo
+        self.datos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def get(self, clave):
+        valor = self.datos.get(clave)
+        if valor is None:
+            self.fallos += 1
+            return None
+        self.datos.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+
+    def put(self, clave, valor):
+        self.datos[clave] = valor
+        if len(self.datos) > self.maximo:
+            self.datos.popitem(last=False)
+
+    def clear(self):
+        self.datos.clear()
+
+
+# --------------------
+# Operaciones sobre tableros de bits
+# --------------------
+def _choca(bits, estado, x, y, columnas, filas):
+    if x < 0 or x + estado.ancho > columnas or y + estado.alto > filas:
+        return True
+    for m in estado.mascaras:
+        if y >= 0 and bits[y] & (m << x):
+            return True
+        y += 1
+    return False
+
+
+def _colocar(bits, estado, x, y, lleno):
+    """
+    Fija el estado en (x, y) y borra líneas. Devuelve (bits_nuevos, lineas), o
+    None si la pieza queda en parte por encima del tablero (y < 0).
+    """
+    if y < 0:
+        return None     # nuevos[y + i] con índice negativo escribiría en las filas de abajo
+    nuevos = list(bits)
+    lineas = 0
+    for i, m in enumerate(estado.mascaras):
+        fila = nuevos[y + i] | (m << x)
+        nuevos[y + i] = fila
+        if fila == lleno:
+            lineas += 1
+    if lineas:
+        restantes = [b for b in nuevos if b != lleno]
+        nuevos = [0] * lineas + restantes
+    return tuple(nuevos), lineas
+
+
+def rasgos(bits, columnas, filas):
+    """Devuelve (altura_total, huecos, irregularidad) de un tablero de bits."""
+    alturas = [0] * columnas
+    visto = 0
+    huecos = 0
+    for y, fila in enumerate(bits):
+        if not visto and not fila:
+            continue
+        nuevos = fila & ~visto
+        while nuevos:
+            bit = nuevos & -nuevos
+            alturas[bit.bit_length() - 1] = filas - y
+            nuevos ^= bit
+        visto |= fila
+        huecos += (visto & ~fila).bit_count()
+    irregularidad = 0
+    for i in range(columnas - 1):
+        irregularidad += abs(alturas[i] - alturas[i + 1])
+    return sum(alturas), huecos, irregularidad
+
+
+# --------------------
+# Bot
+# --------------------
+class Bot:
+    def __init__(self, pesos=None, profundidad=2, ancho_haz=8, max_cache=4096,
+                 max_cache_movimientos=256):
+        """
+        - max_cache: evaluaciones guardadas (un float por tablero).
+        - max_cache_movimientos: listas de colocaciones guardadas. Cada una ocupa
+          unos 9 KB y casi no se repiten entre turnos, así que esta caché es chica.
+        """
+        self.pesos = pesos or Pesos()
+        self.profundidad = profundidad    # piezas consideradas (actual + siguientes)
+        self.ancho_haz = ancho_haz
+        self.cache_movimientos = _CacheLRU(max_cache_movimientos)
+        self.cache_evaluacion = _CacheLRU(max_cache)
+
+    def colocaciones(self, bits, columnas, filas, tipo, rot=0, x=0, y=0):
+        """
+        Todas las colocaciones finales de la pieza `tipo` partiendo de (rot, x, y):
+        se rota en el sitio, se desplaza en horizontal y se deja caer.
+        Solo se incluyen las que se pueden alcanzar con esa secuencia de teclas.
+        """
+        bits = tuple(bits)
+        clave = (bits, columnas, tipo, rot, x, y)
+        resultado = self.cache_movimientos.get(clave)
+        if resultado is not None:
+            return resultado
+
+        lleno = (1 << columnas) - 1
+        tabla = ROTACIONES[tipo]
+        resultado = []
+        formas_vistas = set()
+        for giros in range(NUM_ROTACIONES):
+            r = (rot + giros) % NUM_ROTACIONES
+            estado = tabla[r]
+            if _choca(bits, estado, x, y, columnas, filas):
+                break   # las rotaciones siguientes tampoco son alcanzables
+            if estado.mascaras in formas_vistas:
+                continue
+            formas_vistas.add(estado.mascaras)
+
+            destinos = [x]
+            for paso in (-1, 1):
+                nx = x + paso
+                while not _choca(bits, estado, nx, y, columnas, filas):
+                    destinos.append(nx)
+                    nx += paso
+
+            for nx in destinos:
+                ny = y
+                while not _choca(bits, estado, nx, ny + 1, columnas, filas):
+                    ny += 1
+                colocado = _colocar(bits, estado, nx, ny, lleno)
+                if colocado is None:
+                    continue
+                nuevos, lineas = colocado
+                resultado.append(Colocacion(r, giros, nx, ny, nuevos, lineas))
+
+        self.cache_movimientos.put(clave, resultado)
+        return resultado
+
+    def evaluar(self, bits, columnas, filas):
+        """Puntaje heurístico del tablero (sin contar las líneas borradas)."""
+        valor = self.cache_evaluacion.get(bits)
+        if valor is None:
+            altura, huecos, irregularidad = rasgos(bits, columnas, filas)
+            p = self.pesos
+            valor = p.altura * altura + p.huecos * huecos + p.irregularidad * irregularidad
+            self.cache_evaluacion.put(bits, valor)
+        return valor
+
+    def buscar(self, bits, columnas, filas, piezas):
+        """
+        Búsqueda en haz. `piezas` es una lista de (tipo, rot, x, y): la primera es la
+        pieza actual y el resto las siguientes. Devuelve la Colocacion de la pieza
+        actual que lleva al mejor tablero, o None si no hay ninguna posible.
+        """
+        peso_lineas = self.pesos.lineas
+        haz = [(0.0, tuple(bits), None, 0)]   # (puntaje, bits, primera colocación, líneas)
+        for tipo, rot, x, y in piezas:
+            candidatos = []
+            for _, b, primera, lineas in haz:
+                for c in self.colocaciones(b, columnas, filas, tipo, rot, x, y):
+                    total = lineas + c.lineas
+                    valor = self.evaluar(c.bits, columnas, filas) + peso_lineas * total
+                    candidatos.append((valor, c.bits, primera or c, total))
+            if not candidatos:
+                break
+            candidatos.sort(key=lambda cand: cand[0], reverse=True)
+            haz = candidatos[:self.ancho_haz]
+        return haz[0][2]
+
+    def mejor_colocacion(self, juego):
+        """Mejor Colocacion para la pieza actual de un GameState."""
+        t = juego.tablero
+        piezas = [juego.pieza] + list(juego.siguientes)[:max(self.profundidad - 1, 0)]
+        return self.buscar(
+            t.bits, t.columnas, t.filas,
+            [(p["tipo"], p["rot"], p["x"], p["y"]) for p in piezas],
+        )
+
+    def plan(self, juego):
+        """
+        Lista de acciones (game.engine) que llevan la pieza actual a la mejor
+        colocación: rotaciones, desplazamientos y caída con GRAVEDAD.
+        """
+        destino = self.mejor_colocacion(juego)
+        if destino is None:
+            return [GRAVEDAD]
+        acciones = [ROTAR] * destino.giros
+        dx = destino.x - juego.pieza["x"]
+        acciones += [DERECHA if dx > 0 else IZQUIERDA] * abs(dx)
+        acciones += [GRAVEDAD] * (destino.y - juego.pieza["y"] + 1)
+        return acciones
+
+
+class PoliticaBot:
+    """
+    Política para simulate.py: calcula un plan cuando aparece una pieza nueva y
+    devuelve una acción por llamada.
+    """
+
+    def __init__(self, bot=None):
+        self.bot = bot or Bot()
+        self._clave = None
+        self._plan = []
+
+    def __call__(self, juego, rng=None):
+        clave = (id(juego), juego.piezas)
+        if clave != self._clave:
+            self._clave = clave
+            self._plan = self.bot.plan(juego)
+        if self._plan:
+            return self._plan.pop(0)
+        return GRAVEDAD
+
+
+politica_bot = PoliticaBot()
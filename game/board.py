@@ -0,0 +1,276 @@
+# game/board.py
+"""
+Motor de tablero basado en bitboards.
+
+Cada fila del tablero se guarda como un entero donde el bit ``x`` indica si
+la celda de la columna ``x`` está ocupada. En paralelo se guarda un arreglo
+compacto (``bytearray``) con el índice de color de cada celda (0 = vacía).
+
+Con esta representación:
+- la colisión de una pieza es un AND por cada fila de la pieza,
+- una fila está completa cuando es igual a la máscara llena,
+- borrar líneas es filtrar/recortar listas, sin reconstruir celda a celda.
+
+Además se mantienen, al fijar piezas y al borrar líneas, las métricas que
+leen los bots, la IA y el HUD: celdas ocupadas por fila (``conteo``), altura
+de cada columna (``alturas``), huecos y fila más alta. Fijar una pieza las
+actualiza en O(celdas de la pieza) y consultarlas es O(1). Las filas que
+unir_pieza completa quedan anotadas, así borrar_lineas no recorre el tablero
+cuando no hay líneas.
+
+Si se modifican ``bits``/``colores`` a mano hay que llamar a recalcular().
+"""
+
+
+def mascaras_de_forma(forma):
+    """
+    Convierte una forma (lista de listas con 0/1) en máscaras de bits por fila.
+    El bit ``j`` de cada máscara corresponde a la columna ``j`` de la forma.
+    """
+    mascaras = []
+    for fila in forma:
+        m = 0
+        for j, bloque in enumerate(fila):
+            if bloque:
+                m |= 1 << j
+        mascaras.append(m)
+    return mascaras
+
+
+class Board:
+    def __init__(self, columnas=11, filas=20):
+        self.columnas = columnas
+        self.filas = filas
+        self.lleno = (1 << columnas) - 1   # máscara de una fila completa
+        self.bits = [0] * filas            # ocupación por fila
+        self.colores = [bytearray(columnas) for _ in range(filas)]  # índice de color por celda
+        self._vaciar_metricas()
+
+    def _vaciar_metricas(self):
+        self.conteo = [0] * self.filas                 # celdas ocupadas por fila
+        self.alturas = [0] * self.columnas             # altura de cada columna (0 = vacía)
+        self.bloques_columna = [0] * self.columnas     # celdas ocupadas por columna
+        self.bloques = 0
+        self.suma_alturas = 0
+        self.altura_maxima = 0
+        self._completas = []    # filas completadas por unir_pieza y aún no borradas
+
+    def limpiar(self):
+        """Vacía el tablero."""
+        self.bits = [0] * self.filas
+        self.colores = [bytearray(self.columnas) for _ in range(self.filas)]
+        self._vaciar_metricas()
+
+    def recalcular(self):
+        """Recalcula todas las métricas a partir de ``bits`` (tras modificarlo a mano)."""
+        self._vaciar_metricas()
+        filas = self.filas
+        for y, fila in enumerate(self.bits):
+            if not fila:
+                continue
+            self.conteo[y] = fila.bit_count()
+            if fila == self.lleno:
+                self._completas.append(y)
+            x = 0
+            while fila:
+                if fila & 1:
+                    self.bloques_columna[x] += 1
+                    if not self.alturas[x]:
+                        self.alturas[x] = filas - y
+                fila >>= 1
+                x += 1
+        self.bloques = sum(self.conteo)
+        self.suma_alturas = sum(self.alturas)
+        self.altura_maxima = max(self.alturas)
+
+    def copia(self):
+        """Copia independiente del tablero."""
+        otro = Board.__new__(Board)
+        otro.columnas = self.columnas
+        otro.filas = self.filas
+        otro.lleno = self.lleno
+        otro.bits = list(self.bits)
+        otro.colores = [bytearray(fila) for fila in self.colores]
+        otro.conteo = list(self.conteo)
+        otro.alturas = list(self.alturas)
+        otro.bloques_columna = list(self.bloques_columna)
+        otro.bloques = self.bloques
+        otro.suma_alturas = self.suma_alturas
+        otro.altura_maxima = self.altura_maxima
+        otro._completas = list(self._completas)
+        return otro
+
+    # --------------------
+    # Consultas
+    # --------------------
+    def ocupada(self, x, y):
+        return bool(self.bits[y] >> x & 1)
+
+    def color(self, x, y):
+        """Índice de color de la celda (0 si está vacía)."""
+        return self.colores[y][x]
+
+    @property
+    def huecos(self):
+        """Celdas vacías con algún bloque encima en su columna."""
+        return self.suma_alturas - self.bloques
+
+    def huecos_columna(self, x):
+        return self.alturas[x] - self.bloques_columna[x]
+
+    @property
+    def fila_mas_alta(self):
+        """Índice de la fila ocupada más alta (``filas`` si el tablero está vacío)."""
+        return self.filas - self.altura_maxima
+
+    def celdas(self):
+        """
+        Itera las celdas ocupadas como tuplas (x, y, indice_color).
+        Las filas vacías se saltan sin recorrer sus columnas.
+        """
+        for y, fila_bits in enumerate(self.bits):
+            if not fila_bits:
+                continue
+            fila_colores = self.colores[y]
+            x = 0
+            while fila_bits:
+                if fila_bits & 1:
+                    yield x, y, fila_colores[x]
+                fila_bits >>= 1
+                x += 1
+
+    # --------------------
+    # Reglas
+    # --------------------
+    def colision(self, mascaras, x, y):
+        """
+        Indica si una pieza (máscaras por fila) colisiona en la posición (x, y)
+        con las paredes, el suelo o con bloques ya fijados.
+        Las filas por encima del tablero (y < 0) solo se comprueban contra las paredes.
+        """
+        lleno = self.lleno
+        bits = self.bits
+        filas = self.filas
+        for i, m in enumerate(mascaras):
+            if not m:
+                continue
+            if x >= 0:
+                fila = m << x
+                if fila > lleno:           # sale por la derecha
+                    return True
+            else:
+                if m & ((1 << -x) - 1):    # sale por la izquierda
+                    return True
+                fila = m >> -x
+            fy = y + i
+            if fy >= filas:
+                return True
+            if fy >= 0 and bits[fy] & fila:
+                return True
+        return False
+
+    def colision_estado(self, estado, x, y):
+        """
+        Igual que colision() pero con un estado de rotación precalculado
+        (ver game.pieces): los límites se comprueban con su caja contenedora
+        y el tablero con sus máscaras ya calculadas.
+        """
+        if x < 0 or x + estado.ancho > self.columnas or y + estado.alto > self.filas:
+            return True
+        bits = self.bits
+        fy = y
+        for m in estado.mascaras:
+            if fy >= 0 and bits[fy] & (m << x):
+                return True
+            fy += 1
+        return False
+
+    def unir_pieza(self, mascaras, x, y, color):
+        """Fija la pieza en el tablero con el índice de color indicado."""
+        bits = self.bits
+        colores = self.colores
+        conteo = self.conteo
+        alturas = self.alturas
+        bloques_columna = self.bloques_columna
+        filas = self.filas
+        for i, m in enumerate(mascaras):
+            if not m:
+                continue
+            fy = y + i
+            if fy < 0:
+                continue
+            # métricas: solo las celdas que no estaban ocupadas
+            nuevos = (m << x) & ~bits[fy]
+            bits[fy] |= m << x
+            if nuevos:
+                altura = filas - fy
+                n = 0
+                while nuevos:
+                    bit = nuevos & -nuevos
+                    c = bit.bit_length() - 1
+                    bloques_columna[c] += 1
+                    if altura > alturas[c]:
+                        self.suma_alturas += altura - alturas[c]
+                        alturas[c] = altura
+                    nuevos ^= bit
+                    n += 1
+                conteo[fy] += n
+                self.bloques += n
+                if altura > self.altura_maxima:
+                    self.altura_maxima = altura
+                if conteo[fy] == self.columnas:
+                    self._completas.append(fy)
+            fila_colores = colores[fy]
+            j = 0
+            while m:
+                if m & 1:
+                    fila_colores[x + j] = color
+                m >>= 1
+                j += 1
+
+    def borrar_lineas(self):
+        """
+        Elimina las filas completas y baja el resto.
+        Devuelve la cantidad de líneas borradas.
+        """
+        if not self._completas:
+            return 0
+        lleno = self.lleno
+        bits = self.bits
+        completas = {y for y in self._completas if bits[y] == lleno}
+        self._completas = []
+        if not completas:
+            return 0
+
+        filas = self.filas
+        columnas = self.columnas
+        restantes = [y for y in range(filas) if y not in completas]
+        lineas = len(completas)
+        self.bits = bits = [0] * lineas + [bits[y] for y in restantes]
+        self.colores = (
+            [bytearray(columnas) for _ in range(lineas)]
+            + [self.colores[y] for y in restantes]
+        )
+        self.conteo = [0] * lineas + [self.conteo[y] for y in restantes]
+
+        # cada columna pierde un bloque por línea; la altura baja `lineas` si la
+        # columna tenía bloques por encima de la línea borrada más alta
+        self.bloques -= lineas * columnas
+        tope = filas - min(completas)
+        alturas = self.alturas
+        for c in range(columnas):
+            self.bloques_columna[c] -= lineas
+            if alturas[c] > tope:
+                alturas[c] -= lineas
+                continue
+            # su bloque más alto estaba en una línea borrada: buscar el siguiente
+            bit = 1 << c
+            altura = 0
+            for fy in range(lineas, filas):
+                if bits[fy] & bit:
+                    altura = filas - fy
+                    break
+            alturas[c] = altura
+        self.suma_alturas = sum(alturas)
+        self.altura_maxima = max(alturas)
+        return lineas
@@ -0,0 +1,227 @@
+# game/bundle.py
+"""
+Paquete de recursos: todo assets/ en un único archivo indexado.
+
+Abrir decenas de archivos sueltos y recorrer directorios es lo más lento del
+arranque en almacenamiento flash o en red. `python -m game.bundle` empaqueta
+assets/ en assets.bundle; ImageManager y SoundManager lo usan si existe y
+vuelven a los archivos sueltos para lo que no esté dentro.
+
+Formato (.bundle):
+    cabecera  "<4sBI": magia b"TTAB", versión, cantidad de entradas
+    índice    por entrada "<QQHB" (offset, longitud, largo del nombre, largo
+              del formato) seguido del nombre (ruta relativa a assets/ con "/")
+              y del formato (extensión sin punto), ambos en UTF-8
+    datos     el contenido de cada archivo, tal cual, uno detrás de otro
+
+El archivo se abre con mmap y cada recurso se lee con un ArchivoEnMemoria,
+un objeto tipo archivo sobre un memoryview del mapa (sin copiar el recurso)
+que se puede pasar a pygame.image.load, pygame.mixer.Sound o
+pygame.mixer.music.load.
+
+Uso:
+    python -m game.bundle                       # assets/ -> assets.bundle
+    python -m game.bundle --origen assets --salida /tmp/assets.bundle
+"""
+import argparse
+import io
+import mmap
+import struct
+from pathlib import Path
+from typing import NamedTuple
+
+MAGIA = b"TTAB"
+VERSION = 1
+_CABECERA = struct.Struct("<4sBI")
+_ENTRADA = struct.Struct("<QQHB")
+
+
+class Entrada(NamedTuple):
+    nombre: str      # ruta relativa dentro de assets/, p. ej. "images/secret.png"
+    offset: int
+    longitud: int
+    formato: str     # extensión sin punto, p. ej. "png"
+
+    @property
+    def name(self):
+        """Nombre del archivo (como Path.name), para mensajes."""
+        return self.nombre.rsplit("/", 1)[-1]
+
+
+class ArchivoEnMemoria(io.RawIOBase):
+    """Archivo de solo lectura sobre un memoryview (no copia los datos)."""
+
+    def __init__(self, vista):
+        super().__init__()
+        self._vista = vista
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, destino):
+        n = min(len(destino), len(self._vista) - self._pos)
+        if n <= 0:
+            return 0
+        destino[:n] = self._vista[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += len(self._vista)
+        self._pos = max(pos, 0)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        # soltar el memoryview para que el mmap se pueda cerrar
+        self._vista = memoryview(b"")
+        super().close()
+
+
+# --------------------
+# Construcción
+# --------------------
+def construir(origen, destino):
+    """Empaqueta todos los archivos de origen (recursivo) en destino. Devuelve las entradas."""
+    origen = Path(origen)
+    archivos = sorted(p for p in origen.rglob("*") if p.is_file())
+
+    nombres = [p.relative_to(origen).as_posix() for p in archivos]
+    formatos = [p.suffix.lstrip(".").lower() for p in archivos]
+    tam_indice = _CABECERA.size + sum(
+        _ENTRADA.size + len(n.encode("utf-8")) + len(f.encode("utf-8"))
+        for n, f in zip(nombres, formatos)
+    )
+
+    entradas = []
+    offset = tam_indice
+    for archivo, nombre, formato in zip(archivos, nombres, formatos):
+        longitud = archivo.stat().st_size
+        entradas.append(Entrada(nombre, offset, longitud, formato))
+        offset += longitud
+
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    with open(destino, "wb") as salida:
+        salida.write(_CABECERA.pack(MAGIA, VERSION, len(entradas)))
+        for e in entradas:
+            nombre = e.nombre.encode("utf-8")
+            formato = e.formato.encode("utf-8")
+            salida.write(_ENTRADA.pack(e.offset, e.longitud, len(nombre), len(formato)))
+            salida.write(nombre)
+            salida.write(formato)
+        for archivo in archivos:
+            salida.write(archivo.read_bytes())
+    return entradas
+
+
+# --------------------
+# Lectura
+# --------------------
+class Bundle:
+    def __init__(self, ruta):
+        self.ruta = Path(ruta)
+        self._archivo = open(self.ruta, "rb")
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # archivo vacío: mmap no acepta longitud 0
+            self._archivo.close()
+            raise ValueError(f"Bundle vacío: {self.ruta}")
+        self._vista = memoryview(self._mapa)
+        self.entradas = {}      # nombre en minúsculas -> Entrada
+        self._stems = {}        # "carpeta/stem" en minúsculas -> [Entrada, ...]
+        self._leer_indice()
+
+    def _leer_indice(self):
+        magia, version, cantidad = _CABECERA.unpack_from(self._mapa, 0)
+        if magia != MAGIA:
+            raise ValueError(f"No es un bundle de recursos: {self.ruta}")
+        if version != VERSION:
+            raise ValueError(f"Versión de bundle no soportada: {version}")
+        pos = _CABECERA.size
+        for _ in range(cantidad):
+            offset, longitud, largo_nombre, largo_formato = _ENTRADA.unpack_from(self._mapa, pos)
+            pos += _ENTRADA.size
+            nombre = bytes(self._vista[pos:pos + largo_nombre]).decode("utf-8")
+            pos += largo_nombre
+            formato = bytes(self._vista[pos:pos + largo_formato]).decode("utf-8")
+            pos += largo_formato
+            if offset + longitud > len(self._mapa):
+                raise ValueError(f"Bundle truncado: {self.ruta}")
+            entrada = Entrada(nombre, offset, longitud, formato)
+            clave = nombre.lower()
+            self.entradas[clave] = entrada
+            self._stems.setdefault(clave.rsplit(".", 1)[0], []).append(entrada)
+
+    def __contains__(self, nombre):
+        return nombre.lower() in self.entradas
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def buscar(self, nombre):
+        """Entrada por ruta relativa (sin distinguir mayúsculas) o None."""
+        return self.entradas.get(nombre.lower())
+
+    def buscar_stem(self, carpeta, stem, extensiones):
+        """Primera entrada carpeta/stem con alguna de las extensiones dadas (en ese orden)."""
+        candidatas = self._stems.get(f"{carpeta}/{stem}".lower(), ())
+        for ext in extensiones:
+            ext = ext.lstrip(".").lower()
+            for entrada in candidatas:
+                if entrada.formato == ext:
+                    return entrada
+        return None
+
+    def datos(self, entrada):
+        """memoryview con el contenido de la entrada (sin copiar)."""
+        return self._vista[entrada.offset:entrada.offset + entrada.longitud]
+
+    def abrir(self, entrada):
+        """Objeto tipo archivo para pasar a pygame (image.load, mixer.Sound, music.load)."""
+        return ArchivoEnMemoria(self.datos(entrada))
+
+    def cerrar(self):
+        # los ArchivoEnMemoria abiertos deben cerrarse antes
+        self._vista.release()
+        self._mapa.close()
+        self._archivo.close()
+
+
+def abrir_bundle(ruta):
+    """Abre el bundle si existe y es válido; si no, devuelve None (se usan archivos sueltos)."""
+    ruta = Path(ruta)
+    if not ruta.is_file():
+        return None
+    try:
+        return Bundle(ruta)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"❌ No se pudo abrir el bundle {ruta}: {e}")
+        return None
+
+
+def main(argv=None):
+    from game.settings import GameSettings
+
+    parser = argparse.ArgumentParser(description="Empaqueta assets/ en un único archivo.")
+    parser.add_argument("--origen", default=str(GameSettings.ASSETS_DIR), help="carpeta de recursos")
+    parser.add_argument("--salida", default=str(GameSettings.ASSETS_BUNDLE), help="archivo .bundle a generar")
+    args = parser.parse_args(argv)
+
+    entradas = construir(args.origen, args.salida)
+    total = sum(e.longitud for e in entradas)
+    print(f"{len(entradas)} archivos, {total / 1024:.0f} KiB -> {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# game/controls.py
+"""
+Entrada de la partida a resolución de tick: DAS/ARR por tecla y cola de eventos.
+
+handle_event no mueve la pieza: KEYDOWN/KEYUP de las teclas de juego se
+encolan con la hora en que se recibieron y se aplican en el siguiente tick de
+simulación (InputHandler.tick). Así un toque corto entre dos ticks no se
+pierde y el orden de las teclas se respeta.
+
+Cada tecla tiene su Control:
+- das_ms (delayed auto shift): cuánto hay que mantenerla antes de que se
+  repita (None = no se repite, p. ej. rotar).
+- arr_ms (auto repeat rate): cada cuánto se repite después. 0 = en el mismo
+  tick hasta que la acción deje de mover la pieza (hasta la pared).
+- grupo: de las teclas mantenidas de un mismo grupo solo se repite la última
+  pulsada (izquierda/derecha).
+
+Los tiempos se pasan a ticks: a 60 ticks por segundo la resolución es de ~17 ms.
+
+Latencia: desde que llega el KEYDOWN hasta que el tick mueve la pieza
+("movimiento") y hasta que se dibuja el frame con el movimiento ("frame").
+latency_report() da los percentiles; se exportan con --profile-out.
+"""
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+
+import pygame
+
+from game.profiler import RingBuffer, percentil
+
+
+class Control(NamedTuple):
+    accion: int
+    das_ms: Optional[int] = None
+    arr_ms: int = 0
+    grupo: Optional[str] = None
+
+
+# Latencias medidas en todas las partidas del proceso (segundos)
+latencias = {
+    "movimiento": RingBuffer(512),
+    "frame": RingBuffer(512),
+}
+
+
+def latency_report():
+    """{nombre: {p50, p95, max, muestras}} en milisegundos de las latencias de entrada."""
+    informe = {}
+    for nombre, buffer in latencias.items():
+        valores = sorted(buffer.valores())
+        informe[nombre] = {
+            "p50_ms": percentil(valores, 50) * 1000,
+            "p95_ms": percentil(valores, 95) * 1000,
+            "max_ms": valores[-1] * 1000 if valores else 0.0,
+            "muestras": len(valores),
+        }
+    return informe
+
+
+class _Mantenida:
+    """Estado de una tecla mantenida."""
+
+    __slots__ = ("control", "ticks", "orden")
+
+    def __init__(self, control, orden):
+        self.control = control
+        self.ticks = 0      # ticks desde que se pulsó
+        self.orden = orden  # para saber cuál del grupo se pulsó última
+
+
+class InputHandler:
+    def __init__(self, controles, tick_hz):
+        """
+        - controles: dict tecla de pygame -> Control.
+        - tick_hz: ticks de simulación por segundo (para pasar los ms a ticks).
+        """
+        self.controles = controles
+        self.tick_hz = tick_hz
+        self.cola = deque()         # (tipo, tecla, marca perf_counter)
+        self.mantenidas = {}        # tecla -> _Mantenida
+        self._orden = 0
+        self._pendientes = []       # marcas de entradas que movieron y aún no se dibujaron
+
+    def _ticks(self, ms):
+        return round(ms * self.tick_hz / 1000)
+
+    # --------------------
+    # Eventos
+    # --------------------
+    def evento(self, event):
+        """Encola KEYDOWN/KEYUP de las teclas de juego. Devuelve True si lo usó."""
+        if event.type not in (pygame.KEYDOWN, pygame.KEYUP) or event.key not in self.controles:
+            return False
+        self.cola.append((event.type, event.key, time.perf_counter()))
+        return True
+
+    def soltar_todo(self):
+        """Olvida la cola y las teclas mantenidas (pausa, pérdida de foco, otra pantalla encima)."""
+        self.cola.clear()
+        self.mantenidas.clear()
+
+    # --------------------
+    # Tick
+    # --------------------
+    def _repetir(self, accion, aplicar, arr_ticks):
+        if arr_ticks:
+            return [aplicar(accion)]
+        # ARR 0: hasta que deje de mover (como mucho el ancho del tablero)
+        pasos = []
+        for _ in range(64):
+            paso = aplicar(accion)
+            pasos.append(paso)
+            if not paso.movido:
+                break
+        return pasos
+
+    def tick(self, aplicar):
+        """
+        Aplica las entradas de este tick con aplicar(accion) -> Paso: primero las
+        pulsaciones encoladas y después las repeticiones de las teclas mantenidas.
+        Devuelve la lista de (accion, Paso) aplicados.
+        """
+        aplicados = []
+        nuevas = set()
+        while self.cola:
+            tipo, tecla, marca = self.cola.popleft()
+            if tipo == pygame.KEYUP:
+                self.mantenidas.pop(tecla, None)
+                continue
+            if tecla in self.mantenidas:
+                continue    # repetición del sistema operativo
+            control = self.controles[tecla]
+            self._orden += 1
+            self.mantenidas[tecla] = _Mantenida(control, self._orden)
+            nuevas.add(tecla)
+            paso = aplicar(control.accion)
+            aplicados.append((control.accion, paso))
+            if paso.movido:
+                latencias["movimiento"].append(time.perf_counter() - marca)
+                self._pendientes.append(marca)
+
+        for tecla, estado in self.mantenidas.items():
+            if tecla in nuevas:
+                continue
+            control = estado.control
+            estado.ticks += 1
+            if control.das_ms is None:
+                continue
+            if control.grupo is not None and any(
+                otra.control.grupo == control.grupo and otra.orden > estado.orden
+                for otra in self.mantenidas.values()
+            ):
+                continue    # se pulsó después otra tecla del grupo: manda esa
+            das = self._ticks(control.das_ms)
+            arr = max(1, self._ticks(control.arr_ms)) if control.arr_ms else 0
+            if estado.ticks < das or (arr and (estado.ticks - das) % arr):
+                continue
+            for paso in self._repetir(control.accion, aplicar, arr):
+                aplicados.append((control.accion, paso))
+        return aplicados
+
+    def frame_dibujado(self):
+        """Llamar después de dibujar: cierra la latencia de las entradas ya visibles."""
+        if self._pendientes:
+            ahora = time.perf_counter()
+            for marca in self._pendientes:
+                latencias["frame"].append(ahora - marca)
+            self._pendientes.clear()
@@ -0,0 +1,91 @@
+# game/dir_index.py
+"""
+Índice en memoria de una carpeta de recursos.
+
+Buscar un archivo sin distinguir mayúsculas, o probar otras extensiones,
+recorría la carpeta entera con iterdir() en cada intento (hasta cinco
+recorridos más diez exists() por imagen que faltaba). DirectoryIndex lee la
+carpeta una sola vez y resuelve con búsquedas en diccionarios:
+
+    nombre en minúsculas -> [Path, ...]
+    stem en minúsculas   -> {extensión en minúsculas: [Path, ...]}
+
+refrescar() vuelve a leer la carpeta (por ejemplo al instalar un pack de
+skins). Con vigilar_mtime=True cada búsqueda compara antes la fecha de
+modificación de la carpeta (un solo stat) y refresca si cambió.
+"""
+from pathlib import Path
+
+
+class DirectoryIndex:
+    def __init__(self, carpeta, vigilar_mtime=False):
+        self.carpeta = Path(carpeta)
+        self.vigilar_mtime = vigilar_mtime
+        self._nombres = {}
+        self._stems = {}
+        self._mtime = None
+        self.refrescar()
+
+    def _mtime_actual(self):
+        try:
+            return self.carpeta.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def refrescar(self):
+        """Vuelve a leer la carpeta."""
+        self._nombres = {}
+        self._stems = {}
+        self._mtime = self._mtime_actual()
+        try:
+            archivos = sorted(p for p in self.carpeta.iterdir() if p.is_file())
+        except OSError:
+            return
+        for p in archivos:
+            self._nombres.setdefault(p.name.lower(), []).append(p)
+            self._stems.setdefault(p.stem.lower(), {}).setdefault(p.suffix.lower(), []).append(p)
+
+    def _comprobar(self):
+        if self.vigilar_mtime and self._mtime_actual() != self._mtime:
+            self.refrescar()
+
+    @staticmethod
+    def _preferir(candidatos, nombre):
+        # con dos archivos que solo difieren en mayúsculas gana el nombre exacto
+        for p in candidatos:
+            if p.name == nombre:
+                return p
+        return candidatos[0]
+
+    def buscar(self, nombre):
+        """
+        Path del archivo llamado `nombre` (sin distinguir mayúsculas) o None.
+        Los nombres con subcarpetas no están en el índice y se comprueban en disco.
+        """
+        if "/" in nombre or "\\" in nombre:
+            ruta = self.carpeta.joinpath(nombre)
+            return ruta if ruta.is_file() else None
+        self._comprobar()
+        candidatos = self._nombres.get(nombre.lower())
+        if not candidatos:
+            return None
+        return self._preferir(candidatos, nombre)
+
+    def buscar_stem(self, stem, extensiones):
+        """Primer archivo `stem` + extensión, probando las extensiones en orden."""
+        self._comprobar()
+        por_extension = self._stems.get(stem.lower())
+        if not por_extension:
+            return None
+        for ext in extensiones:
+            candidatos = por_extension.get(ext.lower())
+            if candidatos:
+                return self._preferir(candidatos, stem + ext)
+        return None
+
+    def __contains__(self, nombre):
+        return self.buscar(nombre) is not None
+
+    def __len__(self):
+        self._comprobar()
+        return sum(len(c) for c in self._nombres.values())
@@ -0,0 +1,194 @@
+# game/engine.py
+"""
+Núcleo de simulación del Tetris sin dependencias de pygame.
+
+Contiene las reglas del juego (colisión, fijado de piezas, borrado de líneas,
+puntaje y fin de partida) y la clase GameState, que avanza la partida con
+step(accion). El generador de piezas usa un random.Random propio, por lo que
+una semilla reproduce exactamente la misma secuencia.
+
+Importar este módulo no inicializa SDL: sirve para correr partidas en
+servidores sin pantalla (tests, bots, pruebas de carga).
+"""
+import random
+from collections import deque
+from typing import NamedTuple
+
+from game.board import Board
+from game.pieces import COLORES, PIEZAS, ROTACIONES, NUM_ROTACIONES, estado
+
+# --------------------
+# Acciones
+# --------------------
+NADA = 0
+IZQUIERDA = 1
+DERECHA = 2
+ABAJO = 3       # bajada suave: si choca, la pieza no se fija
+ROTAR = 4
+GRAVEDAD = 5    # caída automática: si choca, la pieza se fija
+
+ACCIONES = (NADA, IZQUIERDA, DERECHA, ABAJO, ROTAR, GRAVEDAD)
+
+PUNTOS_POR_LINEAS = {1: 100, 2: 300, 3: 500, 4: 800}
+
+
+class Paso(NamedTuple):
+    movido: bool      # la acción cambió la posición/rotación de la pieza
+    fijada: bool      # la pieza se fijó en el tablero
+    lineas: int       # líneas borradas en este paso
+    game_over: bool
+
+
+# --------------------
+# Reglas
+# --------------------
+def crear_nueva_pieza(rng, columnas):
+    tipo = rng.randrange(len(PIEZAS))
+    color = rng.randint(1, len(COLORES))  # índice 1-based en COLORES (0 = vacío)
+    return {
+        "tipo": tipo,
+        "rot": 0,
+        "color": color,
+        "x": columnas // 2 - ROTACIONES[tipo][0].ancho // 2,
+        "y": 0
+    }
+
+
+def colision(tablero, pieza):
+    return tablero.colision_estado(estado(pieza), pieza["x"], pieza["y"])
+
+
+def unir_pieza(tablero, pieza):
+    tablero.unir_pieza(estado(pieza).mascaras, pieza["x"], pieza["y"], pieza["color"])
+
+
+def borrar_lineas(tablero):
+    return tablero.borrar_lineas()
+
+
+def rotar_pieza(pieza, sentido=1):
+    pieza["rot"] = (pieza["rot"] + sentido) % NUM_ROTACIONES
+    return pieza
+
+
+def puntaje_por_lineas(lineas):
+    return PUNTOS_POR_LINEAS.get(lineas, 0)
+
+
+# --------------------
+# Estado de partida
+# --------------------
+class GameState:
+    def __init__(self, columnas=11, filas=20, seed=None, vista_previa=1):
+        self.columnas = columnas
+        self.filas = filas
+        self.vista_previa = vista_previa   # piezas siguientes conocidas de antemano
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """
+        Reinicia la partida. Con la misma semilla se repite la secuencia de piezas.
+        Sin semilla se elige una al azar y queda guardada en self.seed.
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tablero = Board(self.columnas, self.filas)
+        self.puntaje = 0
+        self.lineas = 0
+        self.piezas = 0     # piezas fijadas
+        self.pasos = 0      # llamadas a step()
+        self.game_over = False
+        self.pieza = crear_nueva_pieza(self.rng, self.columnas)
+        self.siguientes = deque(
+            crear_nueva_pieza(self.rng, self.columnas) for _ in range(self.vista_previa)
+        )
+        if colision(self.tablero, self.pieza):
+            self.game_over = True
+
+    def snapshot(self):
+        """Copia del estado completo (incluido el generador) para restaurar después."""
+        return {
+            "tablero": self.tablero.copia(),
+            "pieza": dict(self.pieza),
+            "siguientes": [dict(p) for p in self.siguientes],
+            "rng": self.rng.getstate(),
+            "puntaje": self.puntaje,
+            "lineas": self.lineas,
+            "piezas": self.piezas,
+            "pasos": self.pasos,
+            "game_over": self.game_over,
+        }
+
+    def restore(self, snap):
+        """Vuelve al estado guardado con snapshot(). El snapshot se puede reutilizar."""
+        self.tablero = snap["tablero"].copia()
+        self.pieza = dict(snap["pieza"])
+        self.siguientes = deque(dict(p) for p in snap["siguientes"])
+        self.rng.setstate(snap["rng"])
+        self.puntaje = snap["puntaje"]
+        self.lineas = snap["lineas"]
+        self.piezas = snap["piezas"]
+        self.pasos = snap["pasos"]
+        self.game_over = snap["game_over"]
+
+    def _siguiente_pieza(self):
+        """Saca la próxima pieza de la cola y repone la vista previa."""
+        if not self.siguientes:
+            return crear_nueva_pieza(self.rng, self.columnas)
+        self.siguientes.append(crear_nueva_pieza(self.rng, self.columnas))
+        return self.siguientes.popleft()
+
+    def _mover(self, dx, dy):
+        pieza = self.pieza
+        pieza["x"] += dx
+        pieza["y"] += dy
+        if colision(self.tablero, pieza):
+            pieza["x"] -= dx
+            pieza["y"] -= dy
+            return False
+        return True
+
+    def _fijar(self):
+        """Fija la pieza actual, borra líneas, suma puntaje y crea la siguiente."""
+        unir_pieza(self.tablero, self.pieza)
+        self.piezas += 1
+        lineas = borrar_lineas(self.tablero)
+        if lineas:
+            self.lineas += lineas
+            self.puntaje += puntaje_por_lineas(lineas)
+
+        self.pieza = self._siguiente_pieza()
+        if colision(self.tablero, self.pieza):
+            self.game_over = True
+        return lineas
+
+    def step(self, accion):
+        """
+        Aplica una acción (ver ACCIONES) y devuelve un Paso con lo ocurrido.
+        Tras el fin de la partida step() no modifica el estado.
+        """
+        if self.game_over:
+            return Paso(False, False, 0, True)
+        self.pasos += 1
+
+        if accion == IZQUIERDA:
+            return Paso(self._mover(-1, 0), False, 0, False)
+        if accion == DERECHA:
+            return Paso(self._mover(1, 0), False, 0, False)
+        if accion == ABAJO:
+            return Paso(self._mover(0, 1), False, 0, False)
+        if accion == ROTAR:
+            rotar_pieza(self.pieza)
+            if colision(self.tablero, self.pieza):
+                # deshacer la rotación
+                rotar_pieza(self.pieza, -1)
+                return Paso(False, False, 0, False)
+            return Paso(True, False, 0, False)
+        if accion == GRAVEDAD:
+            if self._mover(0, 1):
+                return Paso(True, False, 0, False)
+            lineas = self._fijar()
+            return Paso(False, True, lineas, self.game_over)
+        return Paso(False, False, 0, False)
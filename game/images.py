@@ -1,12 +1,35 @@
 # game/images.py
 import pygame
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
 from game.settings import GameSettings
+from game.loader import PRIORIDAD_NORMAL, PRIORIDAD_EXTRA
+from game.bundle import Entrada
+from game.dir_index import DirectoryIndex
 
 class ImageManager:
-    def __init__(self, preload=True):
+    # Orden de carga en segundo plano: créditos y screamer al final
+    PRIORIDADES = {
+        "credit_final": PRIORIDAD_EXTRA,
+        "credit_static": PRIORIDAD_EXTRA,
+        "screamer": PRIORIDAD_EXTRA,
+    }
+
+    EXTENSIONES = [".png", ".jpg", ".jpeg", ".webp", ".bmp"]
+
+    def __init__(self, preload=True, loader=None, bundle=None):
         self.base_dir = Path(GameSettings.IMAGES_DIR)
         self.images = {}  # cache: name -> pygame.Surface | None
+        self.loader = loader   # AssetLoader opcional: si existe, el preload no bloquea
+        self.bundle = bundle   # Bundle opcional: se busca ahí antes que en IMAGES_DIR
+        # índice de IMAGES_DIR: las búsquedas no recorren la carpeta
+        self.index = DirectoryIndex(self.base_dir, vigilar_mtime=GameSettings.VIGILAR_ASSETS)
+        self._pendientes = {}  # name -> (Future, size, convert_alpha)
+        # variantes escaladas: (name, size, smooth) -> Surface, LRU con límite de memoria
+        self._variantes = OrderedDict()
+        self._bytes_variantes = 0
+        self.scaled_budget = GameSettings.PRESUPUESTO_VARIANTES
         self.default_map = {
             "secret": "secret.png",
             "premio": "premio.png",
@@ -31,48 +54,36 @@ class ImageManager:
         Busca un archivo en self.base_dir de forma insensible a mayúsculas.
         Devuelve Path si lo encuentra, o None.
         """
-        try:
-            target_lower = filename.lower()
-            if not self.base_dir.exists():
-                return None
-            for p in self.base_dir.iterdir():
-                if p.is_file() and p.name.lower() == target_lower:
-                    return p
-        except Exception:
-            return None
-        return None
+        return self.index.buscar(filename)
 
     def _try_alternative_extensions(self, stem):
         """
         Prueba extensiones comunes si no existe el archivo con la extensión original.
         Devuelve Path si encuentra alguno, o None.
         """
-        exts = [".png", ".jpg", ".jpeg", ".webp", ".bmp"]
-        for ext in exts:
-            candidate = self.base_dir.joinpath(stem + ext)
-            if candidate.exists():
-                return candidate
-            # case-insensitive search
-            found = self._find_file_case_insensitive(stem + ext)
-            if found:
-                return found
-        return None
+        return self.index.buscar_stem(stem, self.EXTENSIONES)
+
+    def refresh_index(self):
+        """Vuelve a leer IMAGES_DIR (por ejemplo tras copiar imágenes nuevas)."""
+        self.index.refrescar()
 
     # --------------------
     # Carga y caché
     # --------------------
-    def load_image(self, name, filename=None, size=None, convert_alpha=True):
+    def _en_bundle(self, filename):
+        """Busca en el bundle por nombre (sin distinguir mayúsculas) o por stem con otra extensión."""
+        if self.bundle is None:
+            return None
+        entrada = self.bundle.buscar(f"images/{filename}")
+        if entrada is None:
+            entrada = self.bundle.buscar_stem("images", Path(filename).stem, self.EXTENSIONES)
+        return entrada
+
+    def _resolver(self, name, filename):
         """
-        Carga una imagen y la guarda en caché.
-        - name: clave lógica para referenciar la imagen.
-        - filename: nombre de archivo dentro de IMAGES_DIR; si None usa default_map.
-        - size: tupla (w,h) para escalar opcionalmente.
-        - convert_alpha: True para conservar transparencia cuando sea posible.
-        Devuelve pygame.Surface o None.
+        Entrada del bundle o ruta del archivo de la imagen, o None (y la deja
+        en caché como None) si no hay.
         """
-        if name in self.images:
-            return self.images[name]
-
         if filename is None:
             filename = self.default_map.get(name)
             if filename is None:
@@ -80,31 +91,47 @@ class ImageManager:
                 self.images[name] = None
                 return None
 
+        entrada = self._en_bundle(filename)
+        if entrada is not None:
+            return entrada
+
         # Ruta esperada
         path = self._root_path(filename)
         print(f"🔎 Intentando cargar imagen: {path}")
 
         # Si no existe, intentar búsqueda insensible a mayúsculas
-        if not path.exists():
-            alt = self._find_file_case_insensitive(filename)
-            if alt:
-                print(f"ℹ️  Encontrado (case-insensitive): {alt}")
-                path = alt
-            else:
-                # intentar con extensiones alternativas usando el stem
-                stem = Path(filename).stem
-                alt2 = self._try_alternative_extensions(stem)
-                if alt2:
-                    print(f"ℹ️  Encontrado con extensión alternativa: {alt2}")
-                    path = alt2
-
-        if not path.exists():
+        encontrado = self._find_file_case_insensitive(filename)
+        if encontrado is None:
+            # intentar con extensiones alternativas usando el stem
+            stem = Path(filename).stem
+            encontrado = self._try_alternative_extensions(stem)
+            if encontrado:
+                print(f"ℹ️  Encontrado con extensión alternativa: {encontrado}")
+        elif encontrado.name != Path(filename).name:
+            print(f"ℹ️  Encontrado (case-insensitive): {encontrado}")
+
+        if encontrado is None:
             print(f"❌ No existe imagen: {path}")
             self.images[name] = None
             return None
+        return encontrado
 
+    def _decodificar(self, path):
+        # se puede ejecutar en un hilo del AssetLoader (solo lee y decodifica)
+        try:
+            if isinstance(path, Entrada):
+                return pygame.image.load(self.bundle.abrir(path), path.nombre)
+            return pygame.image.load(str(path))
+        except Exception as e:
+            print(f"❌ Error cargando imagen {path.name}: {e}")
+            return None
+
+    def _preparar(self, name, surf, size, convert_alpha):
+        # convert() y scale() en el hilo principal, con la pantalla ya creada
+        if surf is None:
+            self.images[name] = None
+            return None
         try:
-            surf = pygame.image.load(str(path))
             if convert_alpha:
                 try:
                     surf = surf.convert_alpha()
@@ -117,13 +144,59 @@ class ImageManager:
             self.images[name] = surf
             return surf
         except Exception as e:
-            print(f"❌ Error cargando imagen {filename}: {e}")
+            print(f"❌ Error cargando imagen {name}: {e}")
             self.images[name] = None
             return None
 
+    def load_image(self, name, filename=None, size=None, convert_alpha=True):
+        """
+        Carga una imagen y la guarda en caché.
+        - name: clave lógica para referenciar la imagen.
+        - filename: nombre de archivo dentro de IMAGES_DIR; si None usa default_map.
+        - size: tupla (w,h) para escalar opcionalmente.
+        - convert_alpha: True para conservar transparencia cuando sea posible.
+        Devuelve pygame.Surface o None.
+        """
+        if name in self._pendientes:
+            # termina la carga en segundo plano con los parámetros con que se encoló
+            futuro, size, convert_alpha = self._pendientes.pop(name)
+            return self._preparar(name, self.loader.resultado(futuro), size, convert_alpha)
+        if name in self.images:
+            return self.images[name]
+
+        path = self._resolver(name, filename)
+        if path is None:
+            return None
+        return self._preparar(name, self._decodificar(path), size, convert_alpha)
+
+    def load_image_async(self, name, filename=None, size=None, convert_alpha=True, prioridad=None):
+        """
+        Encola la lectura y decodificación de una imagen en el AssetLoader y
+        devuelve su Future. load_image/get con el mismo name la terminan de
+        preparar (convert/scale) en el hilo principal.
+        """
+        if name in self._pendientes:
+            return self._pendientes[name][0]
+        if self.loader is None or name in self.images:
+            futuro = Future()
+            futuro.set_result(self.load_image(name, filename, size, convert_alpha))
+            return futuro
+
+        path = self._resolver(name, filename)
+        if path is None:
+            futuro = Future()
+            futuro.set_result(None)
+            return futuro
+        if prioridad is None:
+            prioridad = self.PRIORIDADES.get(name, PRIORIDAD_NORMAL)
+        futuro = self.loader.submit(prioridad, self._decodificar, path)
+        self._pendientes[name] = (futuro, size, convert_alpha)
+        return futuro
+
     def load_all_default_images(self, size_map=None):
         """
-        Precarga todas las imágenes definidas en default_map.
+        Precarga todas las imágenes definidas en default_map
+        (en segundo plano si hay AssetLoader).
         - size_map: dict opcional con tamaños por nombre, por ejemplo {'credit_final': (300,200)}
         """
         if size_map is None:
@@ -131,15 +204,62 @@ class ImageManager:
         for name, filename in self.default_map.items():
             size = size_map.get(name)
             try:
-                self.load_image(name, filename, size=size)
+                if self.loader is not None:
+                    self.load_image_async(name, filename, size=size)
+                else:
+                    self.load_image(name, filename, size=size)
             except Exception as e:
                 print(f"❌ Error precargando {name}: {e}")
                 self.images[name] = None
 
     def get(self, name):
-        """Devuelve una imagen ya cargada o None."""
+        """Devuelve una imagen ya cargada (o pendiente de cargar) o None."""
+        if name in self._pendientes:
+            return self.load_image(name)
         return self.images.get(name)
 
+    # --------------------
+    # Variantes escaladas
+    # --------------------
+    def get_scaled(self, name, size, smooth=False):
+        """
+        Devuelve la imagen `name` escalada a size (w, h), escalándola solo la
+        primera vez. smooth=True usa smoothscale. Las variantes se guardan en
+        una caché LRU limitada a scaled_budget bytes.
+        """
+        size = (int(size[0]), int(size[1]))
+        clave = (name, size, smooth)
+        surf = self._variantes.get(clave)
+        if surf is not None:
+            self._variantes.move_to_end(clave)
+            return surf
+
+        base = self.load_image(name)
+        if base is None:
+            return None
+        if base.get_size() == size:
+            return base
+        if smooth and base.get_bitsize() in (24, 32):
+            surf = pygame.transform.smoothscale(base, size)
+        else:
+            surf = pygame.transform.scale(base, size)
+
+        tam = surf.get_pitch() * surf.get_height()
+        if tam > self.scaled_budget:
+            return surf     # no entra en el presupuesto: no se guarda
+        self._variantes[clave] = surf
+        self._bytes_variantes += tam
+        while self._bytes_variantes > self.scaled_budget:
+            _, vieja = self._variantes.popitem(last=False)
+            self._bytes_variantes -= vieja.get_pitch() * vieja.get_height()
+        return surf
+
+    def clear_scaled(self, name=None):
+        """Descarta las variantes escaladas (todas o solo las de una imagen)."""
+        for clave in [c for c in self._variantes if name is None or c[0] == name]:
+            vieja = self._variantes.pop(clave)
+            self._bytes_variantes -= vieja.get_pitch() * vieja.get_height()
+
     # --------------------
     # Métodos específicos para tu juego
     # --------------------
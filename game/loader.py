@@ -0,0 +1,117 @@
+# game/loader.py
+"""
+Carga de recursos en segundo plano.
+
+Decodificar todos los sonidos e imágenes al arrancar retrasaba el primer frame
+varios segundos (sobre todo en tarjetas SD lentas). AssetLoader decodifica en
+hilos de trabajo siguiendo una cola de prioridad: primero lo que necesita la
+partida (efectos), luego el resto del juego y al final lo que casi nunca se
+usa (screamer, créditos).
+
+submit() devuelve un concurrent.futures.Future. Si alguien necesita un recurso
+que todavía no empezó a cargarse, resultado() lo saca de la cola y lo carga en
+el momento en el hilo que lo pide, en lugar de esperar a que le toque turno.
+"""
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+
+# Prioridades (menor = antes)
+PRIORIDAD_JUEGO = 0     # efectos de la partida
+PRIORIDAD_NORMAL = 1    # resto de recursos del juego (easter egg, temas)
+PRIORIDAD_EXTRA = 2     # screamer y créditos
+
+
+class AssetLoader:
+    def __init__(self, workers=2):
+        self._cola = queue.PriorityQueue()
+        self._orden = itertools.count()     # desempate FIFO dentro de una prioridad
+        self._lock = threading.Lock()
+        self._tareas = {}                   # Future -> (funcion, args) aún sin empezar
+        self.total = 0
+        self.hechos = 0
+        self._hilos = []
+        for i in range(workers):
+            hilo = threading.Thread(target=self._trabajar, name=f"asset-loader-{i}", daemon=True)
+            hilo.start()
+            self._hilos.append(hilo)
+
+    # --------------------
+    # Cola
+    # --------------------
+    def submit(self, prioridad, funcion, *args):
+        """Encola funcion(*args) y devuelve su Future."""
+        futuro = Future()
+        with self._lock:
+            self._tareas[futuro] = (funcion, args)
+            self.total += 1
+        self._cola.put((prioridad, next(self._orden), futuro))
+        return futuro
+
+    def _terminar_tarea(self):
+        with self._lock:
+            self.hechos += 1
+
+    def _trabajar(self):
+        while True:
+            _, _, futuro = self._cola.get()
+            if futuro is None:
+                return
+            with self._lock:
+                tarea = self._tareas.pop(futuro, None)
+            # tarea None: ya la cargó resultado() en otro hilo
+            if tarea is None or not futuro.set_running_or_notify_cancel():
+                continue
+            funcion, args = tarea
+            try:
+                futuro.set_result(funcion(*args))
+            except BaseException as e:
+                futuro.set_exception(e)
+            self._terminar_tarea()
+
+    # --------------------
+    # Resultados
+    # --------------------
+    def resultado(self, futuro):
+        """
+        Devuelve el resultado de un Future de este loader. Si la tarea aún no
+        empezó se ejecuta ya en el hilo actual; si está en curso se espera.
+        """
+        with self._lock:
+            tarea = self._tareas.pop(futuro, None)
+        if tarea is not None and futuro.set_running_or_notify_cancel():
+            funcion, args = tarea
+            try:
+                futuro.set_result(funcion(*args))
+            except BaseException as e:
+                futuro.set_exception(e)
+            self._terminar_tarea()
+        return futuro.result()
+
+    @property
+    def progreso(self):
+        """Fracción de tareas terminadas (1.0 si no hay ninguna)."""
+        with self._lock:
+            return self.hechos / self.total if self.total else 1.0
+
+    @property
+    def ocupado(self):
+        with self._lock:
+            return self.hechos < self.total
+
+    def cerrar(self):
+        """Descarta lo pendiente y detiene los hilos."""
+        with self._lock:
+            pendientes = list(self._tareas)
+            self._tareas.clear()
+        for futuro in pendientes:
+            futuro.cancel()
+        with self._lock:
+            self.total -= len(pendientes)
+        for _ in self._hilos:
+            # prioridad -1: los hilos salen antes de tomar otra tarea
+            self._cola.put((-1, next(self._orden), None))
+        for hilo in self._hilos:
+            hilo.join()
+        self._hilos = []
@@ -1,146 +1,101 @@
 import pygame
 import sys
 import os
-from game import tetris, menu
-from game.sounds import SoundManager
 from game.settings import GameSettings
-from game.images import ImageManager
+from game.sounds import SoundManager
+from game.resources import get_sound_manager, get_image_manager, get_asset_loader
+from game.text import text_cache, draw_text
+from game.screens import Screen, SceneManager
+from game.startup import medir
+from game import controls
 
-# --------------------
-# Inicialización
-# --------------------
-pygame.init()
-try:
-    pygame.mixer.init()
-except pygame.error:
-    print("Audio no disponible")
+# game.tetris (motor, bot, replays, renderer) y game.menu se importan al
+# empezar la primera partida: no hacen falta para mostrar el menú.
 
 WIDTH, HEIGHT = 330, 660
-screen = pygame.display.set_mode((GameSettings.WIDTH, GameSettings.HEIGHT))
-pygame.display.set_caption("Menú Principal - Tetris")
-
-font_title = pygame.font.Font(None, 48)
-font_text  = pygame.font.Font(None, 22)
-font_creditos = pygame.font.Font(None, 22)
-
-#imagesmanager
-image_manager = ImageManager()
-# Soundmanager
-sound_manager = SoundManager()
 
-def draw_text(text, font, color, surface, x, y):
-    textobj = font.render(text, True, color)
-    textrect = textobj.get_rect(center=(x, y))
-    surface.blit(textobj, textrect)
+# Se crean en inicializar(); importar este módulo no inicia pygame
+screen = None
+font_title = None
+font_text = None
+font_creditos = None
+asset_loader = None
+sound_manager = None
+image_manager = None
 
 # --------------------
-# Pantalla de Instrucciones
-# --------------------
-def show_instructions():
-    running = True
-    while running:
-        screen.fill(GameSettings.BLACK)
-        draw_text("INSTRUCCIONES", font_title, GameSettings.WHITE, screen, WIDTH//2, 80)
-        draw_text("[LEFT]/[RIGHT] : mover pieza", font_text, GameSettings.WHITE, screen, WIDTH//2, 120)
-        draw_text("[UP] : rotar pieza", font_text, GameSettings.WHITE, screen, WIDTH//2, 160)
-        draw_text("[DOWN] : bajar pieza rápido", font_text, GameSettings.WHITE, screen, WIDTH//2, 200)
-        draw_text("P : Pausa", font_text, GameSettings.WHITE, screen, WIDTH//2, 240)
-        draw_text("ESC : Volver al menú", font_text, GameSettings.WHITE, screen, WIDTH//2, 280)
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                running = False
-
-        pygame.display.flip()
-
-# --------------------
-# Loop del juego
+# Inicialización
 # --------------------
-def start_game_loop():
-    while True:
-        result = tetris.run_game(screen)
-
-        if result == "quit":
-            pygame.quit()
-            sys.exit()
-
-        if result == "gameover":
-            action = menu.game_over_menu(screen)
-
-            if action == "reiniciar":
-                # detener cualquier música antes de reiniciar
-                sound_manager.stop_all_music()
-                continue
-
-            if action == "menu_principal":
-                sound_manager.stop_all_music()
-                sound_manager.play_menu_music()
-                return
-
-            if action == "salir":
-                sound_manager.stop_all_music()
-                pygame.quit()
-                sys.exit()
+def inicializar():
+    """Inicia pygame, la ventana, las fuentes y los gestores compartidos (una sola vez)."""
+    global screen, font_title, font_text, font_creditos
+    global asset_loader, sound_manager, image_manager
+    if screen is not None:
+        return screen
+
+    with medir("pygame.init"):
+        SoundManager.configure_mixer()
+        pygame.init()
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            print("Audio no disponible")
+
+    with medir("display.set_mode"):
+        tam = (GameSettings.WIDTH, GameSettings.HEIGHT)
+        screen = None
+        if GameSettings.VSYNC:
+            # vsync solo está disponible con el renderer de SCALED/OPENGL
+            try:
+                screen = pygame.display.set_mode(tam, pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f"❌ VSync no disponible: {e}")
+        if screen is None:
+            screen = pygame.display.set_mode(tam)
+        pygame.display.set_caption("Menú Principal - Tetris")
+
+    with medir("fuentes"):
+        font_title = pygame.font.Font(None, 48)
+        font_text  = pygame.font.Font(None, 22)
+        font_creditos = pygame.font.Font(None, 22)
+
+    # Gestores compartidos por todas las pantallas (la precarga sigue en segundo plano)
+    with medir("gestores de recursos"):
+        asset_loader = get_asset_loader()
+        sound_manager = get_sound_manager()
+        image_manager = get_image_manager()
+    return screen
 
 # --------------------
-# Menú Principal
+# Pantalla de Instrucciones
 # --------------------
-def main_menu():
-    sound_manager.play_menu_music()
-
-    while True:
-        screen.fill(GameSettings.BLACK)
-        draw_text("TETRIS", font_title, GameSettings.WHITE, screen, WIDTH//2, 80)
-
-        start_button   = pygame.Rect(65, 150, 200, 60)
-        instr_button   = pygame.Rect(65, 250, 200, 60)
-        credits_button = pygame.Rect(65, 350, 200, 60)
-        exit_button    = pygame.Rect(65, 450, 200, 60)
-
-        pygame.draw.rect(screen, GameSettings.BLUE, start_button)
-        pygame.draw.rect(screen, GameSettings.BLUE, instr_button)
-        pygame.draw.rect(screen, GameSettings.BLUE, credits_button)
-        pygame.draw.rect(screen, GameSettings.BLUE, exit_button)
-
-        draw_text("Iniciar Juego", font_title, GameSettings.WHITE, screen, WIDTH//2, 180)
-        draw_text("Instrucciones", font_title, GameSettings.WHITE, screen, WIDTH//2, 280)
-        draw_text("Créditos", font_title, GameSettings.WHITE, screen, WIDTH//2, 380)
-        draw_text("Salir", font_title, GameSettings.WHITE, screen, WIDTH//2, 480)
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if start_button.collidepoint(event.pos):
-                    sound_manager.stop_all_music()
-                    start_game_loop()
-
-                elif instr_button.collidepoint(event.pos):
-                    show_instructions()
-
-                elif credits_button.collidepoint(event.pos):
-                    show_credits()
+class InstructionsScreen(Screen):
+    LINEAS = [
+        ("[LEFT]/[RIGHT] : mover pieza", 120),
+        ("[UP] : rotar pieza", 160),
+        ("[DOWN] : bajar pieza rápido", 200),
+        ("P : Pausa", 240),
+        ("TAB : Autojugador", 280),
+        ("ESC : Volver al menú", 320),
+    ]
 
-                elif exit_button.collidepoint(event.pos):
-                    pygame.quit()
-                    sys.exit()
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.finish()
+        super().handle_event(event)
 
-        pygame.display.flip()
+    def draw(self, surface):
+        surface.fill(GameSettings.BLACK)
+        draw_text("INSTRUCCIONES", font_title, GameSettings.WHITE, surface, WIDTH//2, 80)
+        for texto, y in self.LINEAS:
+            draw_text(texto, font_text, GameSettings.WHITE, surface, WIDTH//2, y)
 
 # --------------------
 # Créditos
 # --------------------
-def show_credits():
-    # Reproducir música de créditos
-    sound_manager.play_creditos_music()
-
+class CreditsScreen(Screen):
     # Lista de créditos
-    creditos = [
+    CREDITOS = [
         "CREDITOS",
         "Desarrollador:", 
         "LUIS.P",
@@ -178,73 +133,206 @@ def show_credits():
         "CRISTO LO ES MAS!!!"
     ]
 
-    reloj = pygame.time.Clock()
-    desplazamiento = HEIGHT
-    running = True
-    mostrar_final = False
+    LINEAS_FINALES = ["Gracias por jugar",
+                      "se despiden",
+                      "los tripulantes",
+                      "GAME",
+                      "te falta odio "]
+
+    def on_enter(self):
+        # Reproducir música de créditos
+        sound_manager.play_creditos_music()
+
+        self.desplazamiento = HEIGHT
+        self.mostrar_final = False
+
+        # Fuentes
+        self.font_creditos = pygame.font.Font(None, 28)
+        self.font_final    = pygame.font.Font(None, 38)
+
+        # Imágenes escaladas por ImageManager (se reutilizan al volver a abrir los créditos)
+        self.imagen_final = image_manager.get_scaled("credit_final", (300, 200))      # final.png
+        self.imagen_estatica = image_manager.get_scaled("credit_static", (300, 200))  # final_static.png
+
+        # Cuando todo salió por arriba (texto + imagen)
+        self.limite_scroll = -(len(self.CREDITOS)*50 + (self.imagen_final.get_height() if self.imagen_final else 0))
 
-    # Fuentes
-    font_creditos = pygame.font.Font(None, 28)
-    font_final    = pygame.font.Font(None, 38)
+    @property
+    def animating(self):
+        # la pantalla final es estática: solo se anima mientras hay scroll
+        return not self.mostrar_final
 
-    # Cargar imágenes con ImageManager
-    imagen_final = image_manager.load_credit_image()      # final.png
-    imagen_final = pygame.transform.scale(imagen_final, (300, 200))
-    imagen_estatica = image_manager.load_static_image()   # final_static.png
-    imagen_estatica = pygame.transform.scale(imagen_estatica, (300, 200))
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            sound_manager.stop_all_music()
+            sound_manager.play_menu_music()
+            self.finish()
+        super().handle_event(event)
 
-    while running:
-        screen.fill(GameSettings.BLACK)
+    def update(self, now):
+        if not self.mostrar_final:
+            self.desplazamiento -= 0.5  # velocidad del scroll
+            if self.desplazamiento < self.limite_scroll:
+                self.mostrar_final = True
+            self.dirty = True
 
-        if not mostrar_final:
+    def draw(self, surface):
+        surface.fill(GameSettings.BLACK)
+
+        if not self.mostrar_final:
             # Dibujar cada línea de créditos subiendo
-            for i, linea in enumerate(creditos):
-                texto = font_creditos.render(linea, True, GameSettings.WHITE)
-                screen.blit(texto, (WIDTH//2 - texto.get_width()//2, desplazamiento + i*50))
+            for i, linea in enumerate(self.CREDITOS):
+                texto = text_cache.render(self.font_creditos, linea, GameSettings.WHITE)
+                surface.blit(texto, (WIDTH//2 - texto.get_width()//2, self.desplazamiento + i*50))
 
             # Dibujar la imagen final.png como si fuera la última "línea"
-            if imagen_final:
-                screen.blit(imagen_final, (
-                    WIDTH//2 - imagen_final.get_width()//2,
-                    desplazamiento + len(creditos)*50
+            if self.imagen_final:
+                surface.blit(self.imagen_final, (
+                    WIDTH//2 - self.imagen_final.get_width()//2,
+                    self.desplazamiento + len(self.CREDITOS)*50
                 ))
 
-            desplazamiento -= 0.5  # velocidad del scroll
-
-            # Cuando todo salió por arriba (texto + imagen)
-            limite_scroll = -(len(creditos)*50 + (imagen_final.get_height() if imagen_final else 0))
-            if desplazamiento < limite_scroll:
-                mostrar_final = True
-
         else:
             # Pantalla final estática
-            lineas = ["Gracias por jugar",
-                      "se despiden",
-                      "los tripulantes",
-                      "GAME",
-                      "te falta odio "]
-            for i, linea in enumerate(lineas):
-                texto = font_final.render(linea, True, GameSettings.WHITE)
+            for i, linea in enumerate(self.LINEAS_FINALES):
+                texto = text_cache.render(self.font_final, linea, GameSettings.WHITE)
                 rect_texto = texto.get_rect(center=(WIDTH//2, HEIGHT//2 - 150 + i*50))
-                screen.blit(texto, rect_texto)
+                surface.blit(texto, rect_texto)
 
             # Imagen final_static.png debajo del bloque de texto
-            if imagen_estatica:
-                rect_img = imagen_estatica.get_rect(center=(WIDTH//2, HEIGHT//2 + 200))
-                screen.blit(imagen_estatica, rect_img)
-
-        # Eventos
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                sound_manager.stop_all_music()
-                sound_manager.play_menu_music()
-                running = False
-
-        pygame.display.flip()
-        reloj.tick(60)
+            if self.imagen_estatica:
+                rect_img = self.imagen_estatica.get_rect(center=(WIDTH//2, HEIGHT//2 + 200))
+                surface.blit(self.imagen_estatica, rect_img)
+
+# --------------------
+# Menú Principal
+# --------------------
+class MainMenuScreen(Screen):
+    """
+    Pantalla base de la pila. Abre el resto de pantallas y, cuando se cierran,
+    decide a dónde ir según su resultado (flujo juego -> game over -> reiniciar).
+    """
+
+    def __init__(self):
+        super().__init__()
+        # los botones se crean una sola vez
+        self.start_button   = pygame.Rect(65, 150, 200, 60)
+        self.instr_button   = pygame.Rect(65, 250, 200, 60)
+        self.credits_button = pygame.Rect(65, 350, 200, 60)
+        self.exit_button    = pygame.Rect(65, 450, 200, 60)
+        self.progreso = None    # progreso de carga mostrado en la barra (None = sin barra)
+
+    def on_enter(self):
+        pygame.display.set_caption("Menú Principal - Tetris")
+        # el tema de la partida (game.tetris.MUSICA_JUEGO) se decodifica mientras se espera
+        sound_manager.preload_music("tetris_theme.mp3")
+
+    @property
+    def animating(self):
+        # mientras se cargan recursos la barra de progreso se actualiza sola
+        return self.progreso is not None
+
+    def update(self, now):
+        progreso = asset_loader.progreso if asset_loader.ocupado else None
+        if progreso != self.progreso:
+            self.progreso = progreso
+            self.dirty = True
+
+    def empezar_partida(self):
+        from game import tetris
+        sound_manager.stop_all_music()
+        self.manager.push(tetris.GameScene())
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.start_button.collidepoint(event.pos):
+                self.empezar_partida()
+
+            elif self.instr_button.collidepoint(event.pos):
+                self.manager.push(InstructionsScreen())
+
+            elif self.credits_button.collidepoint(event.pos):
+                self.manager.push(CreditsScreen())
+
+            elif self.exit_button.collidepoint(event.pos):
+                self.manager.quit()
+            return
+
+        super().handle_event(event)
+
+    def on_resume(self, result):
+        if result in ("quit", "salir"):
+            self.manager.quit()
+            return
+
+        if result == "gameover":
+            from game import menu
+            self.manager.push(menu.GameOverScene())
+            return
+
+        if result == "reiniciar":
+            # detener cualquier música antes de reiniciar
+            self.empezar_partida()
+            return
+
+        if result == "menu_principal":
+            sound_manager.stop_all_music()
+            sound_manager.play_menu_music()
+
+        pygame.display.set_caption("Menú Principal - Tetris")
+        super().on_resume(result)
+
+    def draw(self, surface):
+        surface.fill(GameSettings.BLACK)
+        draw_text("TETRIS", font_title, GameSettings.WHITE, surface, WIDTH//2, 80)
+
+        pygame.draw.rect(surface, GameSettings.BLUE, self.start_button)
+        pygame.draw.rect(surface, GameSettings.BLUE, self.instr_button)
+        pygame.draw.rect(surface, GameSettings.BLUE, self.credits_button)
+        pygame.draw.rect(surface, GameSettings.BLUE, self.exit_button)
+
+        draw_text("Iniciar Juego", font_title, GameSettings.WHITE, surface, WIDTH//2, 180)
+        draw_text("Instrucciones", font_title, GameSettings.WHITE, surface, WIDTH//2, 280)
+        draw_text("Créditos", font_title, GameSettings.WHITE, surface, WIDTH//2, 380)
+        draw_text("Salir", font_title, GameSettings.WHITE, surface, WIDTH//2, 480)
+
+        # Barra de carga de recursos en segundo plano
+        if self.progreso is not None:
+            barra = pygame.Rect(65, HEIGHT - 40, 200, 8)
+            pygame.draw.rect(surface, GameSettings.WHITE, barra, 1)
+            relleno = barra.inflate(-2, -2)
+            relleno.width = int(relleno.width * self.progreso)
+            pygame.draw.rect(surface, GameSettings.BLUE, relleno)
+
+
+def crear_manager():
+    """Inicializa lo necesario y devuelve la pila de pantallas con el menú principal."""
+    inicializar()
+    with medir("música del menú"):
+        sound_manager.play_menu_music()
+    manager = SceneManager(screen)
+    manager.por_vuelta.append(sound_manager.update_music)
+    manager.push(MainMenuScreen())
+    return manager
+
+
+def main_menu(perfil_salida=None):
+    """
+    Un único bucle para todo el juego: la pila de pantallas empieza en el menú.
+    Con perfil_salida (.json o .csv) se exportan los tiempos de frame al salir.
+    """
+    manager = crear_manager()
+    manager.run()
+    if perfil_salida:
+        try:
+            extra = {"audio": sound_manager.latency_report(), "entrada": controls.latency_report()}
+            ruta = manager.profiler.exportar(perfil_salida, extra=extra)
+            print(f"Perfil de frames guardado en {ruta}")
+        except OSError as e:
+            print(f"❌ No se pudo guardar el perfil: {e}")
+    sound_manager.stop_all_music()
+    pygame.quit()
+    sys.exit()
 
 if __name__ == "__main__":
-    main_menu()
\ No newline at end of file
+    main_menu()
@@ -1,20 +1,14 @@
 import pygame
-import sys
 import random
 import math
-from pathlib import Path
-from game.sounds import SoundManager
-from game.images import ImageManager
-from game.settings import GameSettings
-
-sound_manager = SoundManager()
-image_manager = ImageManager(preload=False)
+from game.resources import get_sound_manager, get_image_manager
+from game.screens import Screen
+from game.text import draw_text
 
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 BLUE  = (0, 100, 255)
 GRAY  = (200, 200, 200)
-clock = pygame.time.Clock()
 
 # Parámetros de efectos
 FLASH_DURATION_MS = 30        # flash blanco antes del blackout
@@ -26,35 +20,6 @@ FLICKER_NEXT_MAX = 1600        # ms máximo hasta el siguiente flicker
 FLICKER_DUR_MIN = 60          # ms mínimo que dura un flicker (imagen apagada)
 FLICKER_DUR_MAX = 180         # ms máximo que dura un flicker
 
-def draw_text(text, font, color, surface, x, y):
-    textobj = font.render(text, True, color)
-    textrect = textobj.get_rect(center=(x, y))
-    surface.blit(textobj, textrect)
-
-def _image_path(filename):
-    return Path(GameSettings.IMAGES_DIR).joinpath(filename)
-
-def _try_load_and_scale(path, size):
-    try:
-        print(f"🔎 Intentando cargar imagen: {path.resolve()}")
-    except Exception:
-        print(f"🔎 Intentando cargar imagen: {path}")
-    if not path.exists():
-        print(f"❌ No existe: {path}")
-        return None
-    try:
-        surf = pygame.image.load(str(path))
-        try:
-            surf = surf.convert_alpha()
-        except Exception:
-            surf = surf.convert()
-        surf = pygame.transform.scale(surf, size)
-        print("✅ Imagen cargada y escalada")
-        return surf
-    except Exception as e:
-        print(f"❌ Error cargando imagen {path}: {e}")
-        return None
-
 def _blit_with_shake(screen, surf, center, intensity):
     dx = random.randint(-intensity, intensity)
     dy = random.randint(-intensity, intensity)
@@ -62,142 +27,172 @@ def _blit_with_shake(screen, surf, center, intensity):
     rect.move_ip(dx, dy)
     screen.blit(surf, rect)
 
-def game_over_menu(screen):
-    if not pygame.font.get_init():
-        pygame.font.init()
-
-    font = pygame.font.Font(None, 48)
-    small_font = pygame.font.Font(None, 28)
-    SCREAMER_TIMEOUT = pygame.USEREVENT + 1
-    MUSIC_END_EVENT = pygame.USEREVENT + 2
-
-    WIDTH, HEIGHT = screen.get_size()
-
-    # No cargar en preload; lo haremos justo antes de mostrar
-    screamer_surface = None
-    base_surface = None
-
-    pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
-    sound_manager.play_gameover_theme()
-
-    screamer_shown = False
-    screamer_active = False
-
-    # Estados para pre-flash/blackout
-    preflash_state = None  # None | "flash" | "blackout" | "done"
-    preflash_start = 0
-
-    # Flicker timers
-    next_flicker_at = 0
-    flicker_end_at = 0
-    flicker_off = False
-
-    # Botones
-    restart_button = pygame.Rect(30, 120, 260, 50)
-    menu_button    = pygame.Rect(30, 190, 260, 50)
-    exit_button    = pygame.Rect(30, 260, 260, 50)
-
-    skip_text = "Presiona F para saltarte la cancion"
-
-    while True:
+class GameOverScene(Screen):
+    """
+    Menú de game over. Termina con "reiniciar", "menu_principal", "salir" o "quit".
+    """
+    SCREAMER_TIMEOUT = pygame.event.custom_type()
+    MUSIC_END_EVENT = pygame.event.custom_type()
+
+    SKIP_TEXT = "Presiona F para saltarte la cancion"
+
+    def on_enter(self):
+        if not pygame.font.get_init():
+            pygame.font.init()
+
+        self.font = pygame.font.Font(None, 48)
+        self.small_font = pygame.font.Font(None, 28)
+        self.sound_manager = get_sound_manager()
+
+        # No cargar en preload; lo haremos justo antes de mostrar
+        self.base_surface = None
+
+        self.sound_manager.set_music_endevent(self.MUSIC_END_EVENT)
+        self.sound_manager.play_gameover_theme()
+        # lo que puede sonar después: el screamer (el tema del menú queda fijo en la caché)
+        self.sound_manager.preload_music("screamer.mp3")
+        self.sound_manager.preload_music("menu_theme.mp3")
+
+        self.screamer_shown = False
+        self.screamer_active = False
+
+        # Estados para pre-flash/blackout
+        self.preflash_state = None  # None | "flash" | "blackout" | "done"
+        self.preflash_start = 0
+
+        # Flicker timers
+        self.next_flicker_at = 0
+        self.flicker_end_at = 0
+        self.flicker_off = False
+
+        # Botones
+        self.restart_button = pygame.Rect(30, 120, 260, 50)
+        self.menu_button    = pygame.Rect(30, 190, 260, 50)
+        self.exit_button    = pygame.Rect(30, 260, 260, 50)
+
+    def on_exit(self):
+        pygame.time.set_timer(self.SCREAMER_TIMEOUT, 0)
+        self.sound_manager.set_music_endevent()
+
+    @property
+    def animating(self):
+        # el menú normal solo cambia con eventos; flash, blackout y screamer se animan
+        return self.preflash_state is not None
+
+    def _salir(self, result, detener_efectos=True):
+        self.sound_manager.stop_all_music()
+        if detener_efectos:
+            pygame.mixer.stop()
+        self.finish(result)
+
+    # --------------------
+    # Eventos
+    # --------------------
+    def handle_event(self, event):
         now = pygame.time.get_ticks()
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sound_manager.stop_all_music()
-                pygame.quit()
-                sys.exit()
-
-            # Trigger: fin de la música (evento) o tecla F para saltar
-            if (event.type == MUSIC_END_EVENT or (event.type == pygame.KEYDOWN and event.key == pygame.K_f)) and not screamer_shown:
-                # iniciar secuencia pre-flash -> blackout -> mostrar screamer
-                preflash_state = "flash"
-                preflash_start = now
-                screamer_shown = True
-                # precargar la imagen justo ahora (escalada al tamaño actual)
-                screamer_path = _image_path("screamer.png")
-                base_surface = _try_load_and_scale(screamer_path, (WIDTH, HEIGHT))
-                # preparar timers de flicker
-                next_flicker_at = now + random.randint(FLICKER_NEXT_MIN, FLICKER_NEXT_MAX)
-                flicker_end_at = 0
-                flicker_off = False
-                # no reproducir aún el screamer; lo haremos tras blackout para sincronizar con el golpe
-                continue
-
-            # Temporizador que finaliza la visualización del screamer
-            if event.type == SCREAMER_TIMEOUT:
-                pygame.time.set_timer(SCREAMER_TIMEOUT, 0)
-                screamer_active = False
-                # detener sonidos y volver al menú
-                sound_manager.stop_all_music()
-                pygame.mixer.stop()
-                return "menu_principal"
-
-            elif event.type == pygame.MOUSEBUTTONDOWN and not screamer_active:
-                if restart_button.collidepoint(event.pos):
-                    sound_manager.stop_all_music()
-                    pygame.mixer.stop()
-                    return "reiniciar"
-                if menu_button.collidepoint(event.pos):
-                    sound_manager.stop_all_music()
-                    pygame.mixer.stop()
-                    return "menu_principal"
-                if exit_button.collidepoint(event.pos):
-                    sound_manager.stop_all_music()
-                    pygame.quit()
-                    sys.exit()
-
-        # Estado pre-flash / blackout / mostrar
-        if preflash_state == "flash":
-            # mostrar flash blanco breve
-            if now - preflash_start <= FLASH_DURATION_MS:
-                screen.fill(WHITE)
-                pygame.display.flip()
-            else:
-                # pasar a blackout
-                preflash_state = "blackout"
-                preflash_start = now
-            # no procesar más hasta que termine la secuencia
-            continue
-
-        if preflash_state == "blackout":
-            if now - preflash_start <= BLACKOUT_DURATION_MS:
-                screen.fill(BLACK)
-                pygame.display.flip()
-            else:
+        if event.type == pygame.QUIT:
+            self._salir("quit", detener_efectos=False)
+            return
+
+        # Trigger: fin de la música (evento) o tecla F para saltar
+        if (event.type == self.MUSIC_END_EVENT or (event.type == pygame.KEYDOWN and event.key == pygame.K_f)) and not self.screamer_shown:
+            # iniciar secuencia pre-flash -> blackout -> mostrar screamer
+            self.preflash_state = "flash"
+            self.preflash_start = now
+            self.screamer_shown = True
+            # imagen escalada al tamaño actual (el ImageManager la guarda entre game overs)
+            self.base_surface = get_image_manager().get_scaled("screamer", self.manager.surface.get_size())
+            # preparar timers de flicker
+            self.next_flicker_at = now + random.randint(FLICKER_NEXT_MIN, FLICKER_NEXT_MAX)
+            self.flicker_end_at = 0
+            self.flicker_off = False
+            # no reproducir aún el screamer; lo haremos tras blackout para sincronizar con el golpe
+            self.invalidate()
+            return
+
+        # Temporizador que finaliza la visualización del screamer
+        if event.type == self.SCREAMER_TIMEOUT:
+            pygame.time.set_timer(self.SCREAMER_TIMEOUT, 0)
+            self.screamer_active = False
+            # detener sonidos y volver al menú
+            self._salir("menu_principal")
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and not self.screamer_active:
+            if self.restart_button.collidepoint(event.pos):
+                self._salir("reiniciar")
+            elif self.menu_button.collidepoint(event.pos):
+                self._salir("menu_principal")
+            elif self.exit_button.collidepoint(event.pos):
+                self._salir("salir", detener_efectos=False)
+
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.invalidate()
+
+    # --------------------
+    # Estado pre-flash / blackout / screamer
+    # --------------------
+    def update(self, now):
+        if self.preflash_state == "flash":
+            # flash blanco breve y luego blackout
+            if now - self.preflash_start > FLASH_DURATION_MS:
+                self.preflash_state = "blackout"
+                self.preflash_start = now
+            self.dirty = True
+
+        elif self.preflash_state == "blackout":
+            if now - self.preflash_start > BLACKOUT_DURATION_MS:
                 # terminar preflash y activar screamer
-                preflash_state = "done"
-                screamer_active = True
+                self.preflash_state = "done"
+                self.screamer_active = True
                 # reproducir el screamer justo al terminar el blackout
                 try:
-                    sound_manager.play_screamer()
+                    self.sound_manager.play_screamer()
                 except Exception:
                     try:
-                        s = sound_manager.load_screamer_sound()
+                        s = self.sound_manager.load_screamer_sound()
                         if s:
                             s.play()
                     except Exception as e:
                         print("❌ No se pudo reproducir el screamer:", e)
                 # lanzar timer para ocultar la imagen después del tiempo definido
-                pygame.time.set_timer(SCREAMER_TIMEOUT, SCREAMER_VISIBLE_MS)
-                # inicializar flicker timers basados en now (ya hecho al iniciar, pero asegurar)
-                next_flicker_at = now + random.randint(FLICKER_NEXT_MIN, FLICKER_NEXT_MAX)
-                flicker_end_at = 0
-                flicker_off = False
-            continue
+                pygame.time.set_timer(self.SCREAMER_TIMEOUT, SCREAMER_VISIBLE_MS)
+                # inicializar flicker timers basados en now
+                self.next_flicker_at = now + random.randint(FLICKER_NEXT_MIN, FLICKER_NEXT_MAX)
+                self.flicker_end_at = 0
+                self.flicker_off = False
+            self.dirty = True
+
+        elif self.screamer_active:
+            # actualizar flicker: si llegó el momento, apagar la imagen por un breve periodo
+            if now >= self.next_flicker_at:
+                self.flicker_off = True
+                self.flicker_end_at = now + random.randint(FLICKER_DUR_MIN, FLICKER_DUR_MAX)
+                self.next_flicker_at = now + random.randint(FLICKER_NEXT_MIN, FLICKER_NEXT_MAX)
+            if self.flicker_off and now >= self.flicker_end_at:
+                self.flicker_off = False
+            # el shake cambia en cada frame
+            self.dirty = True
+
+    # --------------------
+    # Dibujo
+    # --------------------
+    def draw(self, screen):
+        WIDTH, HEIGHT = screen.get_size()
+        font = self.font
+
+        if self.preflash_state == "flash":
+            screen.fill(WHITE)
+            return None
+
+        if self.preflash_state == "blackout" or (self.preflash_state == "done" and not self.screamer_active):
+            screen.fill(BLACK)
+            return None
 
         # Si el screamer está activo, aplicar flicker y shake al dibujarlo
-        if screamer_active:
-            # actualizar flicker: si llegó el momento, apagar la imagen por un breve periodo
-            if now >= next_flicker_at:
-                flicker_off = True
-                flicker_end_at = now + random.randint(FLICKER_DUR_MIN, FLICKER_DUR_MAX)
-                next_flicker_at = now + random.randint(FLICKER_NEXT_MIN, FLICKER_NEXT_MAX)
-            if flicker_off and now >= flicker_end_at:
-                flicker_off = False
-
-            # dibujar: si flicker_off True, mostramos pantalla negra (o flash intermitente)
-            if flicker_off:
+        if self.screamer_active:
+            # si flicker_off True, mostramos pantalla negra (o flash intermitente)
+            if self.flicker_off:
                 screen.fill(BLACK)
                 # ocasionalmente hacer un micro-flash rojo para más tensión
                 if random.random() < 0.08:
@@ -205,35 +200,27 @@ def game_over_menu(screen):
                     overlay.fill((150, 0, 0))
                     overlay.set_alpha(120)
                     screen.blit(overlay, (0, 0))
-                pygame.display.flip()
-            else:
+            elif self.base_surface:
                 # dibujar la imagen con shake
-                if base_surface:
-                    _blit_with_shake(screen, base_surface, (WIDTH//2, HEIGHT//2), SHAKE_INTENSITY)
-                    pygame.display.flip()
-                else:
-                    # fallback visual si no hay imagen
-                    screen.fill(BLACK)
-                    draw_text("SCREAMER NO DISPONIBLE", font, (255, 0, 0), screen, WIDTH//2, HEIGHT//2)
-                    pygame.display.flip()
-            # seguir al siguiente frame
-            clock.tick(60)
-            continue
+                _blit_with_shake(screen, self.base_surface, (WIDTH//2, HEIGHT//2), SHAKE_INTENSITY)
+            else:
+                # fallback visual si no hay imagen
+                screen.fill(BLACK)
+                draw_text("SCREAMER NO DISPONIBLE", font, (255, 0, 0), screen, WIDTH//2, HEIGHT//2)
+            return None
 
         # Menú normal si no está activo el screamer
         screen.fill(BLACK)
         draw_text("GAME OVER", font, WHITE, screen, WIDTH // 2, 60)
 
-        pygame.draw.rect(screen, BLUE, restart_button)
-        pygame.draw.rect(screen, BLUE, menu_button)
-        pygame.draw.rect(screen, BLUE, exit_button)
+        pygame.draw.rect(screen, BLUE, self.restart_button)
+        pygame.draw.rect(screen, BLUE, self.menu_button)
+        pygame.draw.rect(screen, BLUE, self.exit_button)
 
         draw_text("Reiniciar", font, WHITE, screen, WIDTH // 2, 145)
         draw_text("Menú Principal", font, WHITE, screen, WIDTH // 2, 215)
         draw_text("Salir", font, WHITE, screen, WIDTH // 2, 285)
 
-        if pygame.mixer.music.get_busy() and not screamer_shown:
-            draw_text(skip_text, small_font, GRAY, screen, WIDTH // 2, HEIGHT - 40)
-
-        pygame.display.flip()
-        clock.tick(60)
\ No newline at end of file
+        if self.sound_manager.music_busy() and not self.screamer_shown:
+            draw_text(self.SKIP_TEXT, self.small_font, GRAY, screen, WIDTH // 2, HEIGHT - 40)
+        return None
@@ -0,0 +1,201 @@
+# game/music.py
+"""
+Música con fundido cruzado y pistas decodificadas en segundo plano.
+
+pygame.mixer.music solo tiene un stream: cambiar de pista obliga a cortar la
+actual y a hacer un music.load bloqueante en el hilo principal (el tirón al
+pasar del juego al easter egg). MusicPlayer decodifica cada pista en el
+AssetLoader como un Sound y la reproduce en uno de dos canales reservados:
+al cambiar de pista la anterior se desvanece mientras entra la nueva.
+
+play() nunca espera: si la pista todavía se está decodificando empieza a
+sonar cuando termine. El callback del Future corre en el hilo del loader, así
+que solo encola el arranque (y publica EVENTO_MUSICA para despertar el bucle);
+los canales se tocan siempre desde el hilo principal, en actualizar(), que
+SceneManager llama en cada vuelta.
+
+preload() permite adelantar la pista que probablemente venga después. Una
+pista decodificada ocupa mucho (~10 MB por minuto a 44.1 kHz estéreo): la
+caché LRU guarda como mucho `max_pistas` además de las `fijas` y está
+limitada en bytes. Las fijas (menú y game over, las que más se repiten) no se
+descartan nunca: volver a ellas no espera otra decodificación.
+"""
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+import pygame
+
+from game.loader import PRIORIDAD_NORMAL
+
+# Se publica cuando una pista termina de decodificarse y hay un play() esperándola
+EVENTO_MUSICA = pygame.event.custom_type()
+
+
+class MusicPlayer:
+    def __init__(self, canales, decodificar, loader=None, crossfade_ms=800,
+                 presupuesto=96 * 1024 * 1024, max_pistas=2, fijas=()):
+        """
+        - canales: función que devuelve los dos pygame.mixer.Channel reservados
+          para la música (o una lista vacía si no hay audio).
+        - decodificar: función filename -> Sound | None (se ejecuta en el loader).
+        - presupuesto / max_pistas: límite de la caché de pistas decodificadas
+          (la que está sonando nunca se descarta).
+        - fijas: pistas que, una vez decodificadas, no se descartan nunca (no
+          cuentan para max_pistas, sí para el presupuesto).
+        """
+        self._obtener_canales = canales
+        self._decodificar = decodificar
+        self.loader = loader
+        self.crossfade_ms = crossfade_ms
+        self.presupuesto = presupuesto
+        self.max_pistas = max_pistas
+        self.fijas = frozenset(fijas)
+
+        self._lock = threading.RLock()
+        self._pistas = OrderedDict()     # filename -> (Sound, bytes)
+        self._bytes = 0
+        self._futuros = {}               # filename -> Future de la decodificación
+        self._pedido = 0                 # se incrementa con cada play/stop
+        self._listos = deque()           # arranques decodificados, a aplicar en el hilo principal
+        self._canal = None               # canal de la pista actual
+        self._endevent = None
+        self.actual = None               # filename de la pista actual
+
+    # --------------------
+    # Decodificación
+    # --------------------
+    def preload(self, filename):
+        """Empieza a decodificar filename si no está ya. Devuelve su Future."""
+        with self._lock:
+            if filename in self._pistas:
+                futuro = Future()
+                futuro.set_result(self._pistas[filename][0])
+                return futuro
+            futuro = self._futuros.get(filename)
+            if futuro is not None:
+                return futuro
+            if self.loader is not None:
+                futuro = self.loader.submit(PRIORIDAD_NORMAL, self._decodificar, filename)
+            else:
+                futuro = Future()
+                futuro.set_result(self._decodificar(filename))
+            self._futuros[filename] = futuro
+        futuro.add_done_callback(lambda f: self._guardar(filename, f))
+        return futuro
+
+    def _guardar(self, filename, futuro):
+        sound = futuro.result() if not futuro.cancelled() and futuro.exception() is None else None
+        with self._lock:
+            self._futuros.pop(filename, None)
+            if sound is None:
+                return
+            freq, formato, canales = pygame.mixer.get_init() or (44100, -16, 2)
+            tam = int(sound.get_length() * freq * canales * (abs(formato) // 8))
+            self._pistas[filename] = (sound, tam)
+            self._bytes += tam
+            # descartar las pistas más viejas que no están sonando
+            descartables = [f for f in self._pistas if f not in self.fijas]
+            for viejo in list(descartables):
+                if self._bytes <= self.presupuesto and len(descartables) <= self.max_pistas:
+                    break
+                if viejo in (filename, self.actual):
+                    continue
+                self._bytes -= self._pistas.pop(viejo)[1]
+                descartables.remove(viejo)
+
+    # --------------------
+    # Reproducción
+    # --------------------
+    def play(self, filename, loops=-1, volume=0.4, fade_ms=None):
+        """
+        Cambia a filename con fundido cruzado (fade_ms=0 corta en seco). Si ya
+        está decodificada empieza en el momento; si no, en el actualizar()
+        siguiente a que termine de decodificarse.
+        """
+        if fade_ms is None:
+            fade_ms = self.crossfade_ms
+        with self._lock:
+            self._pedido += 1
+            pedido = self._pedido
+        futuro = self.preload(filename)
+
+        def encolar(f):
+            # puede correr en el hilo del loader: no tocar los canales aquí
+            sound = f.result() if not f.cancelled() and f.exception() is None else None
+            if sound is None:
+                return
+            with self._lock:
+                if pedido != self._pedido:
+                    return
+                self._listos.append((pedido, filename, sound, loops, volume, fade_ms))
+            if threading.current_thread() is not threading.main_thread() and pygame.display.get_init():
+                pygame.event.post(pygame.event.Event(EVENTO_MUSICA))
+
+        # si ya estaba decodificada se llama en el momento
+        futuro.add_done_callback(encolar)
+        self.actualizar()
+
+    def actualizar(self):
+        """Aplica los arranques pendientes. Llamar desde el hilo principal."""
+        with self._lock:
+            if not self._listos:
+                return
+            arranque = self._listos.pop()
+            self._listos.clear()
+            self._iniciar(*arranque)
+
+    def _iniciar(self, pedido, filename, sound, loops, volume, fade_ms):
+        with self._lock:
+            if pedido != self._pedido:
+                return      # se pidió otra pista (o stop) mientras se decodificaba
+            canales = self._obtener_canales()
+            if len(canales) < 2:
+                return
+            anterior = self._canal
+            nuevo = canales[1] if anterior is canales[0] else canales[0]
+
+            sonando = anterior is not None and anterior.get_busy()
+            if sonando:
+                anterior.set_endevent()
+                if fade_ms:
+                    anterior.fadeout(fade_ms)
+                else:
+                    anterior.stop()
+            nuevo.set_endevent()
+            nuevo.stop()
+            nuevo.set_volume(volume)
+            nuevo.play(sound, loops=loops, fade_ms=fade_ms if sonando else 0)
+            if self._endevent is not None:
+                nuevo.set_endevent(self._endevent)
+            self._canal = nuevo
+            self.actual = filename
+            if filename in self._pistas:
+                self._pistas.move_to_end(filename)
+
+    def stop(self):
+        """Corta la música y descarta los play() pendientes."""
+        with self._lock:
+            self._pedido += 1
+            self._listos.clear()
+            self._endevent = None
+            for canal in self._obtener_canales():
+                canal.set_endevent()
+                canal.stop()
+            self._canal = None
+            self.actual = None
+
+    def set_endevent(self, tipo=None):
+        """Evento que se publica cuando la pista actual termina sola (sin argumento: ninguno)."""
+        with self._lock:
+            self._endevent = tipo
+            if self._canal is not None:
+                if tipo is None:
+                    self._canal.set_endevent()
+                else:
+                    self._canal.set_endevent(tipo)
+
+    @property
+    def busy(self):
+        canal = self._canal
+        return canal is not None and canal.get_busy()
@@ -0,0 +1,81 @@
+# game/pcm_cache.py
+"""
+Caché en disco de efectos de sonido ya decodificados.
+
+pygame.mixer.Sound decodifica FLAC/MP3/WAV y los convierte al formato del
+mixer cada vez que se carga un efecto. PCMCache guarda el resultado
+(Sound.get_raw()) en CACHE_DIR/pcm la primera vez y las siguientes lo carga
+con pygame.mixer.Sound(buffer=...), sin pasar por ningún códec.
+
+La clave de cada archivo es el hash del contenido original más la
+configuración del mixer (frecuencia, formato, canales): si cambia el archivo
+o el mixer se inicia con otros parámetros se decodifica de nuevo.
+
+Solo se guardan efectos cortos (fuente de hasta max_bytes_fuente); la música
+larga decodificada ocuparía decenas de MB.
+"""
+import hashlib
+import io
+import os
+import tempfile
+from pathlib import Path
+
+import pygame
+
+
+class PCMCache:
+    def __init__(self, carpeta, max_bytes_fuente=512 * 1024):
+        self.carpeta = Path(carpeta)
+        self.max_bytes_fuente = max_bytes_fuente
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _ruta(self, datos):
+        mixer = pygame.mixer.get_init()     # (frecuencia, formato, canales)
+        if mixer is None:
+            return None
+        frecuencia, formato, canales = mixer
+        digest = hashlib.blake2b(datos, digest_size=16).hexdigest()
+        return self.carpeta / f"{digest}-{frecuencia}-{formato}-{canales}.pcm"
+
+    def _guardar(self, ruta, raw):
+        # escritura atómica: otro hilo o proceso nunca ve un archivo a medias
+        try:
+            self.carpeta.mkdir(parents=True, exist_ok=True)
+            fd, temporal = tempfile.mkstemp(dir=self.carpeta, suffix=".tmp")
+            with os.fdopen(fd, "wb") as salida:
+                salida.write(raw)
+            os.replace(temporal, ruta)
+        except OSError as e:
+            print(f"❌ No se pudo guardar en la caché de audio: {e}")
+
+    def sound(self, datos):
+        """
+        Devuelve un pygame.mixer.Sound a partir de los bytes del archivo original
+        (bytes o memoryview), usando el PCM guardado si existe.
+        """
+        ruta = self._ruta(datos) if len(datos) <= self.max_bytes_fuente else None
+        if ruta is not None:
+            try:
+                raw = ruta.read_bytes()
+            except OSError:
+                raw = None
+            if raw:
+                self.aciertos += 1
+                return pygame.mixer.Sound(buffer=raw)
+
+        self.fallos += 1
+        sound = pygame.mixer.Sound(file=io.BytesIO(datos))
+        if ruta is not None:
+            self._guardar(ruta, sound.get_raw())
+        return sound
+
+    def limpiar(self):
+        """Borra todos los PCM guardados."""
+        if not self.carpeta.is_dir():
+            return
+        for archivo in self.carpeta.glob("*.pcm"):
+            try:
+                archivo.unlink()
+            except OSError:
+                pass
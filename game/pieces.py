@@ -0,0 +1,80 @@
+# game/pieces.py
+"""
+Definición de los tetrominós y tablas de rotación precalculadas.
+
+Al importar el módulo se generan, una sola vez, los 4 estados de rotación de
+cada pieza de PIEZAS. Cada estado es inmutable y guarda sus celdas, sus
+máscaras de bits por fila y su caja contenedora, de modo que rotar (o deshacer
+una rotación) solo cambia un índice.
+"""
+from typing import NamedTuple, Tuple
+
+from game.board import mascaras_de_forma
+
+COLORES = [
+    (0, 255, 255),   # I
+    (0, 0, 255),     # J
+    (255, 165, 0),   # L
+    (255, 255, 0),   # O
+    (0, 255, 0),     # S
+    (128, 0, 128),   # T
+    (255, 0, 0)      # Z
+]
+
+PIEZAS = [
+    [[1, 1, 1, 1]],            # I
+    [[1, 1], [1, 1]],          # O
+    [[0, 1, 0], [1, 1, 1]],    # T
+    [[1, 0, 0], [1, 1, 1]],    # J
+    [[0, 0, 1], [1, 1, 1]],    # L
+    [[1, 1, 0], [0, 1, 1]],    # S
+    [[0, 1, 1], [1, 1, 0]]     # Z
+]
+
+NUM_ROTACIONES = 4
+
+
+class EstadoRotacion(NamedTuple):
+    forma: Tuple[Tuple[int, ...], ...]    # matriz 0/1 del estado
+    celdas: Tuple[Tuple[int, int], ...]   # desplazamientos (dx, dy) de cada bloque
+    mascaras: Tuple[int, ...]             # máscara de bits por fila (bit j = columna j)
+    ancho: int
+    alto: int
+
+
+def _rotar(forma):
+    """Rotación horaria de una matriz (la misma que usaba rotar_pieza)."""
+    return [list(row) for row in zip(*forma[::-1])]
+
+
+def _crear_estado(forma):
+    celdas = tuple(
+        (j, i)
+        for i, fila in enumerate(forma)
+        for j, bloque in enumerate(fila)
+        if bloque
+    )
+    return EstadoRotacion(
+        forma=tuple(tuple(fila) for fila in forma),
+        celdas=celdas,
+        mascaras=tuple(mascaras_de_forma(forma)),
+        ancho=len(forma[0]),
+        alto=len(forma),
+    )
+
+
+def _crear_tabla(forma):
+    estados = []
+    for _ in range(NUM_ROTACIONES):
+        estados.append(_crear_estado(forma))
+        forma = _rotar(forma)
+    return tuple(estados)
+
+
+# ROTACIONES[tipo][rotacion] -> EstadoRotacion
+ROTACIONES = tuple(_crear_tabla(forma) for forma in PIEZAS)
+
+
+def estado(pieza):
+    """Devuelve el EstadoRotacion actual de una pieza (dict con 'tipo' y 'rot')."""
+    return ROTACIONES[pieza["tipo"]][pieza["rot"]]
@@ -0,0 +1,185 @@
+# game/profiler.py
+"""
+Medición del tiempo de cada frame por fases.
+
+SceneManager.run mide con Profiler.fase(nombre) las fases de cada vuelta del
+bucle: "input" (eventos), "sim" (update), "render" (draw), "flip"
+(display.update/flip) y "espera" (Clock.tick o event.wait). Los últimos N
+frames de cada fase se guardan en buffers circulares y resumen() da
+p50/p95/p99 en milisegundos.
+
+F3 muestra u oculta un overlay con la gráfica del tiempo de frame (sin contar
+la espera). exportar() guarda el resumen y los frames en JSON o CSV según la
+extensión (python run.py --profile-out perfil.json).
+"""
+import csv
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pygame
+
+FASES = ("input", "sim", "render", "flip", "espera")
+
+
+class RingBuffer:
+    """Últimos `capacidad` valores en una lista preasignada."""
+
+    def __init__(self, capacidad):
+        self.capacidad = capacidad
+        self._datos = [0.0] * capacidad
+        self._pos = 0
+        self._lleno = False
+
+    def append(self, valor):
+        self._datos[self._pos] = valor
+        self._pos += 1
+        if self._pos == self.capacidad:
+            self._pos = 0
+            self._lleno = True
+
+    def valores(self):
+        """Valores en orden, del más viejo al más nuevo."""
+        if not self._lleno:
+            return self._datos[:self._pos]
+        return self._datos[self._pos:] + self._datos[:self._pos]
+
+    def __len__(self):
+        return self.capacidad if self._lleno else self._pos
+
+
+def percentil(ordenados, p):
+    """Percentil p (0-100) de una lista ya ordenada (el más cercano por rango)."""
+    if not ordenados:
+        return 0.0
+    i = min(len(ordenados) - 1, max(0, round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[i]
+
+
+class Profiler:
+    def __init__(self, frames=600):
+        self.frames = frames
+        self.buffers = {fase: RingBuffer(frames) for fase in FASES}
+        self.buffers["frame"] = RingBuffer(frames)   # suma de todas las fases menos la espera
+        self._actual = dict.fromkeys(FASES, 0.0)
+        self.total_frames = 0
+        self.overlay_visible = False
+
+    # --------------------
+    # Medición
+    # --------------------
+    @contextmanager
+    def fase(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._actual[nombre] = self._actual.get(nombre, 0.0) + time.perf_counter() - inicio
+
+    def fin_frame(self):
+        """Cierra el frame: pasa los tiempos acumulados a los buffers."""
+        actual = self._actual
+        trabajo = 0.0
+        for nombre, segundos in actual.items():
+            buffer = self.buffers.get(nombre)
+            if buffer is None:
+                buffer = self.buffers[nombre] = RingBuffer(self.frames)
+            buffer.append(segundos)
+            if nombre != "espera":
+                trabajo += segundos
+            actual[nombre] = 0.0
+        self.buffers["frame"].append(trabajo)
+        self.total_frames += 1
+
+    # --------------------
+    # Resultados
+    # --------------------
+    def estadisticas(self, nombre):
+        """{p50, p95, p99, media, max} en milisegundos de una fase, o None si no hay datos."""
+        valores = sorted(self.buffers[nombre].valores())
+        if not valores:
+            return None
+        return {
+            "p50": percentil(valores, 50) * 1000,
+            "p95": percentil(valores, 95) * 1000,
+            "p99": percentil(valores, 99) * 1000,
+            "media": sum(valores) / len(valores) * 1000,
+            "max": valores[-1] * 1000,
+        }
+
+    def resumen(self):
+        """{fase: estadisticas(fase)} de todas las fases con datos."""
+        resultado = {}
+        for nombre in self.buffers:
+            stats = self.estadisticas(nombre)
+            if stats is not None:
+                resultado[nombre] = stats
+        return resultado
+
+    def exportar(self, ruta, extra=None):
+        """Guarda el resumen y los frames en JSON o CSV (según la extensión de ruta)."""
+        ruta = Path(ruta)
+        nombres = list(self.buffers)
+        columnas = [self.buffers[n].valores() for n in nombres]
+        filas = [[v * 1000 for v in fila] for fila in zip(*columnas)]
+
+        if ruta.suffix.lower() == ".csv":
+            with open(ruta, "w", newline="") as salida:
+                escritor = csv.writer(salida)
+                escritor.writerow(["frame"] + [f"{n}_ms" for n in nombres])
+                primero = self.total_frames - len(filas)
+                for i, fila in enumerate(filas):
+                    escritor.writerow([primero + i] + [f"{v:.4f}" for v in fila])
+            return ruta
+
+        datos = {
+            "frames_totales": self.total_frames,
+            "resumen_ms": self.resumen(),
+            "frames_ms": {n: [round(v * 1000, 4) for v in c] for n, c in zip(nombres, columnas)},
+        }
+        if extra:
+            datos.update(extra)
+        ruta.write_text(json.dumps(datos, indent=2, ensure_ascii=False), encoding="utf-8")
+        return ruta
+
+
+class ProfilerOverlay:
+    """Gráfica de los últimos frames y percentiles, en la esquina superior derecha."""
+
+    ANCHO = 150
+    ALTO = 56
+    ESCALA_MS = 33.3    # altura completa de la gráfica
+    OBJETIVO_MS = 1000 / 60
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.font = pygame.font.Font(None, 16)
+
+    def dibujar(self, surface):
+        """Dibuja el overlay y devuelve su rectángulo."""
+        rect = pygame.Rect(surface.get_width() - self.ANCHO - 4, 4, self.ANCHO, self.ALTO)
+        surface.fill((20, 20, 20), rect)
+        pygame.draw.rect(surface, (90, 90, 90), rect, 1)
+
+        grafica = rect.inflate(-4, -16).move(0, 6)
+        valores = self.profiler.buffers["frame"].valores()[-grafica.width:]
+        y_objetivo = grafica.bottom - int(self.OBJETIVO_MS / self.ESCALA_MS * grafica.height)
+        pygame.draw.line(surface, (60, 60, 120), (grafica.left, y_objetivo), (grafica.right - 1, y_objetivo))
+        x0 = grafica.right - len(valores)
+        for i, segundos in enumerate(valores):
+            ms = segundos * 1000
+            alto = min(grafica.height, int(ms / self.ESCALA_MS * grafica.height))
+            color = (80, 200, 80) if ms <= self.OBJETIVO_MS else (230, 80, 60)
+            x = x0 + i
+            pygame.draw.line(surface, color, (x, grafica.bottom - 1), (x, grafica.bottom - 1 - alto))
+
+        frame = self.profiler.estadisticas("frame")
+        if frame:
+            texto = f"p50 {frame['p50']:.1f}  p95 {frame['p95']:.1f}  p99 {frame['p99']:.1f} ms"
+            # el texto cambia casi cada frame: se renderiza sin pasar por la caché
+            surface.blit(self.font.render(texto, True, (230, 230, 230)), (rect.x + 3, rect.y + 2))
+        return rect
+
+
+profiler = Profiler()
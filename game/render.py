@@ -0,0 +1,202 @@
+# game/render.py
+"""
+Renderizador del tablero por rectángulos sucios.
+
+En lugar de limpiar la pantalla y volver a dibujar todas las celdas en cada
+frame, BoardRenderer mantiene una superficie persistente con el tablero y la
+cuadrícula de colores del frame anterior. En cada frame solo se redibujan las
+celdas que cambiaron (fijado, borrado de líneas) y se devuelven los
+rectángulos modificados para pasarlos a pygame.display.update(rects).
+
+La pieza en juego se dibuja aparte, encima del tablero, con un desplazamiento
+vertical opcional en fracción de celda (la caída interpolada entre dos ticks
+de simulación). Antes de moverla se restaura su zona desde la superficie
+persistente.
+
+Los bloques se dibujan desde un BlockAtlas: un sprite ya renderizado (relleno
++ borde gris) por cada color, creado una vez y convertido al formato de la
+pantalla. Todas las celdas de un frame se envían en un único Surface.blits().
+"""
+import pygame
+
+from game.pieces import estado
+from game.text import text_cache
+
+NEGRO = (0, 0, 0)
+BLANCO = (255, 255, 255)
+ROJO = (255, 0, 0)
+GRIS = (128, 128, 128)
+
+
+class BlockAtlas:
+    """
+    Sprites de bloque de tam_bloque x tam_bloque: sprites[0] es la celda vacía y
+    sprites[i] el bloque del color colores[i - 1], con su borde de 1 px.
+    Para usar bloques con textura basta con reemplazar los sprites.
+    """
+
+    def __init__(self, colores, tam_bloque=30):
+        self.tam_bloque = tam_bloque
+        vacio = pygame.Surface((tam_bloque, tam_bloque))
+        vacio.fill(NEGRO)
+        self.sprites = [self._convertir(vacio)]
+        for color in colores:
+            sprite = pygame.Surface((tam_bloque, tam_bloque))
+            sprite.fill(color)
+            pygame.draw.rect(sprite, GRIS, sprite.get_rect(), 1)
+            self.sprites.append(self._convertir(sprite))
+
+    @staticmethod
+    def _convertir(sprite):
+        # convert() necesita una pantalla creada; sin ella se usa el sprite tal cual
+        if pygame.display.get_surface() is None:
+            return sprite
+        return sprite.convert()
+
+    def __getitem__(self, color):
+        return self.sprites[color]
+
+
+_atlas_cache = {}
+
+
+def obtener_atlas(colores, tam_bloque=30):
+    """Devuelve el BlockAtlas de esos colores y tamaño, creándolo solo la primera vez."""
+    clave = (tuple(colores), tam_bloque)
+    atlas = _atlas_cache.get(clave)
+    if atlas is None:
+        atlas = BlockAtlas(colores, tam_bloque)
+        _atlas_cache[clave] = atlas
+    return atlas
+
+
+class BoardRenderer:
+    def __init__(self, screen, colores, font, columnas=11, filas=20,
+                 tam_bloque=30, margen_superior=60):
+        self.screen = screen
+        self.atlas = obtener_atlas(colores, tam_bloque)
+        self.font = font
+        self.columnas = columnas
+        self.filas = filas
+        self.tam_bloque = tam_bloque
+        self.margen_superior = margen_superior
+
+        self.superficie = BlockAtlas._convertir(
+            pygame.Surface((columnas * tam_bloque, filas * tam_bloque))
+        )
+        self.rect_hud = pygame.Rect(0, 0, screen.get_width(), margen_superior)
+        self.invalidar()
+
+    def invalidar(self):
+        """Fuerza un redibujado completo en el próximo frame (p. ej. al volver de otra pantalla)."""
+        self._anterior = None
+        self._hud_anterior = None
+        self._pieza_anterior = None
+        self._rect_pieza = None
+
+    # --------------------
+    # Dibujo
+    # --------------------
+    def _dibujar_tablero(self, juego):
+        actual = [bytearray(fila) for fila in juego.tablero.colores]
+        anterior = self._anterior
+        sprites = self.atlas.sprites
+        t = self.tam_bloque
+        celdas = []     # (sprite, posición) de las celdas modificadas
+        copias = []     # (superficie, destino en pantalla, área) por fila modificada
+        rects = []
+
+        for y, fila in enumerate(actual):
+            if anterior is not None and fila == anterior[y]:
+                continue
+            fila_anterior = anterior[y] if anterior is not None else None
+            x_min = x_max = None
+            for x, color in enumerate(fila):
+                if fila_anterior is not None and fila_anterior[x] == color:
+                    continue
+                celdas.append((sprites[color], (x * t, y * t)))
+                if x_min is None:
+                    x_min = x
+                x_max = x
+            if x_min is not None:
+                # un rectángulo por fila que abarca las celdas modificadas
+                area = pygame.Rect(x_min * t, y * t, (x_max - x_min + 1) * t, t)
+                destino = area.move(0, self.margen_superior)
+                copias.append((self.superficie, destino, area))
+                rects.append(destino)
+
+        if celdas:
+            self.superficie.blits(celdas, doreturn=False)
+            self.screen.blits(copias, doreturn=False)
+        self._anterior = actual
+        return rects
+
+    def _dibujar_pieza(self, juego, desplazamiento, rects_tablero):
+        """
+        Dibuja la pieza en juego desplazada `desplazamiento` celdas hacia abajo.
+        Si no cambió y el tablero no se redibujó debajo de ella, no hace nada.
+        """
+        pieza = juego.pieza
+        t = self.tam_bloque
+        dy_px = int(desplazamiento * t)
+        clave = (pieza["tipo"], pieza["rot"], pieza["x"], pieza["y"], pieza["color"], dy_px)
+        anterior = self._rect_pieza
+        if clave == self._pieza_anterior and (
+            anterior is None or anterior.collidelist(rects_tablero) == -1
+        ):
+            return []
+
+        rects = []
+        if anterior is not None:
+            # restaurar el tablero que tapaba la pieza
+            self.screen.blit(self.superficie, anterior, anterior.move(0, -self.margen_superior))
+            rects.append(anterior)
+
+        est = estado(pieza)
+        px, py = pieza["x"], pieza["y"]
+        sprite = self.atlas[pieza["color"]]
+        y0 = self.margen_superior + dy_px
+        celdas = [
+            (sprite, ((px + dx) * t, (py + dy) * t + y0))
+            for dx, dy in est.celdas
+            if 0 <= py + dy < self.filas
+        ]
+        if celdas:
+            self.screen.blits(celdas, doreturn=False)
+            area = pygame.Rect(px * t, max(py, 0) * t + y0, est.ancho * t, est.alto * t)
+            area = area.clip(self.superficie.get_rect().move(0, self.margen_superior))
+            rects.append(area)
+            self._rect_pieza = area
+        else:
+            self._rect_pieza = None
+        self._pieza_anterior = clave
+        return rects
+
+    def _dibujar_hud(self, juego, pausa):
+        hud = (juego.puntaje, pausa)
+        if hud == self._hud_anterior:
+            return []
+        self._hud_anterior = hud
+        self.screen.fill(NEGRO, self.rect_hud)
+        score_text = text_cache.render(self.font, f"Puntaje: {juego.puntaje}", BLANCO)
+        self.screen.blit(score_text, (10, 10))
+        if pausa:
+            pause_text = text_cache.render(self.font, "PAUSA - Pulsa P", ROJO)
+            self.screen.blit(pause_text, (10, 35))
+        return [self.rect_hud]
+
+    def dibujar(self, juego, pausa=False, desplazamiento=0.0):
+        """
+        Actualiza la pantalla con el estado del GameState y devuelve la lista de
+        rectángulos modificados (vacía si nada cambió).
+        - desplazamiento: fracción de celda (0..1) que la pieza ya bajó hacia su fila siguiente.
+        """
+        rects = []
+        if self._anterior is None:
+            self.screen.fill(NEGRO)
+            rects.append(self.screen.get_rect())
+        rects += self._dibujar_hud(juego, pausa)
+        tablero = self._dibujar_tablero(juego)
+        rects += tablero
+        rects += self._dibujar_pieza(juego, desplazamiento, tablero)
+        return rects
@@ -0,0 +1,234 @@
+# game/replay.py
+"""
+Grabación y reproducción determinista de partidas.
+
+Formato binario (.ttr):
+    cabecera  "<4sBQBBBH": magia b"TTRP", versión, semilla, columnas, filas,
+              vista previa, ticks por segundo (frames del replay por segundo)
+    eventos   hasta el final del archivo, cada uno:
+              varint (LEB128) con los frames transcurridos desde el evento anterior
+              1 byte con la acción de game.engine
+
+Como el generador de piezas depende solo de la semilla y las acciones se
+aplican con GameState.step, volver a simular los eventos reproduce la partida
+exacta. La reproducción se puede hacer en tiempo real (un frame del replay
+por tick, a los ticks por segundo con que se grabó) con la vista de pygame
+(game.tetris.reproducir_replay) o sin pantalla a toda velocidad. Los archivos
+de la versión 1 no guardaban los ticks por segundo: se leen como de 60.
+
+Uso:
+    python -m game.replay replays/ultima_partida.ttr
+    python -m game.replay replays/ultima_partida.ttr --hasta 3600
+    python -m game.replay replays/ultima_partida.ttr --ver
+"""
+import argparse
+import bisect
+import struct
+from pathlib import Path
+
+from game.engine import GameState
+
+MAGIA = b"TTRP"
+VERSION = 2
+TICKS_V1 = 60   # ticks por segundo de los replays de la versión 1
+_CABECERA_V1 = struct.Struct("<4sBQBBB")
+_CABECERA = struct.Struct("<4sBQBBBH")
+
+
+def _escribir_varint(salida, n):
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            salida.append(byte | 0x80)
+        else:
+            salida.append(byte)
+            return
+
+
+def _leer_varint(datos, pos):
+    n = 0
+    desplazamiento = 0
+    while True:
+        byte = datos[pos]
+        pos += 1
+        n |= (byte & 0x7F) << desplazamiento
+        if not byte & 0x80:
+            return n, pos
+        desplazamiento += 7
+
+
+class Replay:
+    def __init__(self, seed, columnas=11, filas=20, vista_previa=1, eventos=None, tick_hz=TICKS_V1):
+        self.seed = seed
+        self.columnas = columnas
+        self.filas = filas
+        self.vista_previa = vista_previa
+        self.tick_hz = tick_hz     # frames del replay por segundo de juego
+        self.eventos = eventos if eventos is not None else []   # lista de (frame, accion)
+
+    @property
+    def frames(self):
+        """Frame del último evento (duración de la partida)."""
+        return self.eventos[-1][0] if self.eventos else 0
+
+    def nuevo_juego(self):
+        return GameState(self.columnas, self.filas, seed=self.seed, vista_previa=self.vista_previa)
+
+    # --------------------
+    # Serialización
+    # --------------------
+    def to_bytes(self):
+        salida = bytearray(_CABECERA.pack(
+            MAGIA, VERSION, self.seed, self.columnas, self.filas, self.vista_previa, self.tick_hz
+        ))
+        anterior = 0
+        for frame, accion in self.eventos:
+            _escribir_varint(salida, frame - anterior)
+            salida.append(accion)
+            anterior = frame
+        return bytes(salida)
+
+    @classmethod
+    def from_bytes(cls, datos):
+        magia, version, seed, columnas, filas, vista_previa = _CABECERA_V1.unpack_from(datos)
+        if magia != MAGIA:
+            raise ValueError("No es un archivo de replay")
+        if version == 1:
+            tick_hz = TICKS_V1
+            pos = _CABECERA_V1.size
+        elif version == VERSION:
+            tick_hz = _CABECERA.unpack_from(datos)[-1]
+            pos = _CABECERA.size
+        else:
+            raise ValueError(f"Versión de replay no soportada: {version}")
+        eventos = []
+        frame = 0
+        while pos < len(datos):
+            delta, pos = _leer_varint(datos, pos)
+            frame += delta
+            eventos.append((frame, datos[pos]))
+            pos += 1
+        return cls(seed, columnas, filas, vista_previa, eventos, tick_hz)
+
+    def guardar(self, ruta):
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        ruta.write_bytes(self.to_bytes())
+
+    @classmethod
+    def cargar(cls, ruta):
+        return cls.from_bytes(Path(ruta).read_bytes())
+
+
+class Grabadora:
+    """Registra las acciones aplicadas a un GameState durante una partida."""
+
+    def __init__(self, juego, tick_hz=TICKS_V1):
+        """tick_hz: ticks por segundo de la partida (se guarda en la cabecera)."""
+        self.replay = Replay(
+            juego.seed, juego.columnas, juego.filas, juego.vista_previa, tick_hz=tick_hz
+        )
+
+    def registrar(self, frame, accion):
+        self.replay.eventos.append((frame, accion))
+
+    def guardar(self, ruta):
+        self.replay.guardar(ruta)
+
+
+class Reproductor:
+    """
+    Vuelve a simular un Replay. Guarda snapshots del juego cada `intervalo`
+    frames a medida que avanza, de modo que ir a un frame anterior (seek) solo
+    re-simula desde el snapshot más cercano.
+    """
+
+    def __init__(self, replay, intervalo=600):
+        self.replay = replay
+        self.intervalo = intervalo
+        self.juego = replay.nuevo_juego()
+        self.frame = 0
+        self.indice = 0                       # próximo evento a aplicar
+        self._snap_frames = [0]               # frames con snapshot, ordenados
+        self._snaps = {0: (0, self.juego.snapshot())}   # frame -> (indice, snapshot)
+
+    def avanzar_hasta(self, frame):
+        """Aplica todos los eventos con frame <= `frame`. Devuelve la lista de Paso."""
+        eventos = self.replay.eventos
+        juego = self.juego
+        pasos = []
+        while self.indice < len(eventos) and eventos[self.indice][0] <= frame:
+            frame_evento, accion = eventos[self.indice]
+            self._guardar_snapshots_hasta(frame_evento)
+            pasos.append(juego.step(accion))
+            self.indice += 1
+        self._guardar_snapshots_hasta(frame)
+        self.frame = max(self.frame, frame)
+        return pasos
+
+    def _guardar_snapshots_hasta(self, frame):
+        siguiente = self._snap_frames[-1] + self.intervalo
+        while siguiente <= frame:
+            # el estado actual es el del frame `siguiente` (no hay eventos entre medio)
+            if siguiente not in self._snaps:
+                self._snaps[siguiente] = (self.indice, self.juego.snapshot())
+                self._snap_frames.append(siguiente)
+            siguiente += self.intervalo
+
+    def seek(self, frame):
+        """Lleva el juego al estado del frame indicado (hacia delante o hacia atrás)."""
+        frame = max(frame, 0)
+        if frame < self.frame:
+            i = bisect.bisect_right(self._snap_frames, frame) - 1
+            base = self._snap_frames[i]
+            indice, snap = self._snaps[base]
+            self.juego.restore(snap)
+            self.indice = indice
+            self.frame = base
+        self.avanzar_hasta(frame)
+        self.frame = frame
+
+    def ejecutar(self):
+        """Avance rápido hasta el final. Devuelve el GameState final."""
+        self.avanzar_hasta(self.replay.frames)
+        return self.juego
+
+    @property
+    def terminado(self):
+        return self.indice >= len(self.replay.eventos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduce un replay de Tetris.")
+    parser.add_argument("archivo")
+    parser.add_argument("--hasta", type=int, help="frame hasta el que simular")
+    parser.add_argument("--ver", action="store_true", help="reproducir en pantalla en tiempo real")
+    args = parser.parse_args(argv)
+
+    replay = Replay.cargar(args.archivo)
+    if args.ver:
+        import pygame
+        from game import tetris
+        from game.settings import GameSettings
+
+        pygame.init()
+        screen = pygame.display.set_mode((GameSettings.WIDTH, GameSettings.HEIGHT))
+        tetris.reproducir_replay(screen, replay)
+        pygame.quit()
+        return
+
+    reproductor = Reproductor(replay)
+    if args.hasta is not None:
+        reproductor.seek(args.hasta)
+        juego = reproductor.juego
+    else:
+        juego = reproductor.ejecutar()
+    print(f"semilla={replay.seed} frames={reproductor.frame} eventos={reproductor.indice} "
+          f"ticks_por_segundo={replay.tick_hz}")
+    print(f"puntaje={juego.puntaje} lineas={juego.lineas} piezas={juego.piezas} "
+          f"game_over={juego.game_over}")
+
+
+if __name__ == "__main__":
+    main()
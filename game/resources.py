@@ -0,0 +1,54 @@
+# game/resources.py
+"""
+Gestores de recursos compartidos por todo el proceso.
+
+Antes cada pantalla creaba su propio SoundManager/ImageManager y volvía a
+decodificar todos los sonidos e imágenes (por ejemplo al reiniciar tras un
+game over). Ahora hay una única instancia de cada uno, creada la primera vez
+que se pide. Su precarga se hace en segundo plano con un AssetLoader
+compartido, así el menú se muestra sin esperar a decodificar nada, y leen de
+assets.bundle (game.bundle) cuando existe.
+"""
+from game.sounds import SoundManager
+from game.images import ImageManager
+from game.loader import AssetLoader
+from game.bundle import abrir_bundle
+from game.pcm_cache import PCMCache
+from game.settings import GameSettings
+
+_bundle = None
+_bundle_abierto = False
+_asset_loader = None
+_sound_manager = None
+_image_manager = None
+
+
+def get_bundle():
+    """Bundle de recursos compartido, o None si no se generó assets.bundle."""
+    global _bundle, _bundle_abierto
+    if not _bundle_abierto:
+        _bundle = abrir_bundle(GameSettings.ASSETS_BUNDLE)
+        _bundle_abierto = True
+    return _bundle
+
+
+def get_asset_loader():
+    global _asset_loader
+    if _asset_loader is None:
+        _asset_loader = AssetLoader()
+    return _asset_loader
+
+
+def get_sound_manager():
+    global _sound_manager
+    if _sound_manager is None:
+        pcm_cache = PCMCache(GameSettings.CACHE_DIR / "pcm") if GameSettings.CACHE_PCM else None
+        _sound_manager = SoundManager(loader=get_asset_loader(), bundle=get_bundle(), pcm_cache=pcm_cache)
+    return _sound_manager
+
+
+def get_image_manager():
+    global _image_manager
+    if _image_manager is None:
+        _image_manager = ImageManager(loader=get_asset_loader(), bundle=get_bundle())
+    return _image_manager
@@ -0,0 +1,249 @@
+# game/screens.py
+"""
+Pantallas (escenas) dirigidas por eventos y pila de escenas.
+
+Todas las pantallas del juego son Screen y las ejecuta un único bucle
+(SceneManager.run) sobre una pila: push() abre una pantalla encima de la
+actual, finish(resultado) la cierra y el resultado llega a la de abajo con
+on_resume(resultado). Así pasar de una pantalla a otra no anida bucles ni
+hace crecer la pila de llamadas.
+
+Una Screen solo se redibuja cuando algo cambió (marca `dirty`). Mientras no
+hay animaciones el bucle se bloquea en pygame.event.wait con un tiempo límite,
+así el menú no ocupa la CPU esperando al jugador; si la pantalla está animando
+se limita a `fps` con Clock.tick (0 = sin límite).
+
+Las pantallas con `tick_hz` (la partida y los replays) simulan a paso fijo:
+cada vuelta suma el tiempo real transcurrido a un acumulador y llama a tick()
+tantas veces como pasos de 1/tick_hz quepan, así un frame lento se recupera
+con varios ticks y la simulación no depende de los FPS. Lo que sobra del
+acumulador queda en `interpolacion` (0..1, fracción del próximo tick) para
+dibujar entre dos ticks.
+
+Cada vuelta del bucle se mide por fases con game.profiler (F3 muestra el
+overlay con la gráfica de tiempos de frame).
+"""
+import time
+
+import pygame
+
+from game.profiler import profiler as profiler_global, ProfilerOverlay
+
+IDLE_TIMEOUT_MS = 500   # espera máxima sin eventos antes de llamar a update()
+MAX_TICKS_POR_FRAME = 10    # más atrasado que esto se descarta (evita la espiral de recuperación)
+
+
+class Screen:
+    fps = 60
+    tick_hz = None     # ticks de simulación por segundo (None = sin paso fijo)
+
+    def __init__(self):
+        self.manager = None    # SceneManager que la ejecuta (se asigna en push)
+        self.dirty = True      # hay que redibujar
+        self.done = False
+        self.result = None
+        self.interpolacion = 0.0   # fracción del próximo tick ya transcurrida (con tick_hz)
+
+    # --------------------
+    # Hooks para las subclases
+    # --------------------
+    def on_enter(self):
+        """Se llama al apilar la pantalla (cargar recursos, música, etc.)."""
+
+    def on_exit(self):
+        """Se llama al sacarla de la pila."""
+
+    def on_resume(self, result):
+        """Vuelve a quedar arriba porque se cerró la pantalla que tenía encima."""
+        self.invalidate()
+
+    def handle_event(self, event):
+        """
+        Procesa un evento. Por defecto QUIT cierra la pantalla con "quit" y si
+        la ventana vuelve a mostrarse se redibuja.
+        """
+        if event.type == pygame.QUIT:
+            self.finish("quit")
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.invalidate()
+
+    def tick(self):
+        """Un paso de simulación de 1/tick_hz segundos (solo si tick_hz no es None)."""
+
+    def update(self, now):
+        """Avanza animaciones o temporizadores; marcar dirty si cambia algo."""
+
+    def draw(self, surface):
+        """
+        Dibuja la pantalla. Puede devolver una lista de rectángulos modificados
+        para pygame.display.update; si devuelve None se hace display.flip().
+        """
+
+    @property
+    def animating(self):
+        """True mientras haya algo moviéndose y convenga dibujar a `fps`."""
+        return False
+
+    # --------------------
+    # Utilidades
+    # --------------------
+    def finish(self, result=None):
+        self.done = True
+        self.result = result
+
+    def invalidate(self):
+        self.dirty = True
+
+
+class SceneManager:
+    TECLA_PERFIL = pygame.K_F3
+
+    def __init__(self, surface, profiler=None):
+        self.surface = surface
+        self.stack = []
+        self._salir = False
+        self.profiler = profiler if profiler is not None else profiler_global
+        self._overlay = None
+        self._escena_ticks = None   # pantalla a la que corresponde el acumulador
+        self._acumulado = 0.0
+        self._ultimo_tick = 0.0
+        # funciones sin argumentos que se llaman en cada vuelta, en el hilo principal
+        # (p. ej. arrancar la música que terminó de decodificarse en segundo plano)
+        self.por_vuelta = []
+
+    @property
+    def top(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        scene.manager = self
+        self.stack.append(scene)
+        self._escena_ticks = None
+        scene.on_enter()
+
+    def replace(self, scene):
+        """Cierra la pantalla actual (sin avisar a la de abajo) y abre otra en su lugar."""
+        if self.stack:
+            self.stack.pop().on_exit()
+        self.push(scene)
+
+    def quit(self):
+        """Cierra todas las pantallas y termina run()."""
+        self._salir = True
+        while self.stack:
+            self.stack.pop().on_exit()
+
+    def _cerrar_terminadas(self):
+        while self.stack and self.stack[-1].done:
+            scene = self.stack.pop()
+            scene.on_exit()
+            self._escena_ticks = None
+            if self.stack:
+                self.stack[-1].on_resume(scene.result)
+
+    def _eventos(self, scene):
+        if scene.animating:
+            return pygame.event.get()
+        # bloquea hasta que llegue un evento (o pase el tiempo límite)
+        event = pygame.event.wait(IDLE_TIMEOUT_MS)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def _alternar_overlay(self):
+        self.profiler.overlay_visible = not self.profiler.overlay_visible
+        if not self.profiler.overlay_visible and self.top is not None:
+            self.top.invalidate()   # borrar el overlay de la pantalla
+
+    def _simular(self, scene):
+        """Ejecuta los ticks de paso fijo que le tocan a la pantalla desde la última vuelta."""
+        ahora = time.perf_counter()
+        if scene is not self._escena_ticks:
+            # pantalla nueva o que vuelve a quedar arriba: no se recupera el tiempo que estuvo tapada
+            self._escena_ticks = scene
+            self._acumulado = 0.0
+            self._ultimo_tick = ahora
+        paso = 1.0 / scene.tick_hz
+        self._acumulado += ahora - self._ultimo_tick
+        self._ultimo_tick = ahora
+        ticks = 0
+        while self._acumulado >= paso and not scene.done:
+            if ticks == MAX_TICKS_POR_FRAME:
+                self._acumulado = 0.0
+                break
+            scene.tick()
+            self._acumulado -= paso
+            ticks += 1
+        scene.interpolacion = min(self._acumulado / paso, 1.0)
+
+    def dibujar(self):
+        """Dibuja la pantalla de arriba si está marcada como sucia (y el overlay si está visible)."""
+        scene = self.top
+        overlay = self.profiler.overlay_visible
+        if scene is None or not (scene.dirty or overlay):
+            return
+        with self.profiler.fase("render"):
+            rects = []
+            if scene.dirty:
+                rects = scene.draw(self.surface)
+                scene.dirty = False
+            if overlay:
+                if self._overlay is None:
+                    self._overlay = ProfilerOverlay(self.profiler)
+                rect = self._overlay.dibujar(self.surface)
+                if rects is not None:
+                    rects = list(rects) + [rect]
+        with self.profiler.fase("flip"):
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+
+    def run(self):
+        """Bucle principal: se ejecuta hasta que la pila queda vacía o se llama a quit()."""
+        clock = pygame.time.Clock()
+        perfil = self.profiler
+        while self.stack and not self._salir:
+            with perfil.fase("input" if self.top.animating else "espera"):
+                eventos = self._eventos(self.top)
+
+            with perfil.fase("input"):
+                for event in eventos:
+                    if event.type == pygame.KEYDOWN and event.key == self.TECLA_PERFIL:
+                        self._alternar_overlay()
+                        continue
+                    scene = self.top
+                    if scene is None:
+                        break
+                    scene.handle_event(event)
+                    self._cerrar_terminadas()
+
+            scene = self.top
+            if scene is None:
+                break
+            with perfil.fase("sim"):
+                for tarea in self.por_vuelta:
+                    tarea()
+                if scene.tick_hz:
+                    self._simular(scene)
+                if not scene.done:
+                    scene.update(pygame.time.get_ticks())
+                self._cerrar_terminadas()
+            if scene is not self.top:
+                perfil.fin_frame()
+                continue    # cambió la pantalla: la nueva se dibuja en la siguiente vuelta
+
+            self.dibujar()
+
+            if scene.animating:
+                with perfil.fase("espera"):
+                    clock.tick(scene.fps)
+            perfil.fin_frame()
+
+
+def run_screen(screen_obj, surface):
+    """Ejecuta una única Screen hasta que llame a finish(). Devuelve su resultado."""
+    manager = SceneManager(surface)
+    manager.push(screen_obj)
+    manager.run()
+    return screen_obj.result
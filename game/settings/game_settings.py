@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Optional, Tuple
 from pathlib import Path
 import os
 
@@ -16,3 +16,37 @@ class GameSettings:
     ASSETS_DIR: Path = BASE_DIR / "assets"
     IMAGES_DIR: Path = ASSETS_DIR / "images"
     SOUNDS_DIR: Path = ASSETS_DIR / "sounds"
+    # Paquete con todo assets/ (python -m game.bundle); si no existe se usan los archivos sueltos
+    ASSETS_BUNDLE: Path = BASE_DIR / "assets.bundle"
+    # Mixer: buffer chico = menos retardo entre la tecla y el sonido
+    AUDIO_FRECUENCIA: int = 44100
+    AUDIO_BUFFER: int = 256
+    # Música: duración del fundido cruzado y caché de pistas decodificadas
+    # (~10 MB por minuto de pista). Las fijas no se descartan nunca; de las
+    # demás se guardan MUSICA_PISTAS (la que suena y la siguiente)
+    MUSICA_CROSSFADE_MS: int = 800
+    MUSICA_MEMORIA: int = 96 * 1024 * 1024
+    MUSICA_PISTAS: int = 2
+    MUSICA_FIJAS: Tuple[str, ...] = ("menu_theme.mp3", "gameover_theme.mp3")
+    # Efectos decodificados a PCM en CACHE_DIR/pcm (se cargan sin códec)
+    CACHE_DIR: Path = BASE_DIR / "cache"
+    CACHE_PCM: bool = True
+    # Releer las carpetas de recursos si cambian (un stat por búsqueda); si no, refresh_index()
+    VIGILAR_ASSETS: bool = False
+    # Memoria máxima para imágenes escaladas en caché (ImageManager.get_scaled)
+    PRESUPUESTO_VARIANTES: int = 32 * 1024 * 1024
+
+    # Simulación a paso fijo: ticks por segundo, sin importar los FPS
+    TICKS_POR_SEGUNDO: int = 60
+    # FPS máximos de la partida (0 = sin límite) y sincronización vertical
+    FPS_JUEGO: int = 60
+    VSYNC: bool = False
+    # Teclas mantenidas en partida: retardo antes de repetir (DAS) e intervalo (ARR, 0 = instantáneo)
+    DAS_MS: int = 167
+    ARR_MS: int = 33
+    # Gravedad en filas por tick (G); None = una fila cada GameScene.tiempo_caida ms, 20 = 20G
+    GRAVEDAD: Optional[float] = None
+
+    # Replays: la última partida se guarda en REPLAYS_DIR/ultima_partida.ttr
+    REPLAYS_DIR: Path = BASE_DIR / "replays"
+    GUARDAR_REPLAYS: bool = True
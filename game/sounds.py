@@ -1,13 +1,107 @@
 # game/sounds.py
+import time
 import pygame
+from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
 from game.settings import GameSettings
+from game.loader import PRIORIDAD_JUEGO, PRIORIDAD_NORMAL, PRIORIDAD_EXTRA
+from game.bundle import Entrada
+from game.dir_index import DirectoryIndex
+from game.music import MusicPlayer
+
+class ChannelPool:
+    """
+    Canales reservados para una categoría de efectos. Si todos están sonando,
+    la política de robo decide: "oldest" corta el efecto que empezó antes y
+    "none" descarta el nuevo.
+    """
+
+    def __init__(self, canales, robo="oldest"):
+        self.canales = canales
+        self.robo = robo
+        self._inicio = [0.0] * len(canales)   # perf_counter del último play de cada canal
+        self.robados = 0
+        self.descartados = 0
+
+    def play(self, sound):
+        """Reproduce sound en un canal del pool. Devuelve el Channel o None."""
+        if not self.canales:
+            return None
+        elegido = None
+        for i, canal in enumerate(self.canales):
+            if not canal.get_busy():
+                elegido = i
+                break
+        if elegido is None:
+            if self.robo != "oldest":
+                self.descartados += 1
+                return None
+            elegido = min(range(len(self.canales)), key=self._inicio.__getitem__)
+            self.robados += 1
+        canal = self.canales[elegido]
+        canal.play(sound)
+        self._inicio[elegido] = time.perf_counter()
+        return canal
+
 
 class SoundManager:
-    def __init__(self, preload=True):
+    # Categoría de cada efecto: cada una tiene sus propios canales (ChannelPool)
+    CATEGORIAS = {
+        "move": "input",
+        "rotate": "input",
+        "soft_drop": "input",
+        "line_clear": "juego",
+        "gameover": "juego",
+        "final_theme": "juego",
+    }
+    # categoría -> (canales reservados, política de robo)
+    POOLS = {
+        "input": (3, "oldest"),
+        "juego": (2, "oldest"),
+        "ui": (2, "none"),
+        "musica": (2, "none"),    # los usa MusicPlayer para el fundido cruzado
+    }
+    # Intervalo mínimo entre dos reproducciones del mismo efecto (ms)
+    LIMITE_MS = {
+        "move": 25,
+        "rotate": 25,
+        "soft_drop": 40,
+    }
+
+    # Orden de carga en segundo plano: los efectos de la partida primero
+    PRIORIDADES = {
+        "rotate": PRIORIDAD_JUEGO,
+        "move": PRIORIDAD_JUEGO,
+        "soft_drop": PRIORIDAD_JUEGO,
+        "line_clear": PRIORIDAD_JUEGO,
+        "gameover": PRIORIDAD_JUEGO,
+        "screamer": PRIORIDAD_EXTRA,
+    }
+
+    def __init__(self, preload=True, loader=None, bundle=None, pcm_cache=None):
         self.base_dir = Path(GameSettings.SOUNDS_DIR)
         self.sounds = {}          # cache de efectos cortos: name -> pygame.mixer.Sound | None
         self._music_volume = 0.4
+        self.loader = loader      # AssetLoader opcional: si existe, el preload no bloquea
+        self.bundle = bundle      # Bundle opcional: se busca ahí antes que en SOUNDS_DIR
+        self.pcm_cache = pcm_cache  # PCMCache opcional: efectos ya decodificados en disco
+        # índice de SOUNDS_DIR (sin distinguir mayúsculas): las búsquedas no tocan el disco
+        self.index = DirectoryIndex(self.base_dir, vigilar_mtime=GameSettings.VIGILAR_ASSETS)
+        self._pendientes = {}     # name -> Future de una carga en segundo plano
+
+        # Canales por categoría (se crean al primer play, con el mixer ya iniciado)
+        self.pools = None
+        self._ultimo_play = {}    # name -> perf_counter de la última reproducción
+        self.limitados = 0        # reproducciones descartadas por LIMITE_MS
+        self._llamadas_play = deque(maxlen=256)  # segundos que tardó cada Channel.play() (para latency_report)
+        self.music = MusicPlayer(
+            self._canales_musica, self._decodificar_musica, loader,
+            crossfade_ms=GameSettings.MUSICA_CROSSFADE_MS,
+            presupuesto=GameSettings.MUSICA_MEMORIA,
+            max_pistas=GameSettings.MUSICA_PISTAS,
+            fijas=GameSettings.MUSICA_FIJAS,
+        )
 
         # Mapa por defecto: nombre lógico -> archivo en la carpeta de sonidos
         self.default_map = {
@@ -28,17 +122,84 @@ class SoundManager:
         return self.base_dir.joinpath(*paths)
 
     # --------------------
-    # Carga y caché
+    # Mixer
     # --------------------
-    def load_sound(self, name, filename=None, volume=0.8):
+    @staticmethod
+    def configure_mixer(frequency=None, buffer=None):
         """
-        Carga un efecto corto y lo guarda en caché.
-        - name: clave lógica para referenciar el sonido.
-        - filename: si no se pasa, se busca en default_map.
+        Configura el mixer antes de pygame.init()/pygame.mixer.init(). Un
+        buffer más chico reduce el retardo entre la tecla y el sonido (a costa
+        de más trabajo del hilo de audio).
         """
-        if name in self.sounds:
-            return self.sounds[name]
+        pygame.mixer.pre_init(
+            frequency or GameSettings.AUDIO_FRECUENCIA,
+            -16,
+            2,
+            buffer or GameSettings.AUDIO_BUFFER,
+        )
+
+    def _crear_pools(self):
+        if pygame.mixer.get_init() is None:
+            return False
+        total = sum(n for n, _ in self.POOLS.values())
+        # canales reservados al principio y el resto para Sound.play()
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total + 8))
+        pygame.mixer.set_reserved(total)
+        self.pools = {}
+        siguiente = 0
+        for categoria, (cantidad, robo) in self.POOLS.items():
+            canales = [pygame.mixer.Channel(i) for i in range(siguiente, siguiente + cantidad)]
+            self.pools[categoria] = ChannelPool(canales, robo)
+            siguiente += cantidad
+        return True
 
+    def latency_report(self):
+        """
+        Datos de audio para el perfil (--profile-out):
+        - buffer_mixer_ms: retardo que agrega el buffer del mixer con
+          AUDIO_BUFFER muestras a la frecuencia real del mixer. Es el mínimo
+          entre play() y que el sonido salga; el del driver y el sistema
+          operativo se suma encima y no se puede medir desde pygame.
+        - llamada_play_*: lo que tarda en Python la llamada a Channel.play()
+          (elegir canal y encolar el sonido). No es la latencia hasta que se oye.
+        - contadores de robo, descarte y límite de frecuencia.
+        """
+        frecuencia = pygame.mixer.get_init()[0] if pygame.mixer.get_init() else GameSettings.AUDIO_FRECUENCIA
+        llamadas = sorted(self._llamadas_play)
+        pools = self.pools or {}
+        return {
+            "buffer_mixer_ms": GameSettings.AUDIO_BUFFER / frecuencia * 1000,
+            "llamada_play_p50_ms": llamadas[len(llamadas) // 2] * 1000 if llamadas else 0.0,
+            "llamada_play_max_ms": llamadas[-1] * 1000 if llamadas else 0.0,
+            "reproducciones": len(llamadas),
+            "robados": sum(p.robados for p in pools.values()),
+            "descartados": sum(p.descartados for p in pools.values()),
+            "limitados": self.limitados,
+        }
+
+    def refresh_index(self):
+        """Vuelve a leer SOUNDS_DIR (por ejemplo tras copiar sonidos nuevos)."""
+        self.index.refrescar()
+
+    # --------------------
+    # Carga y caché
+    # --------------------
+    def _en_bundle(self, filename):
+        if self.bundle is None:
+            return None
+        return self.bundle.buscar(f"sounds/{filename}")
+
+    def _abrir(self, fuente):
+        """Argumento para pygame: la ruta o un archivo en memoria si viene del bundle."""
+        if isinstance(fuente, Entrada):
+            return self.bundle.abrir(fuente)
+        return str(fuente)
+
+    def _resolver(self, name, filename):
+        """
+        Entrada del bundle o ruta del archivo del sonido, o None (y lo deja en
+        caché como None) si no hay.
+        """
         if filename is None:
             filename = self.default_map.get(name)
             if filename is None:
@@ -46,61 +207,187 @@ class SoundManager:
                 self.sounds[name] = None
                 return None
 
-        sound_path = self._root_path(filename)
-        if not sound_path.exists():
-            print(f"❌ No existe sonido: {sound_path}")
+        entrada = self._en_bundle(filename)
+        if entrada is not None:
+            return entrada
+
+        sound_path = self.index.buscar(filename)
+        if sound_path is None:
+            print(f"❌ No existe sonido: {self._root_path(filename)}")
             self.sounds[name] = None
             return None
+        return sound_path
 
+    def _decodificar(self, fuente, volume):
+        # se puede ejecutar en un hilo del AssetLoader
         try:
-            sound = pygame.mixer.Sound(str(sound_path))
+            if self.pcm_cache is not None:
+                if isinstance(fuente, Entrada):
+                    datos = self.bundle.datos(fuente)
+                else:
+                    datos = fuente.read_bytes()
+                sound = self.pcm_cache.sound(datos)
+            else:
+                sound = pygame.mixer.Sound(self._abrir(fuente))
             sound.set_volume(volume)
-            self.sounds[name] = sound
             return sound
         except Exception as e:
-            print(f"❌ Error cargando sonido {filename}: {e}")
-            self.sounds[name] = None
+            print(f"❌ Error cargando sonido {fuente.name}: {e}")
             return None
 
+    def _recoger(self, name):
+        """Espera (o hace en el momento) la carga en segundo plano de name."""
+        futuro = self._pendientes.pop(name)
+        self.sounds[name] = self.loader.resultado(futuro)
+        return self.sounds[name]
+
+    def load_sound(self, name, filename=None, volume=0.8):
+        """
+        Carga un efecto corto y lo guarda en caché.
+        - name: clave lógica para referenciar el sonido.
+        - filename: si no se pasa, se busca en default_map.
+        """
+        if name in self._pendientes:
+            return self._recoger(name)
+        if name in self.sounds:
+            return self.sounds[name]
+
+        sound_path = self._resolver(name, filename)
+        if sound_path is None:
+            return None
+        self.sounds[name] = self._decodificar(sound_path, volume)
+        return self.sounds[name]
+
+    def load_sound_async(self, name, filename=None, volume=0.8, prioridad=None):
+        """
+        Encola la carga de un efecto en el AssetLoader y devuelve su Future.
+        load_sound/play_sound con el mismo name recogen el resultado.
+        """
+        if name in self._pendientes:
+            return self._pendientes[name]
+        if self.loader is None or name in self.sounds:
+            futuro = Future()
+            futuro.set_result(self.load_sound(name, filename, volume))
+            return futuro
+
+        sound_path = self._resolver(name, filename)
+        if sound_path is None:
+            futuro = Future()
+            futuro.set_result(None)
+            return futuro
+        if prioridad is None:
+            prioridad = self.PRIORIDADES.get(name, PRIORIDAD_NORMAL)
+        futuro = self.loader.submit(prioridad, self._decodificar, sound_path, volume)
+        self._pendientes[name] = futuro
+        return futuro
+
     def load_all_default_sounds(self, volume=0.5):
-        """Carga todos los sonidos definidos en default_map a la caché."""
+        """
+        Carga todos los sonidos definidos en default_map a la caché
+        (en segundo plano si hay AssetLoader).
+        """
         for name, filename in self.default_map.items():
             # Para música larga (mp3/ogg) no se cargan como Sound; se reproducen con play_music
             if filename.lower().endswith((".mp3",".ogg")) and not name.endswith("over"):
                 self.sounds[name] = None
                 continue
-            self.load_sound(name, filename, volume=volume)
+            if self.loader is not None:
+                self.load_sound_async(name, filename, volume=volume)
+            else:
+                self.load_sound(name, filename, volume=volume)
 
     # --------------------
     # Reproducción
     # --------------------
     def play_sound(self, name):
-        """Reproduce un efecto corto ya cargado (o lo carga si no está)."""
+        """
+        Reproduce un efecto corto ya cargado (o lo carga si no está) en los
+        canales de su categoría. Repetir el mismo efecto antes de LIMITE_MS no
+        hace nada. Devuelve el Channel usado o None.
+        """
         sound = self.sounds.get(name)
         if sound is None:
             sound = self.load_sound(name)
-        if sound:
-            sound.play()
+        if not sound:
+            return None
+
+        inicio = time.perf_counter()
+        limite = self.LIMITE_MS.get(name)
+        if limite is not None:
+            ultimo = self._ultimo_play.get(name)
+            if ultimo is not None and (inicio - ultimo) * 1000 < limite:
+                self.limitados += 1
+                return None
+        self._ultimo_play[name] = inicio
+
+        if self.pools is None and not self._crear_pools():
+            return None
+        llamada = time.perf_counter()
+        canal = self.pools[self.CATEGORIAS.get(name, "ui")].play(sound)
+        self._llamadas_play.append(time.perf_counter() - llamada)
+        return canal
 
     def stop_all_music(self):
+        self.music.stop()
         pygame.mixer.music.stop()
         pygame.mixer.music.set_endevent()
 
-    def play_music(self, filename, loop=-1, volume=None):
-        """Reproduce música larga (archivo en SOUNDS_DIR)."""
+    # --------------------
+    # Música (MusicPlayer: pistas decodificadas en segundo plano y fundido cruzado)
+    # --------------------
+    def _fuente_musica(self, filename):
+        entrada = self._en_bundle(filename)
+        if entrada is not None:
+            return entrada
+        return self.index.buscar(filename)
+
+    def _decodificar_musica(self, filename):
+        # se ejecuta en un hilo del AssetLoader
+        fuente = self._fuente_musica(filename)
+        if fuente is None:
+            return None
+        try:
+            return pygame.mixer.Sound(self._abrir(fuente))
+        except Exception as e:
+            print(f"❌ Error cargando música {fuente.name}: {e}")
+            return None
+
+    def _canales_musica(self):
+        if self.pools is None and not self._crear_pools():
+            return []
+        return self.pools["musica"].canales
+
+    def preload_music(self, filename):
+        """Decodifica de antemano una pista que probablemente suene pronto."""
+        if pygame.mixer.get_init() is None or self._fuente_musica(filename) is None:
+            return None
+        return self.music.preload(filename)
+
+    def play_music(self, filename, loop=-1, volume=None, fade_ms=None):
+        """
+        Reproduce música larga (archivo en SOUNDS_DIR) con fundido cruzado
+        desde la pista actual. No bloquea: si la pista aún se está
+        decodificando empieza a sonar al terminar.
+        """
         if volume is None:
             volume = self._music_volume
-        music_path = self._root_path(filename)
-        if music_path.exists():
-            try:
-                self.stop_all_music()
-                pygame.mixer.music.load(str(music_path))
-                pygame.mixer.music.set_volume(volume)
-                pygame.mixer.music.play(loop)
-            except Exception as e:
-                print(f"❌ Error cargando música {music_path}: {e}")
-        else:
-            print(f"❌ No existe música: {music_path}")
+        if self._fuente_musica(filename) is None:
+            print(f"❌ No existe música: {self._root_path(filename)}")
+            return
+        if pygame.mixer.get_init() is None:
+            return
+        self.music.play(filename, loops=loop, volume=volume, fade_ms=fade_ms)
+
+    def update_music(self):
+        """Arranca la pista que terminó de decodificarse (cada frame, en el hilo principal)."""
+        self.music.actualizar()
+
+    def set_music_endevent(self, tipo=None):
+        """Evento a publicar cuando la pista actual termina (sin argumento: ninguno)."""
+        self.music.set_endevent(tipo)
+
+    def music_busy(self):
+        return self.music.busy
 
     # --------------------
     # Métodos específicos
@@ -116,8 +403,8 @@ class SoundManager:
         self.play_music("gameover_theme.mp3", loop=0, volume=volume)
 
     def play_screamer(self, volume=0.8):
-        """Reproduce el screamer como música larga (38s)."""
-        self.play_music("screamer.mp3", loop=0, volume=volume)
+        """Reproduce el screamer como música larga (38s), sin fundido: entra de golpe."""
+        self.play_music("screamer.mp3", loop=0, volume=volume, fade_ms=0)
     
 
     
\ No newline at end of file
@@ -0,0 +1,115 @@
+# game/startup.py
+"""
+Medición del tiempo de arranque (python run.py --profile-startup).
+
+ImportTimer se instala en sys.meta_path y mide cuánto tarda en ejecutarse
+cada módulo importado, igual que `python -X importtime`: tiempo propio
+(sin contar los imports que hace dentro) y acumulado. medir(nombre) mide
+pasos de inicialización (pygame.init, ventana, gestores, primer frame).
+
+Si el perfil no está activo, medir() no registra nada y cuesta lo mismo
+que un `with` vacío.
+"""
+import sys
+import time
+from contextlib import contextmanager
+
+_activo = False
+_pasos = []         # (nombre, segundos) de cada medir()
+
+
+class _LoaderCronometrado:
+    """Envuelve el loader real de un módulo para medir exec_module."""
+
+    def __init__(self, timer, loader):
+        self._timer = timer
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer._entrar()
+        inicio = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._salir(module.__name__, time.perf_counter() - inicio)
+
+    def __getattr__(self, nombre):
+        return getattr(self._loader, nombre)
+
+
+class ImportTimer:
+    """MetaPathFinder que delega en el resto de finders y cronometra cada import."""
+
+    def __init__(self):
+        self.modulos = []       # (nombre, propio, acumulado, profundidad) en orden de fin
+        self._hijos = [0.0]     # tiempo acumulado de los imports anidados por nivel
+        self._buscando = False
+
+    def find_spec(self, nombre, path=None, target=None):
+        if self._buscando:
+            return None
+        self._buscando = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(nombre, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._buscando = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _LoaderCronometrado(self, spec.loader)
+        return spec
+
+    def _entrar(self):
+        self._hijos.append(0.0)
+
+    def _salir(self, nombre, acumulado):
+        hijos = self._hijos.pop()
+        self._hijos[-1] += acumulado
+        self.modulos.append((nombre, acumulado - hijos, acumulado, len(self._hijos) - 1))
+
+    def instalar(self):
+        sys.meta_path.insert(0, self)
+
+    def desinstalar(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+def activar():
+    """Empieza a registrar los pasos de medir()."""
+    global _activo
+    _activo = True
+    _pasos.clear()
+
+
+@contextmanager
+def medir(nombre):
+    if not _activo:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _pasos.append((nombre, time.perf_counter() - inicio))
+
+
+def informe(timer, total, limite=25, salida=None):
+    """Imprime los módulos más lentos, los pasos de inicialización y el total."""
+    salida = salida or sys.stderr
+    print("Imports (ms)        propio | acumulado | módulo", file=salida)
+    lentos = sorted(timer.modulos, key=lambda m: m[2], reverse=True)[:limite]
+    for nombre, propio, acumulado, nivel in lentos:
+        print(f"          {propio * 1000:12.1f} | {acumulado * 1000:9.1f} | {'  ' * nivel}{nombre}", file=salida)
+    print("Inicialización (ms)", file=salida)
+    for nombre, segundos in _pasos:
+        print(f"          {segundos * 1000:12.1f} | {nombre}", file=salida)
+    print(f"Total hasta la pantalla de título: {total * 1000:.1f} ms", file=salida)
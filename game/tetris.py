@@ -1,425 +1,496 @@
 import pygame
-import random
 import itertools
-from game.sounds import SoundManager
-from game.images import ImageManager
+from game.resources import get_sound_manager, get_image_manager
+from game.settings import GameSettings
+from game.pieces import COLORES
+from game.engine import GameState, colision, IZQUIERDA, DERECHA, ABAJO, ROTAR, GRAVEDAD
+from game.ai import Bot
+from game.controls import Control, InputHandler
+from game.replay import Grabadora, Reproductor
+from game.render import BoardRenderer
+from game.screens import Screen, run_screen
+from game.text import text_cache
 
 __version__ = "0.1.0"
-def run_game(screen):
-    
-    tam_bloque = 30
-    columnas = 11
-    filas = 20
-    MARGEN_SUPERIOR = 60
 
-    pygame.display.set_caption("Tetris")
-
-    # --------------------
-    # Colores
-    # --------------------
-    NEGRO = (0, 0, 0)
-    BLANCO = (255, 255, 255)
-    ROJO = (255, 0, 0)
-    GRIS = (128, 128, 128)
-
-    COLORES = [
-        (0, 255, 255),   # I
-        (0, 0, 255),     # J
-        (255, 165, 0),   # L
-        (255, 255, 0),   # O
-        (0, 255, 0),     # S
-        (128, 0, 128),   # T
-        (255, 0, 0)      # Z
+TAM_BLOQUE = 30
+COLUMNAS = 11
+FILAS = 20
+MARGEN_SUPERIOR = 60
+
+# --------------------
+# Colores
+# --------------------
+NEGRO = (0, 0, 0)
+BLANCO = (255, 255, 255)
+
+KONAMI_CODE = [
+    pygame.K_UP, pygame.K_UP,
+    pygame.K_DOWN, pygame.K_DOWN,
+    pygame.K_LEFT, pygame.K_RIGHT,
+    pygame.K_LEFT, pygame.K_RIGHT,
+    pygame.K_b, pygame.K_a
+]
+
+MUSICA_JUEGO = "tetris_theme.mp3"
+MUSICA_SECRETA = "secret_music.mp3"  # se reproduce con sound_manager.play_music()
+
+
+def poner_musica(ruta):
+    """Reproduce música usando SoundManager."""
+    # ruta puede ser nombre de archivo dentro de SOUNDS_DIR
+    if ruta:
+        get_sound_manager().play_music(ruta)
+    else:
+        # si no se pasa ruta, detener música
+        get_sound_manager().stop_all_music()
+
+
+# --------------------
+# Easter Egg
+# --------------------
+class EasterEggScene(Screen):
+    """Pantalla independiente para el Easter Egg con dos fases y contador de F que desbloquea imagen."""
+
+    DURACION_INTRO_MS = 5000
+    DURACION_PREMIO_MS = 6000  # si quieres que el premio se muestre solo 6s; si quieres que quede fija, ignora timers
+
+    MENSAJE = [
+        "Bien hecho, lo has logrado.",
+        "Descubriste el misterio secreto",
+        "dejado por los desarrolladores.",
+        "Te has ganado el premio",
+        "por la curiosidad.",
+        "Este proyecto nos enorgullece",
+        "enormemente y que tú estés aquí",
+        "jugándolo y disfrutándolo nos",
+        "da una gran felicidad.",
+        "Muchas gracias y de parte del",
+        "grupo Los Tripulantes nos despedimos.",
+        "Press F to pay respect"
     ]
 
-    PIEZAS = [
-        [[1, 1, 1, 1]],            # I
-        [[1, 1], [1, 1]],          # O
-        [[0, 1, 0], [1, 1, 1]],    # T
-        [[1, 0, 0], [1, 1, 1]],    # J
-        [[0, 0, 1], [1, 1, 1]],    # L
-        [[1, 1, 0], [0, 1, 1]],    # S
-        [[0, 1, 1], [1, 1, 0]]     # Z
-    ]
-    soft_drop_interval_ms = 80 #velocidad miestars mantienes keydown
-    last_soft_drop_time = 0    #timestamp de la ultima bajada por hold
-    
-    # --------------------
-    # Inicializar gestores
-    # --------------------
-    sound_manager = SoundManager()
-    image_manager = ImageManager()
-
-    # Música de fondo (usando SoundManager)
-    sound_manager.play_music("tetris_theme.mp3", loop=-1, volume=0.4)
-
-    # Efectos (se cargan mediante SoundManager)
-    rotate_sound   = sound_manager.load_sound("rotate", "rotate.flac")
-    move_sound     = sound_manager.load_sound("move", "move.mp3")
-    soft_drop      = sound_manager.load_sound("soft_drop", "soft_drop.wav")
-    line_clear     = sound_manager.load_sound("line_clear", "line_clear.mp3")
-    gameover_sound = sound_manager.load_sound("gameover", "gameover.wav")
-    final_theme    = sound_manager.load_sound("final_theme", "gameover_theme.mp3")
-
-    # Recursos Easter Egg (se cargan mediante ImageManager)
-    secret_image_path = image_manager.load_image("secret", "secret.png")
-    secret_image = secret_image_path  # ImageManager devuelve la Surface o None
-
-    premio_path = image_manager.load_image("premio", "premio.png")
-    premio_image = premio_path  # ImageManager devuelve la Surface o None
-
-    musica_secreta = "secret_music.mp3"  # se reproduce con sound_manager.play_music()
-
-    KONAMI_CODE = [
-        pygame.K_UP, pygame.K_UP,
-        pygame.K_DOWN, pygame.K_DOWN,
-        pygame.K_LEFT, pygame.K_RIGHT,
-        pygame.K_LEFT, pygame.K_RIGHT,
-        pygame.K_b, pygame.K_a
-    ]
-    input_seq = []
-
-    def poner_musica(ruta):
-        """Reproduce música usando SoundManager."""
-        # ruta puede ser nombre de archivo dentro de SOUNDS_DIR 
-        if ruta:
-            sound_manager.play_music(ruta)
-        else:
-            # si no se pasa ruta, detener música
-            sound_manager.stop_all_music()
-
-    def ejecutar_easter_egg():
-        """Pantalla independiente para el Easter Egg con dos fases y contador de F que desbloquea imagen."""
-        poner_musica(musica_secreta)
-        colors_cycle = itertools.cycle([(255,0,0), (0,255,0), (0,0,255), (255,255,0)])
-        font_grande = pygame.font.Font(None, 60)
-        font_mediana = pygame.font.Font(None, 36)
-        font_pequena = pygame.font.Font(None, 28)
-
-        inicio = pygame.time.get_ticks()
-        fase = 1  # 1 = intro de 5 segundos, 2 = mensaje especial
-        f_counter = 0  # contador de veces que se presiona F
-        mostrar_premio = False
-
-        # Si queremos que la imagen especial desaparezca tras unos segundos, podemos usar timer_premio
-        timer_premio_inicio = None
-        DURACION_PREMIO_MS = 6000  # si quieres que el premio se muestre solo 5s; si quieres que quede fija, ignora timers
+    def on_enter(self):
+        poner_musica(MUSICA_SECRETA)
+        self.image_manager = get_image_manager()
+        # Recursos Easter Egg (ImageManager devuelve la Surface o None)
+        self.secret_image = self.image_manager.load_image("secret", "secret.png")
+        self.premio_image = self.image_manager.load_image("premio", "premio.png")
+
+        self.colors_cycle = itertools.cycle([(255,0,0), (0,255,0), (0,0,255), (255,255,0)])
+        self.font_grande = pygame.font.Font(None, 60)
+        self.font_mediana = pygame.font.Font(None, 36)
+        self.font_pequena = pygame.font.Font(None, 28)
+
+        self.inicio = pygame.time.get_ticks()
+        self.fase = 1  # 1 = intro de 5 segundos, 2 = mensaje especial
+        self.f_counter = 0  # contador de veces que se presiona F
+        self.mostrar_premio = False
+        # Si queremos que la imagen especial desaparezca tras unos segundos, usamos timer_premio
+        self.timer_premio_inicio = None
+
+    @property
+    def animating(self):
+        return True
+
+    def handle_event(self, ev):
+        if ev.type == pygame.QUIT:
+            poner_musica(MUSICA_JUEGO)
+            self.finish("quit")
+            return
+        if ev.type == pygame.KEYDOWN:
+            # En cualquier fase ESC vuelve al juego
+            if ev.key == pygame.K_ESCAPE:
+                poner_musica(MUSICA_JUEGO)
+                self.finish("resume")
+                return
+
+            if self.fase == 2 and ev.key == pygame.K_f:
+                self.f_counter += 1
+                print(f"Respect paid ({self.f_counter}/10)")
+                # reproducir efecto breve: usar SoundManager
+                get_sound_manager().play_sound("rotate")
+                if self.f_counter >= 10:
+                    self.mostrar_premio = True
+                    self.timer_premio_inicio = None  # reiniciar timer para mostrar premio
+                    print("🎉 Imagen especial desbloqueada")
+                else:
+                    print("No se pudo cargar premio.png")
+
+    def update(self, now):
+        # Pasar a fase 2 después de 5 segundos
+        if self.fase == 1 and now - self.inicio > self.DURACION_INTRO_MS:
+            self.fase = 2
+
+        if self.fase == 2 and self.mostrar_premio and self.premio_image:
+            # Si usamos timer para que el premio desaparezca tras X ms:
+            if self.timer_premio_inicio is None:
+                self.timer_premio_inicio = now
+            elif now - self.timer_premio_inicio > self.DURACION_PREMIO_MS:
+                # Ocultar premio después de la duración (si prefieres que quede fija, comenta estas líneas)
+                self.mostrar_premio = False
+                self.timer_premio_inicio = None
+        self.dirty = True
+
+    def draw(self, screen):
         WIDTH, HEIGHT = screen.get_size()
-        while True:
-            screen.fill(NEGRO)
-
-            if fase == 1:
-                # Imagen secreta y texto dinámico
-                if secret_image:
-                    img = pygame.transform.scale(secret_image, (WIDTH, HEIGHT))
-                    screen.blit(img, (0, 0))
-                    
-
-                txt = font_grande.render("¡SECRET MODE!", True, next(colors_cycle))
-                screen.blit(txt, (screen.get_width()//2 - txt.get_width()//2, 50))
-
-                hint = font_mediana.render("Presiona ESC para volver", True, BLANCO)
-                screen.blit(hint, (screen.get_width()//2 - hint.get_width()//2, screen.get_height()-50))
-
-                # Pasar a fase 2 después de 5 segundos
-                if pygame.time.get_ticks() - inicio > 5000:
-                    fase = 2
-
-            elif fase == 2:
-                # Mensaje especial
-                mensaje = [
-                    "Bien hecho, lo has logrado.",
-                    "Descubriste el misterio secreto",
-                    "dejado por los desarrolladores.",
-                    "Te has ganado el premio",
-                    "por la curiosidad.",
-                    "Este proyecto nos enorgullece",
-                    "enormemente y que tú estés aquí",
-                    "jugándolo y disfrutándolo nos",
-                    "da una gran felicidad.",
-                    "Muchas gracias y de parte del",
-                    "grupo Los Tripulantes nos despedimos.",
-                    "Press F to pay respect"
-                ]
-
-                y = 80
-                for linea in mensaje:
-                    txt = font_mediana.render(linea, True, BLANCO)
-                    screen.blit(txt, (screen.get_width()//2 - txt.get_width()//2, y))
-                    y += 36
-
-                # Mostrar contador de F en pantalla
-                contador_txt = font_pequena.render(f"Respectos: {f_counter}/10", True, (200,200,200))
-                screen.blit(contador_txt, (screen.get_width()//2 - contador_txt.get_width()//2, y + 10))
-
-                # Si se presionó F 10 veces, mostrar imagen especial
-                if mostrar_premio and premio_image:
-                    rect = premio_image.get_rect(center=(screen.get_width()//2, screen.get_height()//2 + 40))
-                    rect = pygame.transform.scale(premio_image, (WIDTH, HEIGHT))
-                    screen.blit(rect, (0, 0))
-
-                    # Si usamos timer para que el premio desaparezca tras X ms:
-                    if timer_premio_inicio is None:
-                        timer_premio_inicio = pygame.time.get_ticks()
-                    else:
-                        if pygame.time.get_ticks() - timer_premio_inicio > DURACION_PREMIO_MS:
-                            # Ocultar premio después de la duración (si prefieres que quede fija, comenta estas líneas)
-                            mostrar_premio = False
-                            timer_premio_inicio = None
-
-            pygame.display.flip()
-
-            # Eventos
-            for ev in pygame.event.get():
-                if ev.type == pygame.QUIT:
-                    poner_musica("tetris_theme.mp3")
-                    return "quit"
-                if ev.type == pygame.KEYDOWN:
-                    # En cualquier fase ESC vuelve al juego
-                    if ev.key == pygame.K_ESCAPE:
-                        poner_musica("tetris_theme.mp3")
-                        return "resume"
-
-                    if fase == 1:
-                        # permitir saltar la intro con ESC (ya manejado) o con F si quieres
-                        continue
-
-                    if fase == 2:
-                        if ev.key == pygame.K_f:
-                            f_counter += 1
-                            print(f"Respect paid ({f_counter}/10)")
-                            # reproducir efecto breve: usar SoundManager
-                            sound_manager.play_sound("rotate")
-                            if f_counter >= 10:
-                                mostrar_premio = True
-                                timer_premio_inicio = None  # reiniciar timer para mostrar premio
-                                print("🎉 Imagen especial desbloqueada")
-                            else:
-                                print("No se pudo cargar premio.png")
-                        # permitir otras teclas en fase 2 (por ejemplo volver con ESC ya manejado)
-
-    # --------------------
-    # Fuente
-    # --------------------
-    font = pygame.font.Font(None, 36)
+        screen.fill(NEGRO)
 
-    # --------------------
-    # Funciones de juego
-    # --------------------
-    def crear_nueva_pieza():
-        forma = random.choice(PIEZAS)
-        color = random.choice(COLORES)
+        if self.fase == 1:
+            # Imagen secreta y texto dinámico
+            if self.secret_image:
+                # escalada una sola vez (caché de variantes del ImageManager)
+                screen.blit(self.image_manager.get_scaled("secret", (WIDTH, HEIGHT)), (0, 0))
+
+            txt = text_cache.render(self.font_grande, "¡SECRET MODE!", next(self.colors_cycle))
+            screen.blit(txt, (WIDTH//2 - txt.get_width()//2, 50))
+
+            hint = text_cache.render(self.font_mediana, "Presiona ESC para volver", BLANCO)
+            screen.blit(hint, (WIDTH//2 - hint.get_width()//2, HEIGHT-50))
+
+        elif self.fase == 2:
+            # Mensaje especial
+            y = 80
+            for linea in self.MENSAJE:
+                txt = text_cache.render(self.font_mediana, linea, BLANCO)
+                screen.blit(txt, (WIDTH//2 - txt.get_width()//2, y))
+                y += 36
+
+            # Mostrar contador de F en pantalla
+            contador_txt = text_cache.render(self.font_pequena, f"Respectos: {self.f_counter}/10", (200,200,200))
+            screen.blit(contador_txt, (WIDTH//2 - contador_txt.get_width()//2, y + 10))
+
+            # Si se presionó F 10 veces, mostrar imagen especial
+            if self.mostrar_premio and self.premio_image:
+                screen.blit(self.image_manager.get_scaled("premio", (WIDTH, HEIGHT)), (0, 0))
+
+
+# --------------------
+# Replay
+# --------------------
+class ReplayScene(Screen):
+    """
+    Reproduce un Replay a la velocidad en que se jugó (un frame del replay por
+    tick, a los ticks por segundo guardados en el replay) con la vista del
+    juego. LEFT/RIGHT retroceden/avanzan SALTO_S segundos, P pausa y ESC sale.
+    """
+
+    fps = GameSettings.FPS_JUEGO
+    tick_hz = GameSettings.TICKS_POR_SEGUNDO
+    SALTO_S = 5
+
+    def __init__(self, replay):
+        super().__init__()
+        self.replay = replay
+        self.tick_hz = replay.tick_hz
+
+    def on_enter(self):
+        pygame.display.set_caption("Tetris - Replay")
+        self.font = pygame.font.Font(None, 36)
+        self.reproductor = Reproductor(self.replay)
+        self.renderer = BoardRenderer(
+            self.manager.surface, COLORES, self.font, COLUMNAS, FILAS, TAM_BLOQUE, MARGEN_SUPERIOR
+        )
+        self.frame = 0
+        self.pausa = False
+
+    @property
+    def animating(self):
+        return True
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.finish("quit")
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.finish("menu_principal")
+            elif event.key == pygame.K_p:
+                self.pausa = not self.pausa
+            elif event.key == pygame.K_LEFT:
+                self.frame = max(self.frame - self.SALTO_S * self.tick_hz, 0)
+                self.reproductor.seek(self.frame)
+            elif event.key == pygame.K_RIGHT:
+                self.frame = min(self.frame + self.SALTO_S * self.tick_hz, self.replay.frames)
+                self.reproductor.seek(self.frame)
+
+    def tick(self):
+        if not self.pausa and self.frame < self.replay.frames:
+            self.frame += 1
+            self.reproductor.avanzar_hasta(self.frame)
+
+    def update(self, now):
+        self.dirty = True
+
+    def invalidate(self):
+        self.renderer.invalidar()
+        super().invalidate()
+
+    def draw(self, screen):
+        return self.renderer.dibujar(self.reproductor.juego, self.pausa)
+
+
+def reproducir_replay(screen, replay):
+    """Reproduce un Replay en pantalla hasta que el jugador salga."""
+    return run_screen(ReplayScene(replay), screen)
+
+
+# --------------------
+# Partida
+# --------------------
+class GameScene(Screen):
+    """
+    Vista y control de una partida. Termina con "gameover" o "quit".
+    """
+
+    fps = GameSettings.FPS_JUEGO
+    tick_hz = GameSettings.TICKS_POR_SEGUNDO
+
+    tiempo_caida = 500      # ms por fila (gravedad por defecto) y hasta fijar una pieza apoyada
+    soft_drop_interval_ms = 80 #velocidad miestars mantienes keydown
+    SONIDOS = {IZQUIERDA: "move", DERECHA: "move", ABAJO: "soft_drop", ROTAR: "rotate"}
+    BOT_INTERVALO_MS = 40   # una acción del bot cada tantos ms
+    GRAVEDAD_MAXIMA = 20    # 20G: la pieza llega al fondo en el mismo tick en que aparece
+
+    def __init__(self, autoplay=False, gravedad=None):
+        """
+        - gravedad: filas por tick (G). Por defecto GameSettings.GRAVEDAD o,
+          si es None, una fila cada tiempo_caida ms.
+        """
+        super().__init__()
+        self.autoplay = autoplay
+        if gravedad is None:
+            gravedad = GameSettings.GRAVEDAD
+        if gravedad is None:
+            gravedad = 1000 / (self.tiempo_caida * self.tick_hz)
+        self.gravedad = min(gravedad, self.GRAVEDAD_MAXIMA)
+        self.ticks_fijado = max(1, round(self.tiempo_caida * self.tick_hz / 1000))
+        self.ticks_bot = max(1, round(self.BOT_INTERVALO_MS * self.tick_hz / 1000))
+
+    def _controles(self):
+        """Teclas de juego con su repetición (DAS/ARR); se aplican en tick()."""
         return {
-            "forma": forma,
-            "color": color,
-            "x": columnas // 2 - len(forma[0]) // 2,
-            "y": 0
+            pygame.K_LEFT: Control(IZQUIERDA, GameSettings.DAS_MS, GameSettings.ARR_MS, "horizontal"),
+            pygame.K_RIGHT: Control(DERECHA, GameSettings.DAS_MS, GameSettings.ARR_MS, "horizontal"),
+            pygame.K_DOWN: Control(ABAJO, self.soft_drop_interval_ms, self.soft_drop_interval_ms),
+            pygame.K_UP: Control(ROTAR),
         }
 
-    def colision(tablero, pieza):
-        for i, fila in enumerate(pieza["forma"]):
-            for j, bloque in enumerate(fila):
-                if bloque:
-                    x = pieza["x"] + j
-                    y = pieza["y"] + i
-
-                    if x < 0 or x >= columnas or y >= filas:
-                        return True
-
-                    if y >= 0 and tablero[y][x] != 0:
-                        return True
-        return False
-
-    def unir_pieza(tablero, pieza):
-        for i, fila in enumerate(pieza["forma"]):
-            for j, bloque in enumerate(fila):
-                if bloque:
-                    tablero[pieza["y"] + i][pieza["x"] + j] = pieza["color"]
-
-    def borrar_lineas(tablero):
-        nuevas = []
-        lineas_borradas = 0
-
-        for fila in tablero:
-            if all(v != 0 for v in fila):
-                lineas_borradas += 1
-            else:
-                nuevas.append(fila)
-
-        while len(nuevas) < len(tablero):
-            nuevas.insert(0, [0] * columnas)
-
-        return nuevas, lineas_borradas
-
-    def rotar_pieza(pieza):
-        pieza["forma"] = [list(row) for row in zip(*pieza["forma"][::-1])]
-        return pieza
+    def on_enter(self):
+        pygame.display.set_caption("Tetris")
+
+        # --------------------
+        # Gestores compartidos (los recursos ya cargados se reutilizan)
+        # --------------------
+        self.sound_manager = sound_manager = get_sound_manager()
+
+        # Música de fondo (usando SoundManager)
+        sound_manager.play_music(MUSICA_JUEGO, loop=-1, volume=0.4)
+        # el tema de game over se decodifica mientras se juega
+        sound_manager.preload_music("gameover_theme.mp3")
+
+        # Efectos (se cargan mediante SoundManager con los archivos de default_map
+        # y se reproducen con play_sound, en los canales de su categoría)
+        for nombre in ("rotate", "move", "soft_drop", "line_clear", "gameover"):
+            sound_manager.load_sound(nombre)
+        sound_manager.load_sound("final_theme", "gameover_theme.mp3")
+
+        self.input_seq = []
+        self.controles = InputHandler(self._controles(), self.tick_hz)
+
+        # --------------------
+        # Fuente
+        # --------------------
+        self.font = pygame.font.Font(None, 36)
+
+        # --------------------
+        # Variables
+        # --------------------
+        self.juego = GameState(COLUMNAS, FILAS)
+        self.renderer = BoardRenderer(
+            self.manager.surface, COLORES, self.font, COLUMNAS, FILAS, TAM_BLOQUE, MARGEN_SUPERIOR
+        )
+
+        # Grabación de la partida: cada acción aplicada se registra con su tick
+        self.grabadora = Grabadora(self.juego, self.tick_hz)
+        self.frame = 0
+
+        self.caida = 0.0        # gravedad acumulada (filas) desde la última bajada
+        self.apoyada = 0        # ticks que la pieza lleva sin poder bajar
+        self.pausa = False
+        self.fin_dibujado = False
+
+        # Autojugador (TAB lo activa/desactiva)
+        self.bot = Bot()
+        self.ultimo_bot = 0     # tick de la última acción del bot
+        self.plan = []
+        self.plan_pieza = None       # juego.piezas cuando se calculó el plan
+
+    @property
+    def animating(self):
+        return True
 
     # --------------------
-    # Variables
+    # Utilidades
     # --------------------
-    tablero = [[0] * columnas for _ in range(filas)]
-    pieza_actual = crear_nueva_pieza()
-
-    reloj = pygame.time.Clock()
-    tiempo_caida = 500
-    ultimo_movimiento = pygame.time.get_ticks()
+    def aplicar(self, accion):
+        self.grabadora.registrar(self.frame, accion)
+        return self.juego.step(accion)
+
+    def guardar_replay(self):
+        if GameSettings.GUARDAR_REPLAYS:
+            try:
+                self.grabadora.guardar(GameSettings.REPLAYS_DIR / "ultima_partida.ttr")
+            except OSError as e:
+                print(f"❌ No se pudo guardar el replay: {e}")
+
+    def _sonidos_de_paso(self, paso):
+        if paso.lineas > 0:
+            self.sound_manager.play_sound("line_clear")
+        if paso.game_over:
+            self.sound_manager.play_sound("gameover")
 
-    game_over = False
-    puntaje = 0
-    pausa = False
-    current_time = pygame.time.get_ticks()
     # --------------------
-    # Bucle principal
+    # Eventos
     # --------------------
-    while not game_over:
-        screen.fill(NEGRO)
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.sound_manager.stop_all_music()
+            self.guardar_replay()
+            self.finish("quit")
+            return
+
+        if event.type == pygame.WINDOWFOCUSLOST:
+            # los KEYUP no llegan sin foco: que no quede ninguna tecla "mantenida"
+            self.controles.soltar_todo()
+            return
+
+        if event.type == pygame.KEYUP:
+            self.controles.evento(event)
+            return
+
+        if event.type != pygame.KEYDOWN:
+            return
+
+        # Registrar tecla para Konami
+        self.input_seq.append(event.key)
+        # mantener input_seq con tamaño máximo razonable
+        if len(self.input_seq) > len(KONAMI_CODE):
+            self.input_seq.pop(0)
+        # a mitad del código ya se empieza a decodificar la música secreta
+        if self.input_seq[-6:] == KONAMI_CODE[:6]:
+            self.sound_manager.preload_music(MUSICA_SECRETA)
+        if self.input_seq[-len(KONAMI_CODE):] == KONAMI_CODE:
+            # Ejecutar Easter Egg (al volver se llama a on_resume)
+            self.manager.push(EasterEggScene())
+            return
+
+        # Pausa
+        if event.key == pygame.K_p:
+            self.pausa = not self.pausa
+            self.controles.soltar_todo()
+
+        if self.pausa:
+            return
+
+        # Autojugador
+        if event.key == pygame.K_TAB:
+            self.autoplay = not self.autoplay
+            self.plan_pieza = None
+            return
+
+        # Movimiento: se encola y se aplica en el próximo tick (con repetición si se mantiene)
+        self.controles.evento(event)
+
+    def on_resume(self, result):
+        # vuelta del Easter Egg: la música ya fue restaurada por EasterEggScene
+        if result == "quit":
+            self.guardar_replay()
+            self.finish("quit")
+            return
+        self.input_seq.clear()  # limpiar secuencia tras usar el easter egg
+        self.controles.soltar_todo()
+        super().on_resume(result)  # el easter egg dibujó encima de todo: redibujar
+
+    def invalidate(self):
+        self.renderer.invalidar()
+        super().invalidate()
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.mixer.music.stop()
-                return "quit"
-
-            if event.type == pygame.KEYDOWN:
-                # Registrar tecla para Konami
-                input_seq.append(event.key)
-                # mantener input_seq con tamaño máximo razonable
-                if len(input_seq) > len(KONAMI_CODE):
-                    input_seq.pop(0)
-                if input_seq[-len(KONAMI_CODE):] == KONAMI_CODE:
-                    # Ejecutar Easter Egg
-                    res = ejecutar_easter_egg()
-                    if res == "quit":
-                        return "quit"
-                    # al volver, la música ya fue restaurada por ejecutar_easter_egg
-                    input_seq.clear()  # limpiar secuencia tras usar el easter egg
-
-                # Pausa
-                if event.key == pygame.K_p:
-                    pausa = not pausa
-
-                if pausa:
-                    continue
-
-                # Movimiento
-                if event.key == pygame.K_LEFT:
-                    pieza_actual["x"] -= 1
-                    if colision(tablero, pieza_actual):
-                        pieza_actual["x"] += 1
-                    elif move_sound:
-                        move_sound.play()
-
-                elif event.key == pygame.K_RIGHT:
-                    pieza_actual["x"] += 1
-                    if colision(tablero, pieza_actual):
-                        pieza_actual["x"] -= 1
-                    elif move_sound:
-                        move_sound.play()
-
-                elif event.key == pygame.K_DOWN:
-                    pieza_actual["y"] += 1
-                    last_soft_drop_time = current_time
-                    keys = pygame.key.get_pressed()
-                    if keys[pygame.K_DOWN]:
-                        if current_time - last_soft_drop_time >= soft_drop_interval_ms:
-                            pieza_actual["y"]+= 1
-                            last_soft_drop_time = current_time
-                    else :
-                        last_soft_drop_time = 0
-
-                    if colision(tablero, pieza_actual):
-                        pieza_actual["y"] -= 1
-                    elif soft_drop:
-                        soft_drop.play()
-
-                elif event.key == pygame.K_UP:
-                    pieza_actual = rotar_pieza(pieza_actual)
-                    if colision(tablero, pieza_actual):
-                        # desrotar 3 veces
-                        for _ in range(3):
-                            pieza_actual = rotar_pieza(pieza_actual)
-                    elif rotate_sound:
-                        rotate_sound.play()
+    # --------------------
+    # Simulación
+    # --------------------
+    def _puede_bajar(self):
+        pieza = self.juego.pieza
+        return not colision(self.juego.tablero, dict(pieza, y=pieza["y"] + 1))
+
+    def _gravedad(self):
+        """
+        Suma la gravedad del tick y baja la pieza una fila por cada fila entera
+        acumulada (con 20G, hasta el fondo). Una pieza apoyada se fija tras
+        ticks_fijado ticks sin poder bajar.
+        """
+        self.caida += self.gravedad
+        while self.caida >= 1 and self._puede_bajar():
+            self.caida -= 1
+            self._sonidos_de_paso(self.aplicar(GRAVEDAD))
+
+        if self._puede_bajar():
+            self.apoyada = 0
+            return
+        self.caida = 0.0
+        self.apoyada += 1
+        if self.apoyada >= self.ticks_fijado:
+            # bloqueada: GRAVEDAD la fija y saca la siguiente
+            self._sonidos_de_paso(self.aplicar(GRAVEDAD))
+            self.apoyada = 0
+
+    def tick(self):
+        juego = self.juego
+        if juego.game_over:
+            return
+
+        # Teclas: pulsaciones encoladas y repeticiones de las mantenidas
+        if not self.pausa:
+            for accion, paso in self.controles.tick(self.aplicar):
+                if paso.movido:
+                    self.sound_manager.play_sound(self.SONIDOS[accion])
+
+        # Autojugador: ejecuta el plan del bot una acción cada ticks_bot ticks
+        if self.autoplay and not self.pausa:
+            if self.frame - self.ultimo_bot >= self.ticks_bot:
+                if self.plan_pieza != juego.piezas:
+                    self.plan_pieza = juego.piezas
+                    self.plan = self.bot.plan(juego)
+                self._sonidos_de_paso(self.aplicar(self.plan.pop(0) if self.plan else GRAVEDAD))
+                self.ultimo_bot = self.frame
 
         # Caída automática
-        if not pausa:
-            if pygame.time.get_ticks() - ultimo_movimiento > tiempo_caida:
-                pieza_actual["y"] += 1
-
-                if colision(tablero, pieza_actual):
-                    pieza_actual["y"] -= 1
-                    unir_pieza(tablero, pieza_actual)
-
-                    tablero, lineas = borrar_lineas(tablero)
-
-                    # Puntaje por líneas
-                    if lineas > 0:
-                        if line_clear:
-                            line_clear.play()
-
-                        if lineas == 1:
-                            puntaje += 100
-                        elif lineas == 2:
-                            puntaje += 300
-                        elif lineas == 3:
-                            puntaje += 500
-                        elif lineas == 4:
-                            puntaje += 800
-
-                    pieza_actual = crear_nueva_pieza()
-
-                    if colision(tablero, pieza_actual):
-                        game_over = True
-                        if gameover_sound:
-                            gameover_sound.play()
-
-                ultimo_movimiento = pygame.time.get_ticks()
-
-        # Dibujar tablero
-        for y, fila in enumerate(tablero):
-            for x, color in enumerate(fila):
-                if color != 0:
-                    pygame.draw.rect(
-                        screen, color,
-                        (x * tam_bloque, y * tam_bloque + MARGEN_SUPERIOR, tam_bloque, tam_bloque)
-                    )
-                    pygame.draw.rect(
-                        screen, GRIS,
-                        (x * tam_bloque, y * tam_bloque + MARGEN_SUPERIOR, tam_bloque, tam_bloque), 1
-                    )
-
-        # Dibujar pieza actual
-        for i, fila in enumerate(pieza_actual["forma"]):
-            for j, bloque in enumerate(fila):
-                if bloque:
-                    pygame.draw.rect(
-                        screen, pieza_actual["color"],
-                        ((pieza_actual["x"] + j) * tam_bloque,
-                         (pieza_actual["y"] + i) * tam_bloque + MARGEN_SUPERIOR,
-                         tam_bloque, tam_bloque)
-                    )
-                    pygame.draw.rect(
-                        screen, GRIS,
-                        ((pieza_actual["x"] + j) * tam_bloque,
-                         (pieza_actual["y"] + i) * tam_bloque + MARGEN_SUPERIOR,
-                         tam_bloque, tam_bloque), 1
-                    )
-
-        # Puntaje en pantalla
-        score_text = font.render(f"Puntaje: {puntaje}", True, BLANCO)
-        screen.blit(score_text, (10, 10))
-
-        # Pausa en pantalla
-        if pausa:
-            pause_text = font.render("PAUSA - Pulsa P", True, ROJO)
-            screen.blit(pause_text, (10, 35))
-
-        pygame.display.flip()
-        reloj.tick(60)
-
-    # Final del juego
-    pygame.mixer.music.stop()
-    if final_theme:
-        final_theme.play()
-
-    return "gameover"
\ No newline at end of file
+        if not self.pausa and not juego.game_over:
+            self._gravedad()
+
+        self.frame += 1
+
+    def update(self, now):
+        if self.juego.game_over:
+            if not self.fin_dibujado:
+                # dibujar una vez el tablero final antes de cerrar
+                self.fin_dibujado = True
+                self.dirty = True
+                return
+            self.guardar_replay()
+            self.sound_manager.stop_all_music()
+            self.sound_manager.play_sound("final_theme")
+            self.finish("gameover")
+            return
+        self.dirty = True
+
+    def desplazamiento(self):
+        """Fracción de celda que la pieza ya cayó hacia la fila siguiente (para dibujar entre ticks)."""
+        if self.pausa or self.gravedad >= 1 or not self._puede_bajar():
+            return 0.0
+        return min(self.caida + self.interpolacion * self.gravedad, 1.0)
+
+    def draw(self, screen):
+        # Solo se redibujan y envían a pantalla las zonas que cambiaron
+        rects = self.renderer.dibujar(self.juego, self.pausa, self.desplazamiento())
+        self.controles.frame_dibujado()
+        return rects
@@ -0,0 +1,55 @@
+# game/text.py
+"""
+Caché compartida de textos renderizados.
+
+font.render es caro y la mayoría de los textos (botones, créditos, HUD) no
+cambian entre frames. TextCache guarda la Surface de cada combinación
+(fuente, texto, color, antialias) con un límite de tamaño (LRU) y se puede
+invalidar entera o solo para una fuente.
+"""
+from collections import OrderedDict
+
+
+class TextCache:
+    def __init__(self, max_items=512):
+        self.max_items = max_items
+        self._surfaces = OrderedDict()   # (font, text, color, antialias) -> Surface
+        self.aciertos = 0
+        self.fallos = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Igual que font.render(text, antialias, color) pero reutilizando la Surface."""
+        clave = (font, text, tuple(color), antialias)
+        surf = self._surfaces.get(clave)
+        if surf is not None:
+            self._surfaces.move_to_end(clave)
+            self.aciertos += 1
+            return surf
+
+        self.fallos += 1
+        surf = font.render(text, antialias, color)
+        self._surfaces[clave] = surf
+        if len(self._surfaces) > self.max_items:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def invalidate(self, font=None):
+        """Vacía la caché, o solo las entradas de una fuente si se indica."""
+        if font is None:
+            self._surfaces.clear()
+            return
+        for clave in [c for c in self._surfaces if c[0] is font]:
+            del self._surfaces[clave]
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+text_cache = TextCache()
+
+
+def draw_text(text, font, color, surface, x, y):
+    """Dibuja texto centrado en (x, y) usando la caché compartida."""
+    textobj = text_cache.render(font, text, color)
+    textrect = textobj.get_rect(center=(x, y))
+    surface.blit(textobj, textrect)
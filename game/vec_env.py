@@ -0,0 +1,185 @@
+# game/vec_env.py
+"""
+Entorno vectorizado: N tableros avanzando a la vez con operaciones de NumPy.
+
+Los tableros viven en un único arreglo ``(N, filas, columnas)`` de uint8 con el
+índice de color de cada celda (0 = vacía). Las reglas son las mismas que las
+de game.engine (mismas acciones, mismo puntaje), pero la colisión, el fijado de
+piezas y el borrado de líneas se calculan para todos los tableros en bloque.
+
+Requiere numpy (dependencia opcional: el juego no lo necesita).
+"""
+import numpy as np
+
+from game.pieces import COLORES, PIEZAS, ROTACIONES, NUM_ROTACIONES
+from game.engine import (
+    IZQUIERDA, DERECHA, ABAJO, ROTAR, GRAVEDAD, PUNTOS_POR_LINEAS,
+)
+
+# _CELDAS[tipo, rot, k] = (dx, dy) de cada uno de los 4 bloques
+_CELDAS = np.array(
+    [[estado.celdas for estado in tabla] for tabla in ROTACIONES], dtype=np.int16
+)
+_ANCHO_INICIAL = np.array([tabla[0].ancho for tabla in ROTACIONES], dtype=np.int16)
+_PUNTOS = np.array(
+    [0] + [PUNTOS_POR_LINEAS.get(n, 0) for n in range(1, 5)], dtype=np.int64
+)
+
+
+class VecTetris:
+    def __init__(self, n, columnas=11, filas=20, seed=None):
+        self.n = n
+        self.columnas = columnas
+        self.filas = filas
+        self.rng = np.random.default_rng(seed)
+
+        self.tableros = np.zeros((n, filas, columnas), dtype=np.uint8)
+        self.tipo = np.zeros(n, dtype=np.int16)
+        self.rot = np.zeros(n, dtype=np.int16)
+        self.x = np.zeros(n, dtype=np.int16)
+        self.y = np.zeros(n, dtype=np.int16)
+        self.color = np.zeros(n, dtype=np.uint8)
+
+        self.puntaje = np.zeros(n, dtype=np.int64)
+        self.lineas = np.zeros(n, dtype=np.int64)
+        self.piezas = np.zeros(n, dtype=np.int64)
+        self.pasos = np.zeros(n, dtype=np.int64)
+        self.terminado = np.zeros(n, dtype=bool)
+
+        self.reset()
+
+    # --------------------
+    # Utilidades internas
+    # --------------------
+    def _posiciones(self, tipo, rot, x, y):
+        """Coordenadas (ys, xs) de los 4 bloques de cada pieza, forma (k, 4)."""
+        celdas = _CELDAS[tipo, rot]
+        xs = x[:, None] + celdas[..., 0]
+        ys = y[:, None] + celdas[..., 1]
+        return ys, xs
+
+    def _colision(self, idx, tipo, rot, x, y):
+        """Máscara (k,) de colisión para los tableros idx con las piezas dadas."""
+        ys, xs = self._posiciones(tipo, rot, x, y)
+        fuera = (xs < 0) | (xs >= self.columnas) | (ys >= self.filas)
+        ocupada = self.tableros[
+            idx[:, None],
+            np.clip(ys, 0, self.filas - 1),
+            np.clip(xs, 0, self.columnas - 1),
+        ] != 0
+        # las filas por encima del tablero solo chocan con las paredes
+        ocupada &= ys >= 0
+        return (fuera | ocupada).any(axis=1)
+
+    def _nuevas_piezas(self, idx):
+        """Genera una pieza nueva en los tableros idx y marca los que terminan."""
+        k = len(idx)
+        if not k:
+            return
+        tipo = self.rng.integers(0, len(PIEZAS), size=k).astype(np.int16)
+        self.tipo[idx] = tipo
+        self.rot[idx] = 0
+        self.x[idx] = self.columnas // 2 - _ANCHO_INICIAL[tipo] // 2
+        self.y[idx] = 0
+        self.color[idx] = self.rng.integers(1, len(COLORES) + 1, size=k)
+
+        choca = self._colision(idx, tipo, self.rot[idx], self.x[idx], self.y[idx])
+        self.terminado[idx[choca]] = True
+
+    def _borrar_lineas(self, idx):
+        """Borra las filas completas de los tableros idx y devuelve las líneas por tablero."""
+        sub = self.tableros[idx]
+        llenas = (sub != 0).all(axis=2)
+        cantidad = llenas.sum(axis=1)
+        con_lineas = cantidad > 0
+        if con_lineas.any():
+            sub = sub[con_lineas]
+            n = cantidad[con_lineas]
+            # orden estable: primero las filas llenas y luego el resto en su orden original
+            orden = np.argsort(~llenas[con_lineas], axis=1, kind="stable")
+            sub = np.take_along_axis(sub, orden[:, :, None], axis=1)
+            # las filas llenas quedaron arriba: se vacían
+            sub[np.arange(self.filas)[None, :] < n[:, None]] = 0
+            self.tableros[idx[con_lineas]] = sub
+        return cantidad
+
+    def _fijar(self, idx):
+        """Fija las piezas de los tableros idx, borra líneas, puntúa y crea las siguientes."""
+        if not len(idx):
+            return np.zeros(0, dtype=np.int64)
+        ys, xs = self._posiciones(self.tipo[idx], self.rot[idx], self.x[idx], self.y[idx])
+        visibles = ys >= 0
+        filas_idx = np.broadcast_to(idx[:, None], ys.shape)
+        colores = np.broadcast_to(self.color[idx][:, None], ys.shape)
+        self.tableros[filas_idx[visibles], ys[visibles], xs[visibles]] = colores[visibles]
+        self.piezas[idx] += 1
+
+        lineas = self._borrar_lineas(idx)
+        self.lineas[idx] += lineas
+        self.puntaje[idx] += _PUNTOS[np.minimum(lineas, 4)]
+
+        self._nuevas_piezas(idx)
+        return lineas
+
+    # --------------------
+    # API
+    # --------------------
+    def reset(self, mascara=None):
+        """
+        Reinicia los tableros indicados por la máscara booleana (N,).
+        Sin máscara reinicia todos. Uso típico tras step(): env.reset(env.terminado)
+        """
+        if mascara is None:
+            idx = np.arange(self.n)
+        else:
+            idx = np.nonzero(mascara)[0]
+        if not len(idx):
+            return
+        self.tableros[idx] = 0
+        self.puntaje[idx] = 0
+        self.lineas[idx] = 0
+        self.piezas[idx] = 0
+        self.pasos[idx] = 0
+        self.terminado[idx] = False
+        self._nuevas_piezas(idx)
+
+    def step(self, acciones, gravedad=False):
+        """
+        Aplica una acción por tablero (códigos de game.engine) a todos a la vez.
+        - acciones: arreglo (N,) de acciones; los tableros terminados se ignoran.
+        - gravedad: si True, después de la acción se aplica también GRAVEDAD.
+        Devuelve (recompensa, lineas, terminado), arreglos (N,).
+        """
+        acciones = np.asarray(acciones)
+        puntaje_previo = self.puntaje.copy()
+        lineas = np.zeros(self.n, dtype=np.int64)
+
+        vivos = ~self.terminado
+        self.pasos[vivos] += 1
+        self._aplicar(acciones, vivos, lineas)
+        if gravedad:
+            self._aplicar(np.full(self.n, GRAVEDAD), ~self.terminado, lineas)
+
+        return self.puntaje - puntaje_previo, lineas, self.terminado.copy()
+
+    def _aplicar(self, acciones, vivos, lineas):
+        dx = np.where(acciones == IZQUIERDA, -1, np.where(acciones == DERECHA, 1, 0))
+        dy = ((acciones == ABAJO) | (acciones == GRAVEDAD)).astype(np.int16)
+        drot = (acciones == ROTAR).astype(np.int16)
+
+        idx = np.nonzero(vivos & ((dx != 0) | (dy != 0) | (drot != 0)))[0]
+        if not len(idx):
+            return
+        nx = self.x[idx] + dx[idx]
+        ny = self.y[idx] + dy[idx]
+        nrot = (self.rot[idx] + drot[idx]) % NUM_ROTACIONES
+
+        choca = self._colision(idx, self.tipo[idx], nrot, nx, ny)
+        libres = ~choca
+        mover = idx[libres]
+        self.x[mover] = nx[libres]
+        self.y[mover] = ny[libres]
+        self.rot[mover] = nrot[libres]
+
+        fijar = idx[choca & (acciones[idx] == GRAVEDAD)]
+        lineas[fijar] += self._fijar(fijar)
@@ -1,5 +1,51 @@
 # run.py
-from game import main
+import argparse
+import sys
+import time
+
+_INICIO = time.perf_counter()
+
+
+def perfil_arranque():
+    """
+    Arranca hasta dibujar la pantalla de título, imprime el tiempo de cada
+    import y de cada paso de inicialización, y sale.
+    """
+    from game import startup
+
+    timer = startup.ImportTimer()
+    timer.instalar()
+    startup.activar()
+    manager = None
+    try:
+        with startup.medir("import game.main"):
+            from game import main
+        manager = main.crear_manager()
+        with startup.medir("primer frame"):
+            manager.dibujar()
+    finally:
+        timer.desinstalar()
+    startup.informe(timer, time.perf_counter() - _INICIO)
+    if manager is not None:
+        manager.quit()
+    main.pygame.quit()
+
+
+def iniciar(argv=None):
+    parser = argparse.ArgumentParser(description="Tetris - Los Tripulantes")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="medir imports e inicialización hasta la pantalla de título y salir")
+    parser.add_argument("--profile-out", metavar="RUTA",
+                        help="al salir, guardar los tiempos de frame por fase (.json o .csv)")
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        perfil_arranque()
+        return
+
+    from game import main
+    main.main_menu(args.profile_out)
+
 
 if __name__ == "__main__":
-    main.main_menu()
\ No newline at end of file
+    iniciar(sys.argv[1:])
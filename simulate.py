@@ -0,0 +1,196 @@
+# simulate.py
+"""
+Simulador por lotes: juega muchas partidas sin pantalla repartidas en varios
+procesos y resume los resultados con percentiles.
+
+Ejemplos:
+    python simulate.py --partidas 1000
+    python simulate.py --partidas 5000 --procesos 32 --bloque 50 --semilla 7
+    python simulate.py --politica bot --gravedad-cada 4
+    python simulate.py --politica mi_modulo:mi_politica --salida resultados.jsonl
+
+Una política es una función ``politica(juego, rng) -> accion`` que recibe el
+GameState y un random.Random propio de la partida, y devuelve una acción de
+game.engine. Se indica como "modulo:funcion" o por nombre de las incluidas.
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game.engine import GameState, ACCIONES, GRAVEDAD
+from game.ai import politica_bot
+
+# --------------------
+# Políticas incluidas
+# --------------------
+def politica_aleatoria(juego, rng):
+    return rng.choice(ACCIONES)
+
+
+POLITICAS = {
+    "aleatoria": politica_aleatoria,
+    "bot": politica_bot,
+}
+
+
+def cargar_politica(nombre):
+    """Devuelve la política a partir de su nombre o de "modulo:funcion"."""
+    if nombre in POLITICAS:
+        return POLITICAS[nombre]
+    modulo, _, funcion = nombre.partition(":")
+    if not funcion:
+        raise ValueError(f"Política desconocida '{nombre}' (usa modulo:funcion)")
+    return getattr(importlib.import_module(modulo), funcion)
+
+
+# --------------------
+# Trabajo de cada proceso
+# --------------------
+def jugar_partida(politica, seed, gravedad_cada=1, max_pasos=100_000):
+    """
+    Juega una partida completa y devuelve sus estadísticas.
+    - gravedad_cada: se aplica GRAVEDAD cada tantas acciones de la política.
+    - max_pasos: corta partidas que no terminan (la política nunca fija piezas).
+    """
+    juego = GameState(seed=seed)
+    # la política usa su propia semilla: con la misma que el GameState sus
+    # decisiones quedarían ligadas a la secuencia de piezas
+    rng = random.Random(f"{seed}-politica")
+    limpiezas = [0, 0, 0, 0]   # veces que se borraron 1, 2, 3 y 4 líneas
+    acciones = 0
+    inicio = time.perf_counter()
+
+    while not juego.game_over and juego.pasos < max_pasos:
+        pasos = [juego.step(politica(juego, rng))]
+        acciones += 1
+        if acciones % gravedad_cada == 0:
+            pasos.append(juego.step(GRAVEDAD))
+        for paso in pasos:
+            if paso.lineas:
+                limpiezas[min(paso.lineas, 4) - 1] += 1
+
+    return {
+        "seed": seed,
+        "puntaje": juego.puntaje,
+        "lineas": juego.lineas,
+        "limpiezas": limpiezas,
+        "piezas": juego.piezas,
+        "pasos": juego.pasos,
+        "terminada": juego.game_over,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def jugar_bloque(nombre_politica, semillas, gravedad_cada, max_pasos):
+    """Juega un bloque de partidas en un proceso del pool."""
+    politica = cargar_politica(nombre_politica)
+    return [jugar_partida(politica, s, gravedad_cada, max_pasos) for s in semillas]
+
+
+# --------------------
+# Agregación
+# --------------------
+def percentil(valores_ordenados, p):
+    """Percentil p (0-100) con interpolación lineal sobre una lista ya ordenada."""
+    if not valores_ordenados:
+        return 0.0
+    pos = (len(valores_ordenados) - 1) * p / 100
+    i = int(pos)
+    j = min(i + 1, len(valores_ordenados) - 1)
+    return valores_ordenados[i] + (valores_ordenados[j] - valores_ordenados[i]) * (pos - i)
+
+
+def resumir(resultados, percentiles=(50, 90, 95, 99)):
+    resumen = {"partidas": len(resultados)}
+    for campo in ("puntaje", "lineas", "piezas", "pasos"):
+        valores = sorted(r[campo] for r in resultados)
+        resumen[campo] = {
+            "media": sum(valores) / len(valores) if valores else 0.0,
+            "min": valores[0] if valores else 0,
+            "max": valores[-1] if valores else 0,
+            **{f"p{p}": percentil(valores, p) for p in percentiles},
+        }
+    resumen["limpiezas"] = {
+        f"{n}_lineas": sum(r["limpiezas"][n - 1] for r in resultados) for n in range(1, 5)
+    }
+    return resumen
+
+
+def imprimir_resumen(resumen, segundos):
+    print(f"\nPartidas: {resumen['partidas']}  ({segundos:.2f} s)")
+    for campo in ("puntaje", "lineas", "piezas", "pasos"):
+        datos = resumen[campo]
+        columnas = "  ".join(f"{k}={v:.1f}" for k, v in datos.items())
+        print(f"  {campo:<8} {columnas}")
+    limpiezas = "  ".join(f"{k}={v}" for k, v in resumen["limpiezas"].items())
+    print(f"  limpiezas {limpiezas}")
+
+
+# --------------------
+# Línea de comandos
+# --------------------
+def entero_positivo(texto):
+    """Tipo de argparse: entero mayor que 0."""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{texto}' no es un entero")
+    if valor <= 0:
+        raise argparse.ArgumentTypeError(f"tiene que ser mayor que 0 (se pasó {valor})")
+    return valor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simula partidas de Tetris en paralelo.")
+    parser.add_argument("--partidas", type=entero_positivo, default=100, help="cantidad de partidas")
+    parser.add_argument("--procesos", type=entero_positivo, default=os.cpu_count(), help="procesos del pool")
+    parser.add_argument("--bloque", type=entero_positivo, default=10, help="partidas por tarea enviada al pool")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla base (partida i usa semilla+i)")
+    parser.add_argument("--politica", default="aleatoria", help="nombre o modulo:funcion")
+    parser.add_argument("--gravedad-cada", type=entero_positivo, default=1, help="acciones entre caídas")
+    parser.add_argument("--max-pasos", type=entero_positivo, default=100_000, help="límite de pasos por partida")
+    parser.add_argument("--salida", help="archivo JSONL donde volcar cada partida al recibirla")
+    parser.add_argument("--json", action="store_true", help="imprimir el resumen como JSON")
+    args = parser.parse_args(argv)
+
+    # validar la política antes de arrancar los procesos
+    cargar_politica(args.politica)
+
+    semillas = [args.semilla + i for i in range(args.partidas)]
+    bloques = [semillas[i:i + args.bloque] for i in range(0, len(semillas), args.bloque)]
+
+    resultados = []
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else None
+    inicio = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.procesos) as pool:
+            futuros = [
+                pool.submit(jugar_bloque, args.politica, b, args.gravedad_cada, args.max_pasos)
+                for b in bloques
+            ]
+            for futuro in as_completed(futuros):
+                for r in futuro.result():
+                    resultados.append(r)
+                    if salida:
+                        salida.write(json.dumps(r) + "\n")
+                if not args.json:
+                    print(f"\r{len(resultados)}/{args.partidas} partidas", end="", file=sys.stderr)
+    finally:
+        if salida:
+            salida.close()
+
+    resumen = resumir(resultados)
+    if args.json:
+        print(json.dumps(resumen, indent=2))
+    else:
+        imprimir_resumen(resumen, time.perf_counter() - inicio)
+    return resumen
+
+
+if __name__ == "__main__":
+    main()